@@ -1,232 +1,367 @@
-# app.py - single-file combined backend
-# This file combines the original app.py plus FSM2LSFROnMachine.py and LFSRwordDeCipher.py
-# The content is inlined exactly from the uploaded files (no logic changed), and endpoints
-# are wired to use the in-file functions. Save as app.py and run with `python app.py`.
+# app.py - Flask front end of the securityrm engines
+# The list-based LFSR / FSM rules (originally inlined here from app.py,
+# FSM2LSFROnMachine.py and LFSRwordDeCipher.py) and the faster engines live
+# in the securityrm package of this folder; this file only wires them to
+# endpoints. Run with `python app.py`.
 
-# ---------- BEGIN inlined FSM2LSFROnMachine.py ----------
+import json
 import math
+import os
+import struct
+from functools import wraps
+
+import numpy as np
+
+from securityrm.reference import (
+    lfsr_state_table, find_lfsr_period, alternating_step_fsm, generate_fsm_2lfsr
+)
+from securityrm.lfsr_engine import pack_state, unpack_state, tap_mask, lfsr_outputs
+from securityrm.gf2poly import (
+    connection_polynomial, poly_order, polynomial_info, lfsr_exact_period, jump_state,
+    lfsr_from_sequence
+)
+from securityrm.word_decipher import (
+    bits_to_text_simple, score_text_with_dictionary, DEFAULT_DICTIONARY, DEFAULT_CIPHER_BITS, DEFAULT_KEYS
+)
+from securityrm.bruteforce import bruteforce_seeds
+from securityrm.batch_decipher import decipher_batch
+from securityrm.fsm_attack import correlation_attack
+from securityrm.known_plaintext import recover_keys_known_plaintext
+from securityrm.fsm_engine import AlternatingStepFSM, fsm_2lfsr_bits
+from securityrm.pipeline import cycle, xor_stream
+from securityrm.streaming import (
+    lfsr_chunks, fsm_chunks, fsm_2lfsr_chunks, encode_chunks, chunk_size, ENCODINGS,
+    DEFAULT_CHUNK_BITS
+)
+from securityrm.randomness import analyse_chunks, DEFAULT_ALPHA
+from securityrm.bitwire import decode_fields, encode_fields, read_frames, write_frames, OCTET_STREAM
+from result_cache import ResultCache, canonical_key, DEFAULT_MAX_BYTES
+from jobs import JobQueue, JobNotCancellable, JobStoreFull, report_progress
+
+
+# ---------- BEGIN original app.py (adapted to import from securityrm) ----------
+from flask import Flask, Response, request, jsonify, abort, make_response
+from flask_cors import CORS
 
-# ---------- Python LFSR logic ----------
-
-def xor_bits_from_indices(state, indices):
-    v = 0
-    for i in indices:
-        v ^= state[i]
-    return v
+app = Flask(__name__)
+CORS(app)
 
-def shift_register(state, taps):
+# ----------------------------
+# Bit wire formats (bitwire.py) for /generate_lfsr, /run_fsm, /run_fsm_2lfsr,
+# /ms_decryption and /ms_decryption_batch. JSON lists stay the default.
+#   - any bit field of a JSON request may be {"base64", "length", "bit_order"};
+#     "bit_format": "base64" (body or query string) packs the bit fields of
+#     the response the same way
+#   - a Content-Type: application/octet-stream request carries the bit
+#     inputs as frames, in WIRE_INPUTS order (a trailing "*" field takes all
+#     remaining frames); the other fields go in the query string
+#   - Accept: application/octet-stream returns the WIRE_OUTPUTS sequences as
+#     frames and the remaining fields as JSON in the X-Result header
+#     (the /ms_decryption endpoints have no such stream and answer in JSON)
+# ----------------------------
+WIRE_INPUTS = {
+    "/generate_lfsr": ["init_state"],
+    "/run_fsm": ["r1", "r2", "r3"],
+    "/run_fsm_2lfsr": ["r1", "r2"],
+    "/ms_decryption": ["cipher_bits", "keys*"],
+    "/ms_decryption_batch": ["ciphertexts*"],
+}
+WIRE_OUTPUTS = {
+    "/generate_lfsr": ["outputs", "states*"],
+    "/run_fsm": ["fsm"],
+    "/run_fsm_2lfsr": ["fsm"],
+}
+BIT_FIELDS = ("outputs", "states", "fsm", "key", "init_state")
+
+def _query_value(text):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+def _request_data():
     """
-    state: list of bits (0/1)
-    taps: list of indices used for feedback xor (0-based)
-    returns: new_state, output_bit
+    request fields with packed bit sequences decoded to bytearrays; a
+    malformed octet-stream body or base64 field aborts with a 400
     """
-    out = state[-1]
-    feedback = xor_bits_from_indices(state, taps)
-    new_state = [feedback] + state[:-1]
-    return new_state, out
+    try:
+        if request.mimetype == OCTET_STREAM:
+            data = {k: _query_value(v) for k, v in request.args.items()}
+            frames = read_frames(request.get_data())
+            for field in WIRE_INPUTS.get(request.path, []):
+                if field.endswith("*"):
+                    data[field[:-1]] = frames
+                    break
+                if frames:
+                    data[field] = frames.pop(0)
+            return data
+        return decode_fields(request.get_json() or {})
+    except ValueError as e:
+        abort(make_response(jsonify({"error": str(e)}), 400))
+
+def _wire_format():
+    """returns: "binary", "base64" or "list" for the response of this request"""
+    if request.path in WIRE_OUTPUTS and \
+            request.accept_mimetypes.best_match(["application/json", OCTET_STREAM]) == OCTET_STREAM:
+        return "binary"
+    data = request.get_json(silent=True) if request.is_json else None
+    fmt = (data or {}).get("bit_format") or request.args.get("bit_format")
+    return "base64" if fmt == "base64" else "list"
+
+def _bits_response(result):
+    fmt = _wire_format()
+    if fmt == "binary":
+        rest = dict(result)
+        frames = []
+        for field in WIRE_OUTPUTS[request.path]:
+            value = rest.pop(field.rstrip("*"), None)
+            if value is not None:
+                frames += value if field.endswith("*") else [value]
+        return Response(write_frames(frames), mimetype=OCTET_STREAM,
+                        headers={"X-Result": json.dumps(rest), "X-Bit-Order": "msb"})
+    return jsonify(encode_fields(result, BIT_FIELDS, fmt == "base64"))
 
-def generate_lfsr_sequence(init_state, taps, max_steps=None):
+# ----------------------------
+# Result cache for the deterministic endpoints (result_cache.py).
+# RESULT_CACHE_BYTES bounds the in-memory LRU; RESULT_CACHE_PATH, when set,
+# is a sqlite file that keeps evicted results across restarts.
+# A request can bypass the cache with "cache": false.
+# ----------------------------
+RESULT_CACHE = ResultCache(max_bytes=int(os.environ.get("RESULT_CACHE_BYTES", DEFAULT_MAX_BYTES)),
+                           path=os.environ.get("RESULT_CACHE_PATH") or None)
+# request fields that do not change the result
+UNCACHED_FIELDS = ("cache", "engine")
+
+def cached_result(namespace):
+    """Serve a 200 JSON response from RESULT_CACHE when the same request was seen before."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            data = request.get_json(silent=True)
+            wire = _wire_format()
+            if not isinstance(data, dict) or data.get("cache", True) is False or wire == "binary":
+                return view(*args, **kwargs)
+            payload = {k: v for k, v in data.items() if k not in UNCACHED_FIELDS}
+            key = canonical_key(namespace, dict(payload, _wire=wire))
+            body = RESULT_CACHE.get(key)
+            if body is not None:
+                return Response(body, mimetype="application/json", headers={"X-Cache": "HIT"})
+            resp = app.make_response(view(*args, **kwargs))
+            if resp.status_code == 200 and resp.mimetype == "application/json":
+                RESULT_CACHE.put(key, resp.get_data())
+            resp.headers["X-Cache"] = "MISS"
+            return resp
+        return wrapper
+    return decorator
+
+def cached_lfsr_outputs(init_state, taps):
     """
-    returns: outputs (list), period (int), states (list of states)
+    returns: the /generate_lfsr outputs (tail + one period) of a register as a
+    uint8 array, shared through RESULT_CACHE as packed bits
     """
-    state = list(init_state)
-    seen = {}
-    outputs = []
-    states = []
-    step = 0
-
-    while True:
-        key = tuple(state)
-
-        # if we already saw this state → period found
-        if key in seen:
-            period = step - seen[key]
-            return outputs, period, states
+    key = canonical_key("lfsr_outputs", {"init_state": list(init_state), "taps": list(taps)})
 
-        # remember this state
-        seen[key] = step
-        states.append(list(state))
+    def compute():
+        period, tail_length = lfsr_exact_period(init_state, taps)
+        length = len(init_state)
+        outputs = lfsr_outputs(pack_state(init_state), tap_mask(taps, length), length,
+                               tail_length + period)
+        return struct.pack("<Q", len(outputs)) + np.packbits(np.frombuffer(outputs, dtype=np.uint8)).tobytes()
 
-        # shift and record output
-        state, out = shift_register(state, taps)
-        outputs.append(out)
+    blob = RESULT_CACHE.get_or_compute(key, compute)
+    (count,) = struct.unpack_from("<Q", blob)
+    return np.unpackbits(np.frombuffer(blob, dtype=np.uint8, offset=8), count=count)
 
-        step += 1
-        if max_steps is not None and step >= max_steps:
-            # return as-is if we hit max_steps (no guaranteed period)
-            return outputs, None, states
-
-
-# ---------- FSM to LFSR (2-LFSR) logic ----------
-def generate_fsm_2lfsr(r1_outputs, r2_outputs, steps=None):
+def _register_outputs(value):
     """
-    r1_outputs: list of bits (output stream from R1)
-    r2_outputs: list of bits (output stream from R2)
-    steps: optional int, number of steps to run. If None, will run for length lcm(len(r1), len(r2)).
-    Returns: fsm_output list
-    The logic below uses r1 as control: when r1 bit == 1 -> consume from r2 in forward mode else consume from r2 in alternate mode.
-    This function preserves the original control-flow & logic of your FSM2LSFROnMachine.py
+    FSM register input: a list of output bits, or {"init_state": [...], "taps": [...]}.
+    Configs are generated server-side and handed to the FSM as a bytearray
+    (one 0/1 byte per bit, indexable like the list) without a list of ints.
     """
-    if not r1_outputs or not r2_outputs:
-        return []
-
-    len1 = len(r1_outputs)
-    len2 = len(r2_outputs)
-
-    if steps is None:
-        # run for full period
-        from math import gcd
-        lcm = len1 * len2 // gcd(len1, len2)
-        steps = lcm
-
-    idx1 = 0
-    idx2 = 0
-    fsm = []
-    # The original script used a specific control logic; we preserve that.
-    for _ in range(steps):
-        a = r1_outputs[idx1 % len1]
-        if a == 1:
-            # advance r2 pointer forward
-            bit = r2_outputs[idx2 % len2]
-            idx2 += 1
-        else:
-            # advance r2 pointer backward (or use another logic)
-            idx2 -= 1
-            bit = r2_outputs[idx2 % len2]
-        fsm_bit = bit ^ (a & 1)
-        fsm.append(fsm_bit)
-        idx1 += 1
-
-    return fsm
-
-# ---------- END inlined FSM2LSFROnMachine.py ----------
-
-
-# ---------- BEGIN inlined LFSRwordDeCipher.py ----------
-# utilities for message decryption (LFSR word decipher)
+    if isinstance(value, dict):
+        return bytearray(cached_lfsr_outputs(value.get("init_state", []), value.get("taps", [])))
+    return value
 
-import math
+def _fsm_engine(data, *registers):
+    """default engine: the vectorised one when any register was sent as a config"""
+    configs = any(isinstance(data.get(r), dict) for r in registers)
+    return data.get("engine", "numpy" if configs else "python")
 
-def repeat_to_length_simple(seq, target_len):
-    repeats = math.ceil(target_len / len(seq))
-    big = seq * repeats
-    return big[:target_len]
-
-def xor_simple(a, b):
-    return [x ^ y for x, y in zip(a, b)]
-
-def bits5_to_letter(bits5):
-    bin_str = "".join(str(b) for b in bits5)
-    v = int(bin_str, 2)
-    # map 0..25 to A..Z, other values to '?'
-    return chr(ord('A') + v) if 0 <= v < 26 else '?'
-
-def bits_to_text_simple(bitstream):
-    out = []
-    for i in range(0, len(bitstream), 5):
-        b = bitstream[i:i+5]
-        if len(b) < 5:
-            b = b + [0] * (5 - len(b))
-        out.append(bits5_to_letter(b))
-    return "".join(out)
-
-# default dictionary (kept small — same approach as original file)
-DEFAULT_DICTIONARY = [
- # Articles
-    "LE","LA","LES","UN","UNE","DES","DU","DE","AU","AUX",
-
-    # Pronouns
-    "JE","TU","IL","ELLE","NOUS","VOUS","ILS","ELLES","ON","CE","CELA","CELUI",
-    "QUI","QUE","QUOI","DONT","OU",
-
-    # Common verbs (present/basic forms only)
-    "ETRE","AVOIR","FAIRE","DIRE","POUVOIR","ALLER","VOULOIR","VOIR","SAVOIR",
-    "DEVOIR","PRENDRE","PARLER","METTRE","DONNER","TROUVER","COMPRENDRE",
-    "VENIR","PASSER","POURSUIVRE","LIRE","ECRIRE","SORTIR",
-
-    # Everyday words
-    "BONJOUR","SALUT","MERCI","OUI","NON","EXCUSE","PARDON","BIEN","MAL",
-    "MAISON","FILLE","GARCON","HOMME","FEMME","AMIS","AMIE","TRAVAIL",
-    "TEMPS","JOUR","NUIT","MATIN","SOIR","HEURE","MINUTE",
-
-    # Prepositions
-    "SUR","SOUS","AVEC","SANS","DANS","ENTRE","PENDANT","APRES","AVANT","POUR",
-    "PAR","VERS","CHEZ","CONTRE","PRES","DEPUIS","SELON",
-
-    # Conjunctions
-    "ET","MAIS","OU","DONC","CAR","COMME","SI","LORSQUE","PARCE","QUE",
-
-    # Numbers
-    "UN","DEUX","TROIS","QUATRE","CINQ","SIX","SEPT","HUIT","NEUF","DIX",
-
-    # School / exercise context words
-    "FIN","EXERCICE","EXERCICES","QUESTION","REPONSE","DEVOIR","PROFESSEUR",
-    "ETUDIANT","COURS","LECON","SUJET",
-
-    # Tech / general nouns
-    "SYSTEME","CODE","MESSAGE","CLE","DONNEE","BIT","SEQUENCE","LOGIQUE",
-    "ALGORITHME","ANALYSE","RESULTAT","ERREUR","VALEUR",
-
-    # Useful long words (great for scoring)
-    "IMPORTANT","DIFFICILE","INTERESSANT","POSSIBLE","COMPLETE",
-    "EVIDEMMENT","ACTUELLEMENT","RAPIDEMENT",
-
-    # Additional common vocab
-    "ANNEE","MOIS","SEMAINE","MAIN","TETE","OEIL","PAYS","VILLE","MONDE",
-    "VRAI","FAUX","PETIT","GRAND","NOUVEAU","VIEUX","BEAU","BON","MEILLEUR",
-    "TOUJOURS","JAMAIS","PEUT","PEUTETRE","DEJA","MAINTENANT","ICI","LA",
-    "LAHAUT","LAISSER","DEMANDER","REPONDRE"
-]
-
-def score_text_with_dictionary(text, dict_words):
-    T = text.upper()
-    score = 0
-    for w in dict_words:
-        if w in T:
-            score += len(w)
-    return score
-
-# ---------- END inlined LFSRwordDeCipher.py ----------
-
-
-# ---------- BEGIN original app.py (adapted to import from in-file) ----------
-from flask import Flask, request, jsonify
-from flask_cors import CORS
+def _analysis_options(value):
+    """
+    "analysis": true, or a dict with optional "length" (bits to test, may
+    exceed what is returned; the stream is tested in chunks), "alpha" and
+    test parameters (randomness.DEFAULT_OPTIONS)
+    returns: length (None: the returned stream), alpha, test options
+    """
+    options = dict(value) if isinstance(value, dict) else {}
+    return options.pop("length", None), options.pop("alpha", DEFAULT_ALPHA), options
 
-app = Flask(__name__)
-CORS(app)
+@app.route("/cache_stats", methods=["GET"])
+def api_cache_stats():
+    return jsonify(RESULT_CACHE.stats())
 
 # ----------------------------
 # Existing endpoints (kept as-is)
 # ----------------------------
 
 @app.route("/generate_lfsr", methods=["POST"])
+@cached_result("generate_lfsr")
 def api_generate_lfsr():
-    data = request.get_json()
+    """
+    Expected JSON:
+    {
+      "init_state": [...],
+      "taps": [...],
+      "max_steps": optional int,
+      "period_only": optional bool,
+      "include_states": optional bool (default true),
+      "offset": optional int, "limit": optional int,  # window of the state table
+      "analysis": optional true | {...}               # randomness tests, see _analysis_options
+    }
+    """
+    data = _request_data()
+    result = __generate_lfsr(data)
+    if data.get("analysis"):
+        init_state = data.get("init_state", [])
+        taps = data.get("taps", [])
+        length, alpha, options = _analysis_options(data["analysis"])
+        if length is None:
+            period, tail_length = lfsr_exact_period(init_state, taps)
+            length = tail_length + period
+        result["analysis"] = analyse_chunks(lfsr_chunks(init_state, taps, int(length)), options, alpha)
+    return _bits_response(result)
+
+def __generate_lfsr(data):
     init_state = data.get("init_state", [])
     taps = data.get("taps", [])
     max_steps = data.get("max_steps", None)
-    outputs, period, states = generate_lfsr_sequence(init_state, taps, max_steps=max_steps)
-    return jsonify({
-        "outputs": outputs,
+    # the longest cycle these taps can produce is the order of the connection polynomial
+    theoretical_period = poly_order(connection_polynomial(taps, len(init_state))) if init_state else None
+    polynomial = polynomial_info(taps, len(init_state)) if init_state else None
+
+    # period_only: no outputs/states in the response. The period is computed
+    # from the connection polynomial, or by constant-memory clocking with
+    # "period_method": "brent" (which honours max_steps)
+    if data.get("period_only", False):
+        if data.get("period_method", "algebraic") == "brent":
+            period, tail_length = find_lfsr_period(init_state, taps, max_steps=max_steps)
+        else:
+            period, tail_length = lfsr_exact_period(init_state, taps)
+        return {
+            "period": period,
+            "tail_length": tail_length,
+            "theoretical_period": theoretical_period,
+            "polynomial": polynomial
+        }
+
+    # state table window: "offset"/"limit" select rows of `states` (computed
+    # by jump-ahead, earlier rows are never generated) and "include_states":
+    # false leaves the table out
+    include_states = data.get("include_states", True)
+    if not include_states or "offset" in data or "limit" in data:
+        result = __lfsr_state_window(init_state, taps, max_steps, include_states,
+                                     int(data.get("offset", 0)), data.get("limit", None))
+        result["theoretical_period"] = theoretical_period
+        result["polynomial"] = polynomial
+        return result
+
+    outputs, period, tail_length, states = lfsr_state_table(init_state, taps, max_steps=max_steps)
+    return {
+        "outputs": list(outputs),
         "period": period,
-        "states": states,
-        "theoretical_period": (2 ** len(init_state) - 1) if init_state else None
+        "tail_length": tail_length,
+        "states": list(states),
+        "theoretical_period": theoretical_period,
+        "polynomial": polynomial
+    }
+
+def __lfsr_state_window(init_state, taps, max_steps, include_states, offset, limit):
+    """
+    Same outputs / period / tail_length as generate_lfsr_sequence, with only
+    rows offset .. offset+limit-1 of the state table (states_total rows in all).
+    """
+    outputs, period, tail_length, states = lfsr_state_table(init_state, taps, max_steps=max_steps)
+    total = len(states)
+    result = {
+        "outputs": list(outputs),
+        "period": period,
+        "tail_length": tail_length,
+        "states_total": total,
+    }
+    if include_states:
+        offset = min(max(offset, 0), total)
+        count = total - offset if limit is None else max(0, min(int(limit), total - offset))
+        result["states"] = states[offset:offset + count]
+        result["states_offset"] = offset
+    return result
+
+@app.route("/lfsr_seek", methods=["POST"])
+def api_lfsr_seek():
+    """
+    Expected JSON:
+    {
+      "init_state": [...],
+      "taps": [...],
+      "k": int,            # number of clocks to jump over
+      "count": optional int  # number of output bits to return from position k
+    }
+    """
+    data = request.get_json()
+    init_state = data.get("init_state", [])
+    taps = data.get("taps", [])
+    k = int(data.get("k", 0))
+    count = int(data.get("count", 0))
+
+    length = len(init_state)
+    state = jump_state(pack_state(init_state), taps, length, k)
+    outputs = lfsr_outputs(state, tap_mask(taps, length), length, count)
+    return jsonify({
+        "k": k,
+        "state": unpack_state(state, length),
+        "outputs": list(outputs)
     })
 
 @app.route("/run_fsm", methods=["POST"])
+@cached_result("run_fsm")
 def api_run_fsm():
-    data = request.get_json()
+    """
+    Expected JSON:
+    {
+      "r1": ..., "r2": ..., "r3": ...,  # output lists, or {"init_state": [...], "taps": [...]}
+                                        # to generate the register server-side
+      "b_minus1": 0, "c_minus1": 0,
+      "steps": optional int,
+      "engine": optional "python" | "numpy" (default when a register is a config),
+      "measure_period": optional bool,    # real_period / tail_length measured on the
+                                          # output instead of real_period = steps
+      "analysis": optional true | {...}   # randomness tests, see _analysis_options
+    }
+    """
+    data = _request_data()
     fsm, stats = None, None
     # keep existing behavior - originally expected r1,r2,r3
     fsm, stats = __run_three_lfsr_fsm(data)
-    return jsonify({"fsm": fsm, "stats": stats})
+    result = {"fsm": fsm, "stats": stats}
+    if data.get("analysis"):
+        length, alpha, options = _analysis_options(data["analysis"])
+        if length is None:
+            chunks = [np.asarray(fsm, dtype=np.uint8)]
+        else:
+            engine = AlternatingStepFSM(*(_register_outputs(data.get(r, [])) for r in ("r1", "r2", "r3")),
+                                        data.get("b_minus1", 0), data.get("c_minus1", 0))
+            length = int(length)
+            chunks = (engine.bits(lo, min(lo + DEFAULT_CHUNK_BITS, length))
+                      for lo in range(0, length, DEFAULT_CHUNK_BITS))
+        result["analysis"] = analyse_chunks(chunks, options, alpha)
+    return _bits_response(result)
 
 def __run_three_lfsr_fsm(data):
     # We re-use the original behavior from your app.py (the 3-LFSR FSM).
-    r1 = data.get("r1", [])
-    r2 = data.get("r2", [])
-    r3 = data.get("r3", [])
+    # Each register is either its output list or its {init_state, taps} config.
+    r1 = _register_outputs(data.get("r1", []))
+    r2 = _register_outputs(data.get("r2", []))
+    r3 = _register_outputs(data.get("r3", []))
     b_minus1 = data.get("b_minus1", 0)
     c_minus1 = data.get("c_minus1", 0)
     steps = data.get("steps", None)
@@ -239,32 +374,14 @@ def __run_three_lfsr_fsm(data):
         else:
             steps = max(len(r1), len(r2), len(r3))
 
-    b_prev = b_minus1 & 1
-    c_prev = c_minus1 & 1
-
-    idx1 = 0
-    idx2 = -1
-    idx3 = -1
-    fsm = []
-
-    for _ in range(int(steps)):
-        a = r1[idx1]
-
-        if a == 1:
-            idx2 += 1
-            if idx2 >= len(r2):
-                idx2 = 0
-            b_prev = r2[idx2]
-        else:
-            idx3 += 1
-            if idx3 >= len(r3):
-                idx3 = 0
-            c_prev = r3[idx3]
-
-        fsm.append(b_prev ^ c_prev)
-        idx1 += 1
-        if idx1 >= len(r1):
-            idx1 = 0
+    if _fsm_engine(data, "r1", "r2", "r3") == "numpy":
+        # vectorised closed form (fsm_engine.py), same bits and indices
+        engine = AlternatingStepFSM(r1, r2, r3, b_minus1, c_minus1)
+        fsm = engine.bits(0, int(steps)).tolist()
+        end = engine.state_after(int(steps))
+        idx1, idx2, idx3 = end["r1_index"], end["r2_index"], end["r3_index"]
+    else:
+        fsm, idx1, idx2, idx3 = alternating_step_fsm(r1, r2, r3, b_minus1, c_minus1, steps)
 
     stats = {
         "steps": steps,
@@ -276,29 +393,100 @@ def __run_three_lfsr_fsm(data):
         "ones": sum(fsm),
         "zeros": int(steps) - sum(fsm)
     }
+    if data.get("measure_period", False):
+        # measured (not assumed) period of the output, from the closed-form engine
+        real_period, tail_length = None, None
+        if r1 and r2 and r3:
+            real_period, tail_length = AlternatingStepFSM(r1, r2, r3, b_minus1, c_minus1).output_period()
+        stats["real_period"] = real_period
+        stats["tail_length"] = tail_length
     return fsm, stats
 
+@app.route("/fsm_seek", methods=["POST"])
+def api_fsm_seek():
+    """
+    Expected JSON:
+    {
+      "r1": [...], "r2": [...], "r3": [...],   # same as /run_fsm (lists or register configs)
+      "b_minus1": 0, "c_minus1": 0,
+      "k": int,              # first step to return
+      "count": optional int  # number of FSM bits from step k (default 1)
+    }
+    Bits are computed in closed form (see fsm_engine.py), without running
+    the first k steps.
+    """
+    data = request.get_json()
+    fsm = AlternatingStepFSM(_register_outputs(data.get("r1", [])), _register_outputs(data.get("r2", [])),
+                             _register_outputs(data.get("r3", [])),
+                             data.get("b_minus1", 0), data.get("c_minus1", 0))
+    k = int(data.get("k", 0))
+    count = int(data.get("count", 1))
+    return jsonify({
+        "k": k,
+        "fsm": fsm.bits(k, k + count).tolist(),
+        "state": fsm.state_after(k)
+    })
+
+# ----------------------------
+# NEW endpoint: Berlekamp-Massey (shortest LFSR for a bit sequence)
+# ----------------------------
+@app.route("/berlekamp_massey", methods=["POST"])
+def api_berlekamp_massey():
+    """
+    Expected JSON:
+    {
+      "bits": [...],              # keystream fragment (e.g. FSM output)
+      "full_profile": optional bool  # return the complexity after every bit
+    }
+
+    Returns the linear complexity, the taps/init_state of a register that
+    reproduces the bits (same convention as /generate_lfsr), the connection
+    polynomial and the complexity profile as [index, L] points where it jumps.
+    """
+    data = request.get_json()
+    bits = data.get("bits", [])
+    result = lfsr_from_sequence(bits)
+
+    profile = result.pop("profile")
+    changes = []
+    last = 0
+    for i, L in enumerate(profile):
+        if L != last:
+            changes.append([i, L])
+            last = L
+    result["profile_changes"] = changes
+    if data.get("full_profile", False):
+        result["profile"] = profile
+    result["length"] = len(bits)
+    return jsonify(result)
+
 # ----------------------------
 # NEW endpoint: 2-LFSR FSM
 # ----------------------------
 @app.route("/run_fsm_2lfsr", methods=["POST"])
+@cached_result("run_fsm_2lfsr")
 def api_run_fsm_2lfsr():
     """
     Expected JSON:
     {
-      "r1": [...],   # list of bits (outputs from LFSR1)
-      "r2": [...],   # list of bits (outputs from LFSR2)
-      "steps": optional int
+      "r1": [...],   # list of bits (outputs from LFSR1), or {"init_state": [...], "taps": [...]}
+      "r2": [...],   # list of bits (outputs from LFSR2), or {"init_state": [...], "taps": [...]}
+      "steps": optional int,
+      "engine": optional "python" (default) | "numpy"
     }
-    Behavior: uses generate_fsm_2lfsr from FSM2LSFROnMachine.py (inlined above)
+    Behavior: uses securityrm.reference.generate_fsm_2lfsr ("forward_backward" rule)
     """
-    data = request.get_json()
-    r1 = data.get("r1", [])
-    r2 = data.get("r2", [])
+    data = _request_data()
+    r1 = _register_outputs(data.get("r1", []))
+    r2 = _register_outputs(data.get("r2", []))
     steps = data.get("steps", None)
 
-    # call in-file function (exact same algorithm as your helper file)
-    fsm_out = generate_fsm_2lfsr(r1, r2, steps=steps)
+    if _fsm_engine(data, "r1", "r2") == "numpy":
+        # vectorised equivalent from fsm_engine.py
+        fsm_out = fsm_2lfsr_bits(r1, r2, steps=steps).tolist()
+    else:
+        # list-based reference rule (securityrm/reference.py)
+        fsm_out = generate_fsm_2lfsr(r1, r2, steps=steps)
 
     # produce minimal stats for frontend convenience
     stats = {
@@ -306,7 +494,66 @@ def api_run_fsm_2lfsr():
         "theoretical_period": len(r1) * len(r2) if len(r1) and len(r2) else None
     }
 
-    return jsonify({"fsm": fsm_out, "stats": stats})
+    return _bits_response({"fsm": fsm_out, "stats": stats})
+
+# ----------------------------
+# Streaming variants: same bits as /generate_lfsr, /run_fsm and /run_fsm_2lfsr,
+# sent in chunks instead of one JSON list. Common optional fields:
+#   "encoding": "binary" (default, packed MSB-first) | "hex" | "ndjson"
+#   "chunk_bits": bits per chunk (default 65536, rounded up to whole bytes)
+# The total number of bits is sent in the X-Bit-Length header.
+# ----------------------------
+def _stream_response(chunks, total, data):
+    encoding = data.get("encoding", "binary")
+    if encoding not in ENCODINGS:
+        return jsonify({"error": "unknown encoding %r" % encoding}), 400
+    return Response(encode_chunks(chunks, encoding), mimetype=ENCODINGS[encoding],
+                    headers={"X-Bit-Length": str(total), "X-Bit-Order": "msb"})
+
+@app.route("/generate_lfsr_stream", methods=["POST"])
+def api_generate_lfsr_stream():
+    """
+    Expected JSON: {"init_state": [...], "taps": [...], "length": optional int}
+    Without "length" the stream covers the same tail + period as /generate_lfsr outputs.
+    """
+    data = request.get_json()
+    init_state = data.get("init_state", [])
+    taps = data.get("taps", [])
+    total = data.get("length", None)
+    if total is None:
+        period, tail_length = lfsr_exact_period(init_state, taps)
+        total = tail_length + period
+    total = int(total)
+    return _stream_response(lfsr_chunks(init_state, taps, total, chunk_size(data.get("chunk_bits"))),
+                            total, data)
+
+@app.route("/run_fsm_stream", methods=["POST"])
+def api_run_fsm_stream():
+    """Expected JSON: same as /run_fsm (r1, r2, r3 as lists or configs, b_minus1, c_minus1, steps)."""
+    data = request.get_json()
+    r1 = _register_outputs(data.get("r1", []))
+    r2 = _register_outputs(data.get("r2", []))
+    r3 = _register_outputs(data.get("r3", []))
+    steps = data.get("steps", None)
+    if steps is None:
+        steps = len(r1) * len(r2) * len(r3) if (r1 and r2 and r3) else max(len(r1), len(r2), len(r3))
+    chunks = fsm_chunks(r1, r2, r3, data.get("b_minus1", 0), data.get("c_minus1", 0),
+                        int(steps), chunk_size(data.get("chunk_bits")))
+    return _stream_response(chunks, int(steps), data)
+
+@app.route("/run_fsm_2lfsr_stream", methods=["POST"])
+def api_run_fsm_2lfsr_stream():
+    """Expected JSON: same as /run_fsm_2lfsr (r1, r2 as lists or configs, steps)."""
+    data = request.get_json()
+    r1 = _register_outputs(data.get("r1", []))
+    r2 = _register_outputs(data.get("r2", []))
+    steps = data.get("steps", None)
+    if not r1 or not r2:
+        steps = 0
+    elif steps is None:
+        steps = len(r1) * len(r2) // math.gcd(len(r1), len(r2))
+    chunks = fsm_2lfsr_chunks(r1, r2, int(steps), chunk_size(data.get("chunk_bits")))
+    return _stream_response(chunks, int(steps), data)
 
 # ----------------------------
 # NEW endpoint: message decryption / LFSR word decipher
@@ -319,6 +566,12 @@ def api_ms_decryption():
       "cipher_bits": [0,1,1,0,...],          # optional; if omitted, backend default is used
       "keys": [[...], [...], ...],           # optional; if omitted, backend default keys are used
       "dictionary": [...],                   # optional list of words for scoring
+      "known_plaintext": true | {            # optional crib-based key recovery
+          "length": n, "taps": [...],        #   register, if known
+          "cribs": [...],                    #   words to slide (default: dictionary words)
+          "positions": [...],                #   letter positions (default: all)
+          "max_solutions": int
+      }
     }
 
     Returns:
@@ -327,10 +580,11 @@ def api_ms_decryption():
          {"key_index": 1, "key": [...], "decoded_text": "...", "score": N},
          ...
       ],
-      "best": {"key_index": K, "decoded_text": "...", "score":N}
+      "best": {"key_index": K, "decoded_text": "...", "score":N},
+      "known_plaintext": {"candidates": [...], "placements_tried": N}   # only when requested
     }
     """
-    data = request.get_json() or {}
+    data = _request_data()
 
     # optional payload values
     cipher_bits = data.get("cipher_bits", None)
@@ -340,20 +594,11 @@ def api_ms_decryption():
     # If user didn't supply cipher_bits/keys, fall back to the defaults from the original module.
     if cipher_bits is None:
         # default cipher (copied small ciphertext from original LFSRwordDeCipher)
-        cipher_bits = [
-            1,1,0,1,1,0,1,1,0,0,1,0,1,1,1,1,1,1,0,1,0,0,0,0,0,1,0,0,0,1,1,1,0,1,0,1,0,0,1,1,
-            1,1,1,1,0,0,1,1,1,1,0,0,1,1,0,1,0,0,1,0,1,1,1,0,0,0,0,0,0,0
-        ]
+        cipher_bits = DEFAULT_CIPHER_BITS
 
     if keys is None:
         # default 5 keys (copied from original LFSRwordDeCipher file)
-        keys = [
-            [1,0,1,0,1,1,1,1,0,0,0,1,0,0,1],
-            [0,1,0,1,1,1,1,0,0,0,1,0,0,1,1],
-            [1,0,1,1,1,1,0,0,0,1,0,0,1,1,0],
-            [0,1,1,1,1,0,0,0,1,0,0,1,1,0,1],
-            [1,1,1,1,0,0,0,1,0,0,1,1,0,1,0]
-        ]
+        keys = DEFAULT_KEYS
 
     # process each key using the same steps as the original script:
     per_key_results = []
@@ -362,8 +607,9 @@ def api_ms_decryption():
     best_index = None
 
     for i, key in enumerate(keys, start=1):
-        key_expanded = repeat_to_length_simple(key, len(cipher_bits))
-        plain_bits = xor_simple(cipher_bits, key_expanded)
+        report_progress(i - 1, len(keys))
+        # the key is repeated lazily (securityrm.pipeline), never expanded to a list
+        plain_bits = xor_stream(cipher_bits, cycle(key)).tolist()
         text = bits_to_text_simple(plain_bits)
         score = score_text_with_dictionary(text, dictionary)
 
@@ -388,8 +634,238 @@ def api_ms_decryption():
         }
     }
 
+    known = data.get("known_plaintext", None)
+    if known:
+        options = known if isinstance(known, dict) else {}
+        result["known_plaintext"] = recover_keys_known_plaintext(
+            cipher_bits,
+            dictionary,
+            cribs=options.get("cribs", None),
+            length=options.get("length", None),
+            taps=options.get("taps", None),
+            positions=options.get("positions", None),
+            max_solutions=int(options.get("max_solutions", 16)),
+        )
+
+    return _bits_response(result)
+
+# ----------------------------
+# NEW endpoint: many ciphertexts x many keys (batch_decipher.py)
+# ----------------------------
+@app.route("/ms_decryption_batch", methods=["POST"])
+def api_ms_decryption_batch():
+    """
+    Expected JSON:
+    {
+      "ciphertexts": [[0,1,1,0,...], ...],   # optional; backend default ciphertext if omitted
+      "keys": [[...], [...], ...],           # optional; backend default keys if omitted
+      "dictionary": [...],                   # optional list of words for scoring
+      "top_k": optional int (default 5),     # best keys kept per ciphertext
+      "include_scores": optional bool        # also return the full score matrix
+    }
+
+    Returns:
+    {
+      "results": [
+         {"cipher_index": 1, "top": [{"key_index": K, "key": [...], "decoded_text": "...", "score": N}, ...]},
+         ...
+      ],
+      "ciphertexts": C, "keys": K,
+      "scores": [[...], ...]                 # only with include_scores, one row per ciphertext
+    }
+    Scores and texts are those of /ms_decryption for each pair; the keys are
+    expanded and the dictionary compiled once for the whole batch.
+    """
+    data = _request_data()
+    ciphertexts = data.get("ciphertexts", None)
+    keys = data.get("keys", None)
+    if ciphertexts is None:
+        ciphertexts = [DEFAULT_CIPHER_BITS]
+    if keys is None:
+        keys = DEFAULT_KEYS
+    if any(len(k) == 0 for k in keys):
+        return jsonify({"error": "keys must not be empty"}), 400
+
+    batch = decipher_batch(
+        ciphertexts,
+        keys,
+        dictionary=data.get("dictionary", DEFAULT_DICTIONARY),
+        top_k=int(data.get("top_k", 5)),
+        progress=report_progress,
+    )
+    result = {
+        "results": [
+            {"cipher_index": i,
+             "top": [{"key_index": k + 1, "key": keys[k], "decoded_text": text, "score": score}
+                     for score, k, text in top]}
+            for i, top in enumerate(batch["top"], start=1)
+        ],
+        "ciphertexts": len(ciphertexts),
+        "keys": len(keys),
+    }
+    if data.get("include_scores", False):
+        result["scores"] = batch["scores"].tolist()
+    return _bits_response(result)
+
+# ----------------------------
+# NEW endpoint: exhaustive LFSR seed search for the word decipher
+# ----------------------------
+@app.route("/ms_bruteforce", methods=["POST"])
+def api_ms_bruteforce():
+    """
+    Expected JSON:
+    {
+      "length": n,                 # register length in bits
+      "taps": [...],               # feedback cell indices
+      "cipher_bits": [...],        # optional; backend default ciphertext if omitted
+      "dictionary": [...],         # optional list of words for scoring
+      "top_k": optional int (default 10),
+      "threshold": optional int,   # stop as soon as a seed reaches this score
+      "workers": optional int      # process count (default: all cores)
+    }
+
+    Returns:
+    {
+      "results": [{"seed": S, "init_state": [...], "decoded_text": "...", "score": N}, ...],
+      "searched": seeds tried, "total": 2^n - 1, "stopped_early": bool
+    }
+    """
+    data = request.get_json() or {}
+    result = bruteforce_seeds(
+        data.get("cipher_bits", DEFAULT_CIPHER_BITS),
+        data.get("taps", []),
+        int(data.get("length", 0)),
+        dictionary=data.get("dictionary", DEFAULT_DICTIONARY),
+        top_k=int(data.get("top_k", 10)),
+        threshold=data.get("threshold", None),
+        workers=data.get("workers", None),
+        progress=report_progress,
+    )
     return jsonify(result)
 
+# ----------------------------
+# NEW endpoint: seed recovery for the 3-LFSR FSM (fsm_attack.py)
+# ----------------------------
+@app.route("/fsm_attack", methods=["POST"])
+def api_fsm_attack():
+    """
+    Expected JSON:
+    {
+      "fsm": [...],                          # observed FSM output bits (from step 0)
+      "r1": {"length": n1, "taps": [...]},   # register shapes; seeds unknown
+      "r2": {"length": n2, "taps": [...]},
+      "r3": {"length": n3, "taps": [...]},
+      "b_minus1": 0, "c_minus1": 0,
+      "top_k": optional int (default 5),
+      "stop_on_match": optional bool (default true),
+      "workers": optional int
+    }
+
+    Returns:
+    {
+      "results": [{"r1_seed": S, "score": x, "checks": N, "r1_init_state": [...],
+                   "r2_init_state": [...], "r3_init_state": [...], "verified": bool}, ...],
+      "searched": R1 seeds tried, "total": 2^n1 - 1, "stopped_early": bool,
+      "timing": {"elapsed_s", "candidates_per_s", "bits_used",
+                 "search_space_log2", "joint_space_log2"}
+    }
+    """
+    data = request.get_json() or {}
+    r1, r2, r3 = (data.get(r, {}) for r in ("r1", "r2", "r3"))
+    result = correlation_attack(
+        data.get("fsm", []),
+        r1.get("taps", []), int(r1.get("length", 0)),
+        r2.get("taps", []), int(r2.get("length", 0)),
+        r3.get("taps", []), int(r3.get("length", 0)),
+        b_minus1=data.get("b_minus1", 0),
+        c_minus1=data.get("c_minus1", 0),
+        top_k=int(data.get("top_k", 5)),
+        stop_on_match=data.get("stop_on_match", True),
+        workers=data.get("workers", None),
+        progress=report_progress,
+    )
+    return jsonify(result)
+
+# ----------------------------
+# Asynchronous jobs (jobs.py): any endpoint of JOB_ENDPOINTS can be run on
+# the job pool instead of the request thread. JOB_WORKERS sets the pool
+# size, JOB_TTL how long (s) finished results are kept.
+# ----------------------------
+JOB_ENDPOINTS = {
+    "/generate_lfsr", "/run_fsm", "/run_fsm_2lfsr", "/fsm_seek", "/berlekamp_massey",
+    "/ms_decryption", "/ms_decryption_batch", "/ms_bruteforce", "/fsm_attack",
+}
+# endpoints that call report_progress, so a running job stops when cancelled;
+# the others can only be cancelled while queued
+INTERRUPTIBLE_ENDPOINTS = {"/ms_decryption", "/ms_decryption_batch", "/ms_bruteforce", "/fsm_attack"}
+JOBS = JobQueue(app, workers=int(os.environ.get("JOB_WORKERS", 0)) or None,
+                ttl=float(os.environ.get("JOB_TTL", 3600)), interruptible=INTERRUPTIBLE_ENDPOINTS)
+
+@app.route("/jobs", methods=["POST"])
+def api_submit_job():
+    """
+    Expected JSON:
+    {
+      "endpoint": "/run_fsm",      # one of JOB_ENDPOINTS
+      "payload": {...}             # the JSON that endpoint expects
+    }
+
+    Returns 202 with the job: {"job_id", "status", "progress", ...}. Poll
+    GET /jobs/<id>, or follow GET /jobs/<id>/events (server-sent events),
+    then fetch GET /jobs/<id>/result. DELETE /jobs/<id> cancels (409 for a
+    running job of an endpoint outside INTERRUPTIBLE_ENDPOINTS).
+    """
+    data = request.get_json() or {}
+    endpoint = data.get("endpoint", "")
+    if endpoint not in JOB_ENDPOINTS:
+        return jsonify({"error": "endpoint must be one of %s" % ", ".join(sorted(JOB_ENDPOINTS))}), 400
+    try:
+        job = JOBS.submit(endpoint, data.get("payload", {}))
+    except JobStoreFull as e:
+        return jsonify({"error": str(e)}), 503
+    return jsonify(job), 202, {"Location": "/jobs/" + job["job_id"]}
+
+@app.route("/jobs/<job_id>", methods=["GET"])
+def api_job_status(job_id):
+    job = JOBS.get(job_id)
+    if job is None:
+        return jsonify({"error": "unknown job"}), 404
+    return jsonify(job)
+
+@app.route("/jobs/<job_id>", methods=["DELETE"])
+def api_cancel_job(job_id):
+    try:
+        job = JOBS.cancel(job_id)
+    except JobNotCancellable as e:
+        return jsonify({"error": str(e)}), 409
+    if job is None:
+        return jsonify({"error": "unknown job"}), 404
+    return jsonify(job)
+
+@app.route("/jobs/<job_id>/result", methods=["GET"])
+def api_job_result(job_id):
+    job = JOBS.get(job_id)
+    if job is None:
+        return jsonify({"error": "unknown job"}), 404
+    if job["status"] == "failed":
+        return jsonify({"error": job["error"]}), 500
+    result = JOBS.result(job_id)
+    if result is None:
+        return jsonify({"error": "job is %s" % job["status"]}), 409
+    status, mimetype, body = result
+    return Response(body, status=status, mimetype=mimetype)
+
+@app.route("/jobs/<job_id>/events", methods=["GET"])
+def api_job_events(job_id):
+    if JOBS.get(job_id) is None:
+        return jsonify({"error": "unknown job"}), 404
+
+    def events():
+        for job in JOBS.watch(job_id):
+            yield "event: %s\ndata: %s\n\n" % (job["status"], json.dumps(job))
+
+    return Response(events(), mimetype="text/event-stream", headers={"Cache-Control": "no-cache"})
+
 # ----------------------------
 # Run server
 # ----------------------------
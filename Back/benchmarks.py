@@ -0,0 +1,354 @@
+# benchmarks.py - throughput of the LFSR, FSM and decipher hot paths
+#
+# Standalone runner: every benchmark builds its input for one size and
+# returns a callable, which is timed `repeat` times (best time kept, as
+# timeit does). Results are written as JSON and can be compared against an
+# earlier run. The endpoint benchmarks time the Flask test client end to end
+# and the same computation alone, so JSON / HTTP overhead shows separately.
+#
+#   python benchmarks.py                          # quick preset, JSON to stdout
+#   python benchmarks.py --preset full --output bench.json
+#   python benchmarks.py --only fsm --baseline bench.json   # exit 1 on regression
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+import numpy as np
+
+import app as backend
+from securityrm.reference import shift_register, generate_lfsr_sequence, alternating_step_fsm, generate_fsm_2lfsr
+from securityrm.lfsr_engine import pack_state, tap_mask, lfsr_clock, lfsr_outputs
+from securityrm.lfsr_batch import seeds_to_planes, clock_planes
+from securityrm.gf2poly import jump_state, lfsr_exact_period
+from securityrm.fsm_engine import AlternatingStepFSM, fsm_2lfsr_bits
+from securityrm.streaming import fsm_chunks
+from securityrm.pipeline import cycle, xor_stream
+from securityrm.bruteforce import score_seed_range
+from securityrm.textcodec import decode_rows
+from securityrm.batch_decipher import decipher_batch
+from securityrm.word_decipher import (
+    bits_to_text_simple, score_text_with_dictionary, DEFAULT_CIPHER_BITS, DEFAULT_DICTIONARY
+)
+
+PRESETS = {
+    "quick": {
+        "register": [3, 8, 16, 32, 64],
+        "fsm": [10 ** 3, 10 ** 4, 10 ** 5],
+        "keys": [5, 10 ** 2, 10 ** 4],
+    },
+    "full": {
+        "register": [3, 8, 12, 16, 24, 32, 48, 64],
+        "fsm": [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7, 10 ** 8],
+        "keys": [5, 10 ** 2, 10 ** 4, 10 ** 6],
+    },
+}
+# per-bit Python loops above this size would dominate a full run
+PYTHON_LOOP_LIMIT = 10 ** 6
+FULL_PERIOD_LIMIT = 16
+CLOCKS = 10 ** 4
+BATCH_REGISTERS = 4096
+BATCH_STEPS = 256
+DECIPHER_CIPHERTEXTS = 10
+# three registers for the FSM benchmarks (periods 31, 127 and 511)
+FSM_REGISTERS = [([1, 0, 0, 1, 0], [2, 4]), ([1, 1, 0, 0, 0, 0, 0], [5, 6]),
+                 ([1, 0, 1, 0, 1, 1, 0, 0, 0], [4, 8])]
+
+BENCHMARKS = []
+
+
+def benchmark(name, sizes):
+    """register fn(size) -> (callable, work units) for every size of the preset's `sizes` list"""
+    def decorator(fn):
+        BENCHMARKS.append((name, sizes, fn))
+        return fn
+    return decorator
+
+def _state(length):
+    rng = random.Random(length)
+    state = [rng.randint(0, 1) for _ in range(length)]
+    state[0] = 1
+    return state
+
+def _taps(length):
+    # highest cell always tapped so the feedback is nonsingular
+    return [0, length - 1] if length > 1 else [0]
+
+def _fsm_registers():
+    return [generate_lfsr_sequence(s, t)[0] for s, t in FSM_REGISTERS]
+
+
+# ---------- registers ----------
+
+@benchmark("lfsr.shift_register", "register")
+def bench_shift_register(length):
+    state, taps = _state(length), _taps(length)
+
+    def run():
+        s = state
+        for _ in range(CLOCKS):
+            s, _ = shift_register(s, taps)
+    return run, CLOCKS
+
+@benchmark("lfsr.lfsr_clock", "register")
+def bench_lfsr_clock(length):
+    state, mask = pack_state(_state(length)), tap_mask(_taps(length), length)
+    return (lambda: lfsr_clock(state, mask, length, 10 * CLOCKS)), 10 * CLOCKS
+
+@benchmark("lfsr.outputs", "register")
+def bench_lfsr_outputs(length):
+    state, mask = pack_state(_state(length)), tap_mask(_taps(length), length)
+    return (lambda: lfsr_outputs(state, mask, length, 10 * CLOCKS)), 10 * CLOCKS
+
+@benchmark("lfsr.batch", "register")
+def bench_batch(length):
+    seeds = np.arange(BATCH_REGISTERS, dtype=np.uint64) % np.uint64(min((1 << length) - 1, 1 << 63)) + np.uint64(1)
+    planes = seeds_to_planes(seeds, length)
+    return (lambda: clock_planes(planes, _taps(length), BATCH_STEPS)), BATCH_REGISTERS * BATCH_STEPS
+
+@benchmark("lfsr.full_period", "register")
+def bench_full_period(length):
+    if length > FULL_PERIOD_LIMIT:
+        return None
+    state, taps = _state(length), _taps(length)
+    period, tail = lfsr_exact_period(state, taps)
+    return (lambda: generate_lfsr_sequence(state, taps)), period + tail
+
+@benchmark("lfsr.full_period_rows", "register")
+def bench_full_period_rows(length):
+    # as lfsr.full_period, with every state unpacked (the full /generate_lfsr response)
+    if length > FULL_PERIOD_LIMIT:
+        return None
+    state, taps = _state(length), _taps(length)
+    period, tail = lfsr_exact_period(state, taps)
+    return (lambda: list(generate_lfsr_sequence(state, taps)[2])), period + tail
+
+@benchmark("lfsr.exact_period", "register")
+def bench_exact_period(length):
+    state, taps = _state(length), _taps(length)
+    return (lambda: lfsr_exact_period(state, taps)), 1
+
+@benchmark("lfsr.jump_state", "register")
+def bench_jump_state(length):
+    state, taps = pack_state(_state(length)), _taps(length)
+    return (lambda: jump_state(state, taps, length, 1 << 40)), 1
+
+
+# ---------- FSMs ----------
+
+@benchmark("fsm.python_loop", "fsm")
+def bench_fsm_python(steps):
+    if steps > PYTHON_LOOP_LIMIT:
+        return None
+    r1, r2, r3 = _fsm_registers()
+    return (lambda: alternating_step_fsm(r1, r2, r3, 0, 0, steps)), steps
+
+@benchmark("fsm.stream_chunks", "fsm")
+def bench_fsm_stream(steps):
+    if steps > PYTHON_LOOP_LIMIT:
+        return None
+    r1, r2, r3 = _fsm_registers()
+    return (lambda: sum(len(c) for c in fsm_chunks(r1, r2, r3, steps=steps))), steps
+
+@benchmark("fsm.numpy", "fsm")
+def bench_fsm_numpy(steps):
+    fsm = AlternatingStepFSM(*_fsm_registers())
+    return (lambda: fsm.bits(0, steps)), steps
+
+@benchmark("fsm2.python_loop", "fsm")
+def bench_fsm2_python(steps):
+    if steps > PYTHON_LOOP_LIMIT:
+        return None
+    r1, r2, _ = _fsm_registers()
+    return (lambda: generate_fsm_2lfsr(r1, r2, steps=steps)), steps
+
+@benchmark("fsm2.numpy", "fsm")
+def bench_fsm2_numpy(steps):
+    r1, r2, _ = _fsm_registers()
+    return (lambda: fsm_2lfsr_bits(r1, r2, steps=steps)), steps
+
+
+# ---------- decipher ----------
+
+def _keys(count, length=15):
+    rng = random.Random(count)
+    return [[rng.randint(0, 1) for _ in range(length)] for _ in range(count)]
+
+def _decipher_keys(keys):
+    # the per-key loop of /ms_decryption
+    best = -1
+    for key in keys:
+        plain = xor_stream(DEFAULT_CIPHER_BITS, cycle(key)).tolist()
+        best = max(best, score_text_with_dictionary(bits_to_text_simple(plain), DEFAULT_DICTIONARY))
+    return best
+
+@benchmark("decipher.per_key", "keys")
+def bench_decipher(count):
+    keys = _keys(count)
+    return (lambda: _decipher_keys(keys)), count
+
+@benchmark("decipher.decode_rows", "keys")
+def bench_decode_rows(count):
+    # 5-bit decoding of one candidate plaintext per key, all in one call
+    bits = np.random.default_rng(count).integers(0, 2, (count, len(DEFAULT_CIPHER_BITS)), dtype=np.uint8)
+    return (lambda: decode_rows(bits)), count
+
+@benchmark("decipher.batch", "keys")
+def bench_decipher_batch(count):
+    # /ms_decryption_batch: DECIPHER_CIPHERTEXTS ciphertexts against every key
+    rng = random.Random(count)
+    ciphertexts = [[rng.randint(0, 1) for _ in DEFAULT_CIPHER_BITS] for _ in range(DECIPHER_CIPHERTEXTS)]
+    keys = _keys(count)
+    return (lambda: decipher_batch(ciphertexts, keys)), DECIPHER_CIPHERTEXTS * count
+
+@benchmark("decipher.seed_range", "keys")
+def bench_seed_range(count):
+    # the vectorised seed search of /ms_bruteforce (20-bit register)
+    return (lambda: score_seed_range(DEFAULT_CIPHER_BITS, [16, 19], 20, 1, count + 1,
+                                     DEFAULT_DICTIONARY, 10)), count
+
+
+# ---------- endpoints (end to end vs compute only) ----------
+
+def _endpoint(path, payload, compute):
+    client = backend.app.test_client()
+    body = dict(payload, cache=False)
+
+    def run():
+        resp = client.post(path, json=body)
+        if resp.status_code != 200:
+            raise RuntimeError("%s returned %d" % (path, resp.status_code))
+        resp.get_data()
+    run.compute = compute
+    return run
+
+@benchmark("endpoint.generate_lfsr", "register")
+def bench_endpoint_generate_lfsr(length):
+    if length > FULL_PERIOD_LIMIT:
+        return None
+    payload = {"init_state": _state(length), "taps": _taps(length)}
+    generate = getattr(backend, "__generate_lfsr")
+    period, tail = lfsr_exact_period(payload["init_state"], payload["taps"])
+    return _endpoint("/generate_lfsr", payload, lambda: generate(payload)), period + tail
+
+@benchmark("endpoint.run_fsm", "fsm")
+def bench_endpoint_run_fsm(steps):
+    if steps > PYTHON_LOOP_LIMIT:
+        return None
+    r1, r2, r3 = _fsm_registers()
+    payload = {"r1": r1, "r2": r2, "r3": r3, "steps": steps, "engine": "numpy"}
+    run_fsm = getattr(backend, "__run_three_lfsr_fsm")
+    return _endpoint("/run_fsm", payload, lambda: run_fsm(payload)), steps
+
+@benchmark("endpoint.ms_decryption", "keys")
+def bench_endpoint_ms_decryption(count):
+    if count > 10 ** 4:
+        return None
+    keys = _keys(count)
+    return _endpoint("/ms_decryption", {"keys": keys}, lambda: _decipher_keys(keys)), count
+
+
+# ---------- runner ----------
+
+def _best_time(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def run_benchmarks(preset="quick", only=None, repeat=3, log=None):
+    """returns: {"meta": {...}, "results": [{"name", "size", "seconds", "units", "ns_per_unit", ...}]}"""
+    sizes = PRESETS[preset]
+    results = []
+    for name, kind, fn in BENCHMARKS:
+        if only and not any(o in name for o in only):
+            continue
+        for size in sizes[kind]:
+            built = fn(size)
+            if built is None:
+                continue
+            run, units = built
+            # one untimed call warms caches (compiled dictionaries, imports)
+            run()
+            reps = repeat if size <= 10 ** 5 else 1
+            entry = {"name": name, "size": size, "units": units, "seconds": _best_time(run, reps)}
+            entry["ns_per_unit"] = entry["seconds"] * 1e9 / units
+            compute = getattr(run, "compute", None)
+            if compute is not None:
+                entry["compute_seconds"] = _best_time(compute, reps)
+                entry["overhead_seconds"] = entry["seconds"] - entry["compute_seconds"]
+            results.append(entry)
+            if log is not None:
+                log("%-28s %10d  %10.6f s  %10.1f ns/unit%s" % (
+                    name, size, entry["seconds"], entry["ns_per_unit"],
+                    "  (overhead %.6f s)" % entry["overhead_seconds"] if compute is not None else ""))
+    return {
+        "meta": {
+            "preset": preset,
+            "repeat": repeat,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+def compare(current, baseline, tolerance=0.1):
+    """
+    returns: list of (name, size, baseline s, current s, ratio) for every
+    benchmark present in both runs; ratio > 1 + tolerance is a regression
+    """
+    before = {(r["name"], r["size"]): r["seconds"] for r in baseline["results"]}
+    rows = []
+    for r in current["results"]:
+        key = (r["name"], r["size"])
+        if key in before and before[key] > 0:
+            rows.append((r["name"], r["size"], before[key], r["seconds"], r["seconds"] / before[key]))
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks for the LFSR / FSM / decipher hot paths")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="quick")
+    parser.add_argument("--only", nargs="+", default=None, help="run benchmarks whose name contains one of these")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default=None, help="write JSON results here (default: stdout)")
+    parser.add_argument("--baseline", default=None, help="JSON results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed slowdown before a regression")
+    args = parser.parse_args(argv)
+
+    def log(line):
+        print(line, file=sys.stderr)
+
+    result = run_benchmarks(args.preset, args.only, args.repeat, log=log)
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = 0
+        log("")
+        for name, size, before, now, ratio in compare(result, baseline, args.tolerance):
+            flag = ""
+            if ratio > 1 + args.tolerance:
+                flag = "  REGRESSION"
+                regressions += 1
+            elif ratio < 1 - args.tolerance:
+                flag = "  faster"
+            log("%-28s %10d  %10.6f -> %10.6f s  x%.2f%s" % (name, size, before, now, ratio, flag))
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
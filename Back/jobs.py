@@ -0,0 +1,262 @@
+# jobs.py - asynchronous jobs for the long-running endpoints
+#
+# A job is a request for one of the POST endpoints, run on a process pool
+# instead of the request thread. The worker replays the request through the
+# Flask app, so a job returns exactly what the endpoint would. Workers report
+# "started" / progress events through a local broker (a multiprocessing
+# Manager queue drained by a thread of the web process) and see cancellation
+# through a shared dict. Finished jobs are kept in a bounded store and expire
+# after a TTL. Nothing outside this process tree is needed.
+
+import importlib
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Manager
+
+DEFAULT_MAX_JOBS = 256
+DEFAULT_TTL = 3600
+PROGRESS_INTERVAL = 0.25
+FINISHED = ("done", "failed", "cancelled")
+
+
+class JobCancelled(Exception):
+    pass
+
+class JobStoreFull(Exception):
+    pass
+
+class JobNotCancellable(Exception):
+    pass
+
+
+# ---------- worker side ----------
+
+_APP = None        # Flask app replayed by the workers (inherited on fork)
+_current = None    # [job_id, events, cancelled, last report time] of the running job
+
+def _init_worker(import_name):
+    global _APP
+    if _APP is None:
+        _APP = importlib.import_module(import_name).app
+
+def report_progress(done, total):
+    """
+    Progress hook for long loops. No-op outside a job; inside one it forwards
+    (done, total) at most every PROGRESS_INTERVAL seconds and raises
+    JobCancelled once the job has been cancelled.
+    """
+    if _current is None:
+        return
+    now = time.monotonic()
+    if done < total and now - _current[3] < PROGRESS_INTERVAL:
+        return
+    _current[3] = now
+    job_id, events, cancelled = _current[:3]
+    if cancelled.get(job_id):
+        raise JobCancelled(job_id)
+    events.put((job_id, "progress", (done, total)))
+
+def _run_request(job_id, path, payload, events, cancelled):
+    """returns: (status code, mimetype, body) of POST `path` with `payload`"""
+    global _current
+    _current = [job_id, events, cancelled, 0.0]
+    # cancelled after the pool took the job but before it started
+    if cancelled.get(job_id):
+        _current = None
+        raise JobCancelled(job_id)
+    events.put((job_id, "started", os.getpid()))
+    try:
+        with _APP.test_request_context(path, method="POST", json=payload):
+            resp = _APP.full_dispatch_request()
+            return resp.status_code, resp.mimetype, resp.get_data()
+    finally:
+        _current = None
+
+
+# ---------- web process side ----------
+
+class JobQueue:
+    """
+    app: the Flask app (used as-is by forked workers)
+    import_name: module that defines `app`, for workers that do not fork
+    workers: pool size (os.cpu_count() when None)
+    max_jobs: jobs kept in the store; the oldest finished ones go first
+    ttl: seconds a finished job stays available
+    interruptible: endpoints whose view calls report_progress; a running job
+                   of any other endpoint cannot be cancelled (None: all can)
+    The pool and broker are started on the first submit.
+    """
+
+    def __init__(self, app, import_name="app", workers=None, max_jobs=DEFAULT_MAX_JOBS, ttl=DEFAULT_TTL,
+                 interruptible=None):
+        global _APP
+        _APP = app
+        self.import_name = import_name
+        self.workers = workers or os.cpu_count() or 1
+        self.max_jobs = max_jobs
+        self.ttl = ttl
+        self.interruptible = interruptible
+        self._jobs = OrderedDict()
+        self._cond = threading.Condition(threading.RLock())
+        self._pool = None
+        self._manager = None
+
+    def _start(self):
+        if self._pool is not None:
+            return
+        self._manager = Manager()
+        self._events = self._manager.Queue()
+        self._cancelled = self._manager.dict()
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                         initargs=(self.import_name,))
+        threading.Thread(target=self._broker, name="job-broker", daemon=True).start()
+
+    # ---------- store ----------
+
+    def _purge(self):
+        now = time.time()
+        for job_id, job in list(self._jobs.items()):
+            if job["status"] in FINISHED and now - job["finished"] > self.ttl:
+                del self._jobs[job_id]
+        finished = [j for j, job in self._jobs.items() if job["status"] in FINISHED]
+        while len(self._jobs) >= self.max_jobs and finished:
+            del self._jobs[finished.pop(0)]
+
+    def _touch(self, job):
+        job["version"] += 1
+        self._cond.notify_all()
+
+    @staticmethod
+    def _public(job):
+        return {k: v for k, v in job.items() if not k.startswith("_")}
+
+    # ---------- API ----------
+
+    def submit(self, path, payload):
+        """returns: the new job (public fields); raises JobStoreFull when every slot is busy"""
+        with self._cond:
+            self._purge()
+            if len(self._jobs) >= self.max_jobs:
+                raise JobStoreFull("%d jobs are still queued or running" % len(self._jobs))
+            self._start()
+            job_id = uuid.uuid4().hex
+            job = {
+                "job_id": job_id,
+                "endpoint": path,
+                "status": "queued",
+                "created": time.time(),
+                "started": None,
+                "finished": None,
+                "progress": None,
+                "error": None,
+                "version": 0,
+                "_result": None,
+                "_future": None,
+            }
+            self._jobs[job_id] = job
+            future = self._pool.submit(_run_request, job_id, path, payload, self._events, self._cancelled)
+            job["_future"] = future
+            future.add_done_callback(lambda f: self._finished(job_id, f))
+            return self._public(job)
+
+    def get(self, job_id):
+        with self._cond:
+            self._purge()
+            job = self._jobs.get(job_id)
+            return self._public(job) if job else None
+
+    def result(self, job_id):
+        """returns: (status code, mimetype, body) of a done job, else None"""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            return job["_result"] if job else None
+
+    def cancel(self, job_id):
+        """
+        returns: the job after the cancel request, None if unknown; raises
+        JobNotCancellable for a running job that never calls report_progress
+        """
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job["status"] not in FINISHED:
+                if (job["status"] == "running" and self.interruptible is not None
+                        and job["endpoint"] not in self.interruptible):
+                    raise JobNotCancellable("%s jobs cannot be interrupted once running" % job["endpoint"])
+                # a queued job is dropped here (its callback marks it), or
+                # stopped before it starts if the pool already took it;
+                # a running one stops at its next report_progress
+                if not job["_future"].cancel():
+                    self._cancelled[job_id] = True
+                    job["status"] = "cancelling"
+                    self._touch(job)
+            return self._public(job)
+
+    def watch(self, job_id, heartbeat=15):
+        """Yield the job each time it changes (or every `heartbeat` s) until it finishes."""
+        version = -1
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._jobs.get(job_id, {}).get("version") != version,
+                                    timeout=heartbeat)
+                job = self._jobs.get(job_id)
+                if job is None:
+                    return
+                version = job["version"]
+                snapshot = self._public(job)
+            yield snapshot
+            if snapshot["status"] in FINISHED:
+                return
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._manager.shutdown()
+            self._pool = None
+
+    # ---------- events ----------
+
+    def _finished(self, job_id, future):
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            # a job asked to cancel that still ran to the end keeps its result
+            error = None if future.cancelled() else future.exception()
+            if future.cancelled() or isinstance(error, JobCancelled):
+                job["status"] = "cancelled"
+            elif error is not None:
+                job["status"] = "failed"
+                job["error"] = repr(error)
+            else:
+                job["status"] = "done"
+                job["_result"] = future.result()
+            job["finished"] = time.time()
+            self._touch(job)
+        if self._manager is not None:
+            try:
+                self._cancelled.pop(job_id, None)
+            except (EOFError, OSError):
+                pass
+
+    def _broker(self):
+        while True:
+            try:
+                job_id, kind, value = self._events.get()
+            except (EOFError, OSError):
+                return
+            with self._cond:
+                job = self._jobs.get(job_id)
+                if job is None or job["status"] in FINISHED + ("cancelling",):
+                    continue
+                if kind == "started":
+                    job["status"] = "running"
+                    job["started"] = time.time()
+                elif kind == "progress":
+                    job["progress"] = {"done": value[0], "total": value[1]}
+                self._touch(job)
@@ -0,0 +1,133 @@
+# result_cache.py - content-addressed cache for the deterministic endpoints
+#
+# Entries are keyed by a SHA-256 of the canonical JSON of (namespace, payload)
+# and stored as bytes, so memory use is counted exactly and a hit can be sent
+# back without serialising again. The in-memory part is an LRU bounded by
+# total byte size; evicted entries optionally spill to a sqlite file that
+# survives restarts (and is itself bounded, oldest-used first).
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 64 << 20
+DEFAULT_MAX_DISK_BYTES = 1 << 30
+
+
+def canonical_key(namespace, payload):
+    text = json.dumps([namespace, payload], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    max_bytes: budget of the in-memory LRU
+    path: optional sqlite file used as a second level (None: memory only)
+    max_disk_bytes: budget of the sqlite level
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, path=None, max_disk_bytes=DEFAULT_MAX_DISK_BYTES):
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS results "
+                             "(key TEXT PRIMARY KEY, value BLOB, size INTEGER, used REAL)")
+            self._db.commit()
+
+    # ---------- lookup / store ----------
+
+    def get(self, key):
+        """returns: cached bytes or None"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            if self._db is not None:
+                row = self._db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self._db.execute("UPDATE results SET used = ? WHERE key = ?", (time.time(), key))
+                    self._db.commit()
+                    self.disk_hits += 1
+                    value = bytes(row[0])
+                    self._insert(key, value)
+                    return value
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= len(self._entries.pop(key))
+            self._insert(key, value)
+
+    def _insert(self, key, value):
+        if len(value) > self.max_bytes:
+            self._spill([(key, value)])
+            return
+        self._entries[key] = value
+        self._bytes += len(value)
+        evicted = []
+        while self._bytes > self.max_bytes:
+            old_key, old_value = self._entries.popitem(last=False)
+            self._bytes -= len(old_value)
+            self.evictions += 1
+            evicted.append((old_key, old_value))
+        self._spill(evicted)
+
+    def _spill(self, items):
+        if self._db is None or not items:
+            return
+        now = time.time()
+        self._db.executemany("INSERT OR REPLACE INTO results (key, value, size, used) VALUES (?, ?, ?, ?)",
+                             [(k, v, len(v), now) for k, v in items])
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        while total > self.max_disk_bytes:
+            key, size = self._db.execute("SELECT key, size FROM results ORDER BY used LIMIT 1").fetchone()
+            self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+            total -= size
+        self._db.commit()
+
+    # ---------- helpers ----------
+
+    def get_or_compute(self, key, compute):
+        """returns: cached bytes, or compute() (bytes) after storing it"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "disk": self._db is not None,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
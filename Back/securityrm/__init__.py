@@ -0,0 +1,75 @@
+# securityrm - LFSR / FSM / decipher engines shared by the Flask app
+# (Back/app.py) and the RunOnMachine scripts.
+#
+# Submodules are imported on first use, so `from securityrm import
+# generate_fsm_2lfsr_gated` loads only reference.py and its pure-Python
+# dependencies (no NumPy) and a CLI starts without paying for the rest:
+#
+#   reference        list-based LFSR and FSM rules
+#   lfsr_engine      bit-packed integer LFSR core
+#   lfsr_batch       bit-sliced LFSRs (many seeds per word)
+#   gf2poly          GF(2)[x] arithmetic, periods, jump-ahead, Berlekamp-Massey
+#   fsm_engine       vectorised FSMs (AlternatingStepFSM, fsm_2lfsr_bits)
+#   streaming        chunked LFSR / FSM output
+#   pipeline         lazy LFSR -> FSM -> XOR pipelines over packed words
+#   word_decipher    5-bit word decipher helpers
+#   textcodec        vectorised 5-bit letter codec (many candidates per call)
+#   batch_decipher   many ciphertexts x many keys, scored as one matrix
+#   dict_scorer      Aho-Corasick dictionary scoring
+#   bruteforce       exhaustive seed search (python -m securityrm.bruteforce)
+#   known_plaintext  key recovery from known plaintext
+#   fsm_attack       divide-and-conquer FSM attack (python -m securityrm.fsm_attack)
+#   randomness       streaming statistical tests
+#   bitwire          packed wire formats for bit sequences
+#   filecipher       file encryption with the FSM keystream (python -m securityrm.filecipher)
+#   conformance      pinned outputs of every rule (python -m securityrm.conformance)
+
+import importlib
+
+_SUBMODULES = (
+    "reference", "lfsr_engine", "lfsr_batch", "gf2poly", "fsm_engine", "streaming", "pipeline",
+    "word_decipher", "textcodec", "batch_decipher", "dict_scorer", "bruteforce", "known_plaintext", "fsm_attack",
+    "randomness", "bitwire", "filecipher", "conformance",
+)
+# name -> submodule, for the functions most callers want at the top level
+_EXPORTS = {
+    "xor_bits_from_indices": "reference",
+    "shift_register": "reference",
+    "generate_lfsr_sequence": "reference",
+    "script_lfsr_sequence": "reference",
+    "lfsr_state_table": "reference",
+    "find_lfsr_period": "reference",
+    "lfsr_state_at": "reference",
+    "alternating_step_fsm": "reference",
+    "generate_fsm_2lfsr": "reference",
+    "generate_fsm_2lfsr_gated": "reference",
+    "FSM_RULES": "reference",
+    "pack_state": "lfsr_engine",
+    "unpack_state": "lfsr_engine",
+    "tap_mask": "lfsr_engine",
+    "AlternatingStepFSM": "fsm_engine",
+    "fsm_2lfsr_bits": "fsm_engine",
+    "BitStream": "pipeline",
+    "lfsr_stream": "pipeline",
+    "fsm_alternating_step": "pipeline",
+    "xor_stream": "pipeline",
+    "repeat_to_length_simple": "word_decipher",
+    "xor_simple": "word_decipher",
+    "bits_to_text_simple": "word_decipher",
+    "score_text_with_dictionary": "word_decipher",
+}
+
+__all__ = list(_SUBMODULES) + list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module("." + name, __name__)
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module("." + _EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,78 @@
+# batch_decipher.py - many ciphertexts x many keys for the word decipher
+#
+# /ms_decryption scores one ciphertext against a key list; here a whole
+# batch is scored at once. The work shared by the batch is done once: every
+# key is repeated to the longest ciphertext and packed (a shorter ciphertext
+# uses a prefix of the same rows), and the dictionary is compiled once into
+# the NumPy tables of DictionaryAutomaton.score_many. Ciphertexts of the
+# same length are then xored with all keys in one broadcast, decoded to
+# 5-bit symbols (textcodec) and scored as one matrix. Only the top_k
+# candidates of each ciphertext are decoded to strings.
+
+import numpy as np
+
+from .dict_scorer import compile_dictionary
+from .textcodec import ALPHABET, symbols, decode_rows
+from .word_decipher import DEFAULT_DICTIONARY
+
+# candidate rows (ciphertexts x keys) xored, decoded and scored per step
+DEFAULT_BATCH_ROWS = 1 << 16
+
+
+def expand_keys(keys, length):
+    """returns: (K, ceil(length / 8)) packed matrix, row k = keys[k] repeated to `length` bits"""
+    out = np.zeros((len(keys), length), dtype=np.uint8)
+    for row, key in zip(out, keys):
+        if len(key) == 0:
+            raise ValueError("keys must not be empty")
+        row[:] = np.resize(np.asarray(key, dtype=np.uint8), length)
+    return np.packbits(out, axis=1)
+
+def decipher_batch(ciphertexts, keys, dictionary=None, top_k=5, batch_rows=DEFAULT_BATCH_ROWS,
+                   progress=None):
+    """
+    Score every ciphertext against every key, like the per-key loop of
+    /ms_decryption (text = bits_to_text_simple(cipher ^ repeated key)).
+    dictionary: words for scoring (DEFAULT_DICTIONARY when None)
+    progress: optional callback progress(ciphertexts_done, ciphertexts_total)
+    returns: {"scores": (C, K) int64 matrix,
+              "top": per ciphertext, up to top_k (score, key_index, text)
+                     tuples, best first, ties to the lower key index}
+    key_index counts from 0.
+    """
+    if dictionary is None:
+        dictionary = DEFAULT_DICTIONARY
+    ciphertexts = [np.asarray(c, dtype=np.uint8) for c in ciphertexts]
+    automaton = compile_dictionary(dictionary)
+    longest = max((len(c) for c in ciphertexts), default=0)
+    expanded = expand_keys(keys, longest)
+    count = len(keys)
+    scores = np.zeros((len(ciphertexts), count), dtype=np.int64)
+    top = [[] for _ in ciphertexts]
+
+    if not count:
+        return {"scores": scores, "top": top}
+
+    by_length = {}
+    for i, c in enumerate(ciphertexts):
+        by_length.setdefault(len(c), []).append(i)
+    per_step = max(1, batch_rows // count)
+    done = 0
+    for length, indexes in sorted(by_length.items()):
+        key_rows = expanded[:, :-(-length // 8)]
+        for lo in range(0, len(indexes), per_step):
+            group = indexes[lo:lo + per_step]
+            packed = np.packbits(np.stack([ciphertexts[i] for i in group]), axis=1)
+            plain = packed[:, None, :] ^ key_rows[None, :, :]
+            rows = plain.reshape(len(group) * count, key_rows.shape[1])
+            group_scores = automaton.score_many(symbols(rows, length), ALPHABET).reshape(len(group), count)
+            scores[group] = group_scores
+            for i, row_scores, row_plain in zip(group, group_scores, plain):
+                # stable sort: equal scores keep the lower key index first
+                best = np.argsort(-row_scores, kind="stable")[:top_k]
+                texts = decode_rows(row_plain[best], length)
+                top[i] = [(int(row_scores[k]), int(k), text) for k, text in zip(best, texts)]
+            done += len(group)
+            if progress is not None:
+                progress(done, len(ciphertexts))
+    return {"scores": scores, "top": top}
@@ -0,0 +1,131 @@
+# bitwire.py - compact wire formats for bit sequences
+#
+# JSON lists cost 2-3 bytes per bit and one Python int per bit on parse.
+# Two packed alternatives are understood by the bit endpoints:
+#
+#   base64 in JSON: a bit field is sent as
+#       {"base64": "...", "length": N, "bit_order": "msb" | "lsb"}
+#   application/octet-stream: MAGIC, then one frame per sequence
+#       flags (1 byte, bit 0 set = lsb-first) | bit count (8 bytes, big-endian)
+#       | ceil(count / 8) packed bytes (last byte zero-padded)
+#
+# Decoding goes through np.unpackbits straight into a bytearray (one 0/1
+# byte per bit, indexable like the lists the engines take).
+
+import base64
+import struct
+
+import numpy as np
+
+MAGIC = b"BIT1"
+FLAG_LSB_FIRST = 1
+_FRAME = struct.Struct(">BQ")
+OCTET_STREAM = "application/octet-stream"
+
+
+def _as_array(bits):
+    if isinstance(bits, (bytes, bytearray)):
+        return np.frombuffer(bits, dtype=np.uint8)
+    return np.asarray(bits, dtype=np.uint8)
+
+def pack_bits(bits, bit_order="msb"):
+    """returns: the packed bytes of a 0/1 sequence"""
+    return np.packbits(_as_array(bits), bitorder="big" if bit_order == "msb" else "little").tobytes()
+
+def unpack_bits(data, count, bit_order="msb", offset=0):
+    """returns: bytearray of `count` 0/1 bytes read from packed `data` at byte `offset`"""
+    nbytes = (count + 7) // 8
+    if offset + nbytes > len(data):
+        raise ValueError("packed data holds fewer than %d bits" % count)
+    raw = np.frombuffer(data, dtype=np.uint8, count=nbytes, offset=offset)
+    return bytearray(np.unpackbits(raw, count=count, bitorder="big" if bit_order == "msb" else "little"))
+
+
+# ---------- base64 in JSON ----------
+
+def is_packed(value):
+    return isinstance(value, dict) and "base64" in value
+
+def encode_packed(bits):
+    return {"base64": base64.b64encode(pack_bits(bits)).decode("ascii"),
+            "length": len(bits), "bit_order": "msb"}
+
+def decode_packed(value):
+    """
+    returns: bytearray of the bits of a {"base64", "length", "bit_order"} field;
+    raises ValueError for invalid base64, a bad length or bit order
+    """
+    try:
+        data = base64.b64decode(value["base64"], validate=True)
+    except (TypeError, ValueError):
+        raise ValueError("invalid base64 in packed bit field")
+    count = value.get("length", 8 * len(data))
+    if isinstance(count, bool) or not isinstance(count, int) or count < 0:
+        raise ValueError("packed bit field needs a non-negative integer length, got %r" % (count,))
+    bit_order = value.get("bit_order", "msb")
+    if bit_order not in ("msb", "lsb"):
+        raise ValueError("bit_order must be \"msb\" or \"lsb\", got %r" % (bit_order,))
+    return unpack_bits(data, count, bit_order)
+
+def decode_fields(data):
+    """request dict with every packed field (or packed list element) decoded to a bytearray"""
+    out = {}
+    for key, value in data.items():
+        if is_packed(value):
+            value = decode_packed(value)
+        elif isinstance(value, list) and any(is_packed(v) for v in value):
+            value = [decode_packed(v) if is_packed(v) else v for v in value]
+        out[key] = value
+    return out
+
+def encode_fields(obj, fields, packed):
+    """
+    Walk a response and re-encode the bit sequences stored under `fields`
+    (a sequence, or a list of sequences): base64 objects when packed,
+    plain lists otherwise (bytearrays from packed inputs become lists).
+    An empty list stays [] in both formats, as it may be an empty list of
+    sequences (e.g. "states" with limit 0).
+    """
+    if isinstance(obj, dict):
+        return {k: _encode_bits(v, packed) if k in fields else encode_fields(v, fields, packed)
+                for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [encode_fields(v, fields, packed) for v in obj]
+    return obj
+
+def _encode_bits(value, packed):
+    if isinstance(value, list) and value and isinstance(value[0], (list, bytearray, np.ndarray)):
+        return [_encode_bits(v, packed) for v in value]
+    if value is None or (isinstance(value, list) and not value):
+        return value
+    if packed:
+        return encode_packed(value)
+    return list(value) if isinstance(value, (bytearray, np.ndarray)) else value
+
+
+# ---------- application/octet-stream ----------
+
+def write_frames(sequences, bit_order="msb"):
+    """returns: MAGIC + one frame per bit sequence"""
+    flags = FLAG_LSB_FIRST if bit_order == "lsb" else 0
+    parts = [MAGIC]
+    for bits in sequences:
+        parts.append(_FRAME.pack(flags, len(bits)))
+        parts.append(pack_bits(bits, bit_order))
+    return b"".join(parts)
+
+def read_frames(body):
+    """returns: list of bytearrays, one per frame of an octet-stream body"""
+    if body[:len(MAGIC)] != MAGIC:
+        raise ValueError("octet-stream body must start with %r" % MAGIC)
+    sequences = []
+    offset = len(MAGIC)
+    while offset < len(body):
+        if offset + _FRAME.size > len(body):
+            raise ValueError("truncated frame header at byte %d" % offset)
+        flags, count = _FRAME.unpack_from(body, offset)
+        offset += _FRAME.size
+        order = "lsb" if flags & FLAG_LSB_FIRST else "msb"
+        sequences.append(unpack_bits(body, count, order, offset))
+        offset += (count + 7) // 8
+    return sequences
@@ -0,0 +1,141 @@
+# bruteforce.py - exhaustive LFSR seed search for the word decipher
+#
+# Every nonzero seed of an n-bit register (same taps convention as
+# generate_lfsr_sequence) is expanded to a keystream as long as the
+# ciphertext, xored in, decoded with the 5-bit alphabet and scored like
+# score_text_with_dictionary. Seeds are enumerated in contiguous ranges;
+# each range is clocked at once with the bit-plane engine of lfsr_batch.
+#
+# CLI:  python -m securityrm.bruteforce --length 4 --taps 2 3 [--cipher 1101...] [--top-k 5]
+
+import argparse
+import heapq
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+
+from .lfsr_batch import seeds_to_planes, clock_planes, planes_to_keystreams
+from .lfsr_engine import unpack_state
+from .dict_scorer import compile_dictionary
+from .textcodec import decode_rows
+from .word_decipher import DEFAULT_CIPHER_BITS, DEFAULT_DICTIONARY
+
+DEFAULT_CHUNK_SIZE = 1 << 14
+
+
+def score_seed_range(cipher_bits, taps, length, start, stop, dictionary, top_k):
+    """
+    Score seeds start..stop-1.
+    returns: up to top_k (score, seed, decoded_text) tuples, best first
+    """
+    cipher = np.packbits(np.asarray(cipher_bits, dtype=np.uint8))
+    seeds = np.arange(start, stop, dtype=np.uint64)
+    planes = clock_planes(seeds_to_planes(seeds, length), taps, len(cipher_bits))
+    plain = planes_to_keystreams(planes, len(seeds)) ^ cipher
+    texts = decode_rows(plain, len(cipher_bits))
+    score = compile_dictionary(dictionary).score
+    scored = ((score(text), -(start + i), text)
+              for i, text in enumerate(texts))
+    return [(s, -neg_seed, text) for s, neg_seed, text in heapq.nlargest(top_k, scored)]
+
+def bruteforce_seeds(cipher_bits, taps, length, dictionary=None, top_k=10,
+                     threshold=None, workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                     progress=None):
+    """
+    Try every nonzero seed of a length-bit register.
+    dictionary: words for scoring (DEFAULT_DICTIONARY when None)
+    threshold: stop as soon as a seed scores at least this much
+    workers: process count (os.cpu_count() when None, 1 runs in-process)
+    progress: optional callback progress(seeds_done, seeds_total)
+    returns: dict with "results" (top_k best seeds, best first), "searched",
+             "total" and "stopped_early"
+    """
+    if dictionary is None:
+        dictionary = DEFAULT_DICTIONARY
+    if not 1 <= length <= 64:
+        raise ValueError("register length must be between 1 and 64 bits")
+    total = (1 << length) - 1
+    ranges = ((lo, min(lo + chunk_size, total + 1)) for lo in range(1, total + 1, chunk_size))
+    workers = workers or os.cpu_count() or 1
+
+    best = []
+    searched = 0
+    stopped = False
+
+    def merge(found, size):
+        nonlocal best, searched, stopped
+        best = heapq.nlargest(top_k, best + found, key=lambda r: (r[0], -r[1]))
+        searched += size
+        if progress is not None:
+            progress(searched, total)
+        if threshold is not None and best and best[0][0] >= threshold:
+            stopped = True
+
+    args = (cipher_bits, taps, length)
+    if workers == 1 or total <= chunk_size:
+        for lo, hi in ranges:
+            merge(score_seed_range(*args, lo, hi, dictionary, top_k), hi - lo)
+            if stopped:
+                break
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # keep a bounded number of ranges in flight so an early stop
+            # does not leave the whole keyspace queued
+            pending = {}
+            while not stopped:
+                for lo, hi in ranges:
+                    pending[pool.submit(score_seed_range, *args, lo, hi, dictionary, top_k)] = hi - lo
+                    if len(pending) >= 2 * workers:
+                        break
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    merge(future.result(), pending.pop(future))
+            for future in pending:
+                future.cancel()
+
+    return {
+        "results": [
+            {"seed": seed, "init_state": unpack_state(seed, length), "decoded_text": text, "score": score}
+            for score, seed, text in best
+        ],
+        "searched": searched,
+        "total": total,
+        "stopped_early": stopped and searched < total,
+    }
+
+
+# ---------- CLI ----------
+
+def _parse_bits(text):
+    return [int(c) for c in text if c in "01"]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exhaustive LFSR seed search for the word decipher")
+    parser.add_argument("--length", type=int, required=True, help="register length in bits")
+    parser.add_argument("--taps", type=int, nargs="+", required=True, help="feedback cell indices")
+    parser.add_argument("--cipher", type=_parse_bits, default=DEFAULT_CIPHER_BITS,
+                        help="ciphertext as a 0/1 string (default: exercise ciphertext)")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--threshold", type=int, default=None, help="stop once a score reaches this value")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    def report(done, total):
+        print("\r%d / %d seeds (%.1f%%)" % (done, total, 100.0 * done / total), end="", file=sys.stderr)
+
+    result = bruteforce_seeds(args.cipher, args.taps, args.length, top_k=args.top_k,
+                              threshold=args.threshold, workers=args.workers,
+                              chunk_size=args.chunk_size, progress=report)
+    print(file=sys.stderr)
+    for r in result["results"]:
+        print("seed %d %s: %s    (score=%d)" % (r["seed"], r["init_state"], r["decoded_text"], r["score"]))
+    if result["stopped_early"]:
+        print("stopped early after %d of %d seeds" % (result["searched"], result["total"]))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+# conformance.py - pinned outputs of every LFSR / FSM rule, per engine
+#
+# Each case names a rule of reference.py (or of the word decipher), its
+# inputs, and a summary of the output recorded from the original
+# implementations (the app's inlined functions and the RunOnMachine scripts):
+# length, number of ones, the first bits and a digest (first 16 hex digits of
+# the sha256 of one 0/1 byte per bit), or the decoded text.
+# Every engine that implements the rule is run on the case and must reproduce
+# each pinned field it produces, so a faster kernel can be checked against
+# today's outputs before it replaces a slower one.
+#
+# CLI:  python -m securityrm.conformance [--rule alternating_step ...] [--list]
+
+import argparse
+import hashlib
+import sys
+
+from . import reference
+
+# registers by name: (init_state, taps)
+REGISTERS = {
+    "exo_r1": ([0, 0, 1], [0, 2]),                      # R1 of EXO 1 and EXO 4
+    "exo1_r2": ([0, 0, 1, 0, 1], [2, 4]),
+    "exo4_r2": ([1, 0, 1, 1], [0, 1]),
+    "exo4_r3": ([0, 1, 0, 0, 1], [0, 1, 2, 4]),
+    "singular": ([1, 0, 1, 1, 0, 1], [0, 2]),           # no tap on the last cell: 2-step tail
+    "r11": ([1, 0, 0, 1, 0, 1, 1, 0, 0, 0, 1], [8, 10]),
+    "r13": ([0, 1, 1, 0, 1, 0, 0, 1, 1, 1, 0, 1, 1], [0, 2, 3, 12]),
+    "r17": ([1, 1, 0, 0, 0, 0, 1, 1, 1, 0, 1, 0, 0, 1, 0, 1, 1], [13, 16]),
+}
+
+CASES = [
+    # generate_lfsr_sequence: runs to the first repeated state
+    {"rule": "lfsr_sequence", "name": "exo_r1", "registers": ["exo_r1"],
+     "expected": {"length": 7, "period": 7, "outputs": "e26308257638e70a", "states": "0569272e2c25beae"}},
+    {"rule": "lfsr_sequence", "name": "exo1_r2", "registers": ["exo1_r2"],
+     "expected": {"length": 31, "period": 31, "outputs": "e727cb6106db483f", "states": "e6b86309d1d2ff96"}},
+    {"rule": "lfsr_sequence", "name": "exo4_r2", "registers": ["exo4_r2"],
+     "expected": {"length": 3, "period": 3, "outputs": "9f44ac6acb8a37b0", "states": "b26f4e1dd1e066bc"}},
+    {"rule": "lfsr_sequence", "name": "exo4_r3", "registers": ["exo4_r3"],
+     "expected": {"length": 31, "period": 31, "outputs": "cdde0d44d7644a48", "states": "57baffe8e6ab6d75"}},
+    {"rule": "lfsr_sequence", "name": "singular", "registers": ["singular"],
+     "expected": {"length": 9, "period": 7, "outputs": "46863fd30d68edd2", "states": "c472b3b0985497ab"}},
+    {"rule": "lfsr_sequence", "name": "r11", "registers": ["r11"],
+     "expected": {"length": 2047, "period": 2047, "outputs": "52f6bba92e27d2eb", "states": "fe7bfffcf16269df"}},
+    {"rule": "lfsr_sequence", "name": "r13", "registers": ["r13"],
+     "expected": {"length": 8191, "period": 8191, "outputs": "f2069b7731fb5df6", "states": "e603b709467080cd"}},
+    {"rule": "lfsr_sequence", "name": "r17", "registers": ["r17"],
+     "expected": {"length": 131071, "period": 131071, "outputs": "6b0f3b10ac997462", "states": "0be987579e3d78b6"}},
+    # cut at max_steps: the app reports no period, the scripts report len(outputs)
+    {"rule": "lfsr_sequence", "name": "r17_cut", "registers": ["r17"], "max_steps": 1000,
+     "expected": {"length": 1000, "period": None, "outputs": "9a11fc5f863741ee"}},
+    {"rule": "script_lfsr_sequence", "name": "r17_cut", "registers": ["r17"], "max_steps": 1000,
+     "expected": {"length": 1000, "period": 1000, "outputs": "9a11fc5f863741ee"}},
+
+    # README EXO 4: 651 steps, 323 ones
+    {"rule": "alternating_step", "name": "exo4", "registers": ["exo_r1", "exo4_r2", "exo4_r3"],
+     "expected": {"length": 651, "ones": 323, "outputs": "c3d23cf417bb0dbe",
+                  "head": "1011011101011101100110000"}},
+    {"rule": "alternating_step", "name": "mixed", "registers": ["r11", "r13", "singular"],
+     "b_minus1": 1, "c_minus1": 1, "steps": 50000,
+     "expected": {"length": 50000, "ones": 25066, "outputs": "3036aa3b8560a173", "indices": [872, 432, 0]}},
+
+    {"rule": "forward_backward", "name": "exo1", "registers": ["exo_r1", "exo1_r2"],
+     "expected": {"length": 217, "ones": 108, "outputs": "bb2b44ed40ddc41a"}},
+    {"rule": "forward_backward", "name": "mixed", "registers": ["r11", "r13"], "steps": 40000,
+     "expected": {"length": 40000, "ones": 19998, "outputs": "7d46b9edbb611cc6"}},
+
+    # README EXO 1: 124 bits
+    {"rule": "gated", "name": "exo1", "registers": ["exo_r1", "exo1_r2"],
+     "expected": {"length": 124, "ones": 64, "outputs": "3df30539dca99b54",
+                  "head": "1000110101110110110101000"}},
+    {"rule": "gated", "name": "mixed", "registers": ["r11", "r13"], "steps": 40000,
+     "expected": {"length": 20011, "ones": 10023, "outputs": "6ba4b97d9f443fd6"}},
+
+    # word decipher text: the default ciphertext xored with DEFAULT_KEYS[key],
+    # cut to `length` bits. The app zero-pads a short last 5-bit group, the
+    # script read it as a smaller number
+    {"rule": "word_text", "name": "key5", "key": 4, "length": 70,
+     "expected": {"text": "FINDELEXERCICE"}},
+    {"rule": "word_text", "name": "key5_cut", "key": 4, "length": 68,
+     "expected": {"text": "FINDELEXERCICE"}},
+    {"rule": "word_text", "name": "key3_cut", "key": 2, "length": 68,
+     "expected": {"text": "M?RKRXNCYYXULQ"}},
+    {"rule": "script_word_text", "name": "key5_cut", "key": 4, "length": 68,
+     "expected": {"text": "FINDELEXERCICB"}},
+    {"rule": "script_word_text", "name": "key3_cut", "key": 2, "length": 68,
+     "expected": {"text": "M?RKRXNCYYXULE"}},
+]
+
+
+# ---------- summaries ----------
+
+def digest(bits):
+    """first 16 hex digits of the sha256 of one 0/1 byte per bit"""
+    return hashlib.sha256(bytes(bytearray(bits))).hexdigest()[:16]
+
+def summarise(bits, **extra):
+    bits = bytearray(bits)
+    return dict(extra, length=len(bits), ones=sum(bits), outputs=digest(bits),
+                head="".join(map(str, bits[:25])))
+
+def _outputs(name):
+    init_state, taps = REGISTERS[name]
+    return reference.generate_lfsr_sequence(init_state, taps)[0]
+
+
+# ---------- engines per rule ----------
+# each takes a case and returns the summary fields it can produce
+
+def _lfsr_reference(case):
+    init_state, taps = REGISTERS[case["registers"][0]]
+    outputs, period, states = reference.generate_lfsr_sequence(init_state, taps, max_steps=case.get("max_steps"))
+    return summarise(outputs, period=period, states=digest([b for s in states for b in s]))
+
+def _lfsr_script(case):
+    init_state, taps = REGISTERS[case["registers"][0]]
+    kwargs = {"max_steps": case["max_steps"]} if "max_steps" in case else {}
+    outputs, period, states = reference.script_lfsr_sequence(init_state, taps, **kwargs)
+    return summarise(outputs, period=period, states=digest([b for s in states for b in s]))
+
+def _lfsr_period(case):
+    init_state, taps = REGISTERS[case["registers"][0]]
+    period, _ = reference.find_lfsr_period(init_state, taps, max_steps=case.get("max_steps"))
+    return {"period": period}
+
+def _lfsr_streaming(case):
+    from .streaming import lfsr_chunks
+    init_state, taps = REGISTERS[case["registers"][0]]
+    total = case["expected"]["length"]
+    return summarise(b"".join(lfsr_chunks(init_state, taps, total, chunk_bits=4096)))
+
+def _lfsr_pipeline(case):
+    from .pipeline import lfsr_stream
+    init_state, taps = REGISTERS[case["registers"][0]]
+    return summarise(lfsr_stream(init_state, taps).take(case["expected"]["length"]).bits())
+
+def _alternating_reference(case):
+    fsm, idx1, idx2, idx3 = reference.alternating_step_fsm(
+        *map(_outputs, case["registers"]), case.get("b_minus1", 0), case.get("c_minus1", 0), case.get("steps"))
+    return summarise(fsm, indices=[idx1, idx2, idx3])
+
+def _alternating_numpy(case):
+    from .fsm_engine import AlternatingStepFSM
+    registers = list(map(_outputs, case["registers"]))
+    steps = case.get("steps") or len(registers[0]) * len(registers[1]) * len(registers[2])
+    engine = AlternatingStepFSM(*registers, case.get("b_minus1", 0), case.get("c_minus1", 0))
+    end = engine.state_after(steps)
+    return summarise(engine.bits(0, steps).tobytes(),
+                     indices=[end["r1_index"], end["r2_index"], end["r3_index"]])
+
+def _alternating_streaming(case):
+    from .streaming import fsm_chunks
+    chunks = fsm_chunks(*map(_outputs, case["registers"]), case.get("b_minus1", 0), case.get("c_minus1", 0),
+                        steps=case.get("steps"), chunk_bits=4096)
+    return summarise(b"".join(chunks))
+
+def _alternating_pipeline(case):
+    from .pipeline import fsm_alternating_step
+    registers = list(map(_outputs, case["registers"]))
+    steps = case.get("steps") or len(registers[0]) * len(registers[1]) * len(registers[2])
+    stream = fsm_alternating_step(*registers, case.get("b_minus1", 0), case.get("c_minus1", 0))
+    return summarise(stream.take(steps).bits())
+
+def _forward_backward_reference(case):
+    return summarise(reference.generate_fsm_2lfsr(*map(_outputs, case["registers"]), steps=case.get("steps")))
+
+def _forward_backward_numpy(case):
+    from .fsm_engine import fsm_2lfsr_bits
+    return summarise(fsm_2lfsr_bits(*map(_outputs, case["registers"]), steps=case.get("steps")).tobytes())
+
+def _forward_backward_streaming(case):
+    from .streaming import fsm_2lfsr_chunks
+    return summarise(b"".join(fsm_2lfsr_chunks(*map(_outputs, case["registers"]), steps=case.get("steps"),
+                                               chunk_bits=4096)))
+
+def _gated_reference(case):
+    return summarise(reference.generate_fsm_2lfsr_gated(*map(_outputs, case["registers"]), steps=case.get("steps")))
+
+def _plain_bits(case):
+    from .word_decipher import DEFAULT_CIPHER_BITS, DEFAULT_KEYS
+    key = DEFAULT_KEYS[case["key"]]
+    return [c ^ key[i % len(key)] for i, c in enumerate(DEFAULT_CIPHER_BITS[:case["length"]])]
+
+def _text_reference(case):
+    from .word_decipher import bits_to_text_simple
+    return {"text": bits_to_text_simple(_plain_bits(case))}
+
+def _text_textcodec(case):
+    from .textcodec import decode_rows
+    return {"text": decode_rows([_plain_bits(case)])[0]}
+
+def _text_script(case):
+    from .word_decipher import script_bits_to_text
+    return {"text": script_bits_to_text(_plain_bits(case))}
+
+ENGINES = {
+    "lfsr_sequence": {"reference": _lfsr_reference, "brent": _lfsr_period, "streaming": _lfsr_streaming,
+                      "pipeline": _lfsr_pipeline},
+    "script_lfsr_sequence": {"reference": _lfsr_script},
+    "alternating_step": {"reference": _alternating_reference, "numpy": _alternating_numpy,
+                         "streaming": _alternating_streaming, "pipeline": _alternating_pipeline},
+    "forward_backward": {"reference": _forward_backward_reference, "numpy": _forward_backward_numpy,
+                         "streaming": _forward_backward_streaming},
+    "gated": {"reference": _gated_reference},
+    "word_text": {"reference": _text_reference, "textcodec": _text_textcodec},
+    "script_word_text": {"reference": _text_script},
+}
+
+
+# ---------- checking ----------
+
+def check(rules=None):
+    """
+    rules: rule names to check (all when None)
+    returns: one {"case", "engine", "mismatches"} per case and engine;
+             mismatches maps each differing field to (expected, got)
+    """
+    report = []
+    for case in CASES:
+        if rules and case["rule"] not in rules:
+            continue
+        for engine, run in ENGINES[case["rule"]].items():
+            got = run(case)
+            mismatches = {field: (value, got[field]) for field, value in case["expected"].items()
+                          if field in got and got[field] != value}
+            report.append({"case": "%s/%s" % (case["rule"], case["name"]), "engine": engine,
+                           "mismatches": mismatches})
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check every LFSR / FSM engine against the pinned outputs")
+    parser.add_argument("--rule", action="append", choices=sorted(ENGINES),
+                        help="only check this rule (repeatable)")
+    parser.add_argument("--list", action="store_true", help="list the cases and engines, then exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for case in CASES:
+            print("%s/%s: %s" % (case["rule"], case["name"], ", ".join(ENGINES[case["rule"]])))
+        return 0
+
+    failed = 0
+    for entry in check(args.rule):
+        print("%-4s %-32s %s" % ("ok" if not entry["mismatches"] else "FAIL", entry["case"], entry["engine"]))
+        for field, (expected, got) in entry["mismatches"].items():
+            print("       %s: expected %r, got %r" % (field, expected, got))
+        failed += bool(entry["mismatches"])
+    print("%d failure(s)" % failed if failed else "all engines conform")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
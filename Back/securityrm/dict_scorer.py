@@ -0,0 +1,156 @@
+# dict_scorer.py - Aho-Corasick dictionary scoring
+#
+# score_text_with_dictionary used to run `w in text` for every dictionary
+# word. Here the dictionary is compiled once into an Aho-Corasick automaton
+# (cached per dictionary) and a text is scored in a single pass.
+#
+# Scoring rule (unchanged): every distinct word found in the text adds
+# len(word) once per occurrence of that word in the dictionary list, so the
+# duplicated "OU", "UN", ... of DEFAULT_DICTIONARY still count twice.
+#
+# score_many scores a whole matrix of texts (as symbol indexes) at once with
+# NumPy tables of the same automaton; NumPy is only imported there.
+
+from collections import deque
+from functools import lru_cache
+
+COMPILED_CACHE_SIZE = 64
+
+
+class DictionaryAutomaton:
+    """
+    Compiled form of a word list.
+    delta[state] maps a character to the next state (missing -> root),
+    weight[state] is the score of the word ending exactly at that state and
+    out_link[state] is the nearest proper suffix state that ends a word.
+    """
+
+    def __init__(self, words):
+        delta = [{}]
+        weight = [0]
+        for w in words:
+            if not w:
+                continue
+            s = 0
+            for ch in w:
+                nxt = delta[s].get(ch)
+                if nxt is None:
+                    nxt = len(delta)
+                    delta[s][ch] = nxt
+                    delta.append({})
+                    weight.append(0)
+                s = nxt
+            weight[s] += len(w)
+
+        fail = [0] * len(delta)
+        out_link = [-1] * len(delta)
+        queue = deque(delta[0].values())
+        order = []
+        while queue:
+            s = queue.popleft()
+            order.append(s)
+            for ch, nxt in delta[s].items():
+                f = fail[s]
+                while f and ch not in delta[f]:
+                    f = fail[f]
+                f = delta[f].get(ch, 0)
+                fail[nxt] = f if f != nxt else 0
+                out_link[nxt] = fail[nxt] if weight[fail[nxt]] else out_link[fail[nxt]]
+                queue.append(nxt)
+
+        # complete the goto function into a DFA (breadth-first order, so the
+        # failure state is always finished before the states that use it)
+        for s in order:
+            f = fail[s]
+            row = delta[s]
+            for ch, nxt in delta[f].items():
+                row.setdefault(ch, nxt)
+
+        self.delta = delta
+        self.weight = weight
+        self.out_link = out_link
+        self._dense = {}
+
+    def score(self, text):
+        delta = self.delta
+        weight = self.weight
+        out_link = self.out_link
+        seen = set()
+        score = 0
+        s = 0
+        for ch in text:
+            s = delta[s].get(ch, 0)
+            if s not in seen:
+                # first visit: report this state and its suffix words; states
+                # already visited have had their whole chain reported
+                t = s if weight[s] else out_link[s]
+                while t > 0 and t not in seen:
+                    seen.add(t)
+                    score += weight[t]
+                    t = out_link[t]
+                seen.add(s)
+        return score
+
+    def _dense_tables(self, alphabet):
+        """
+        NumPy form of the DFA over `alphabet` (cached per alphabet):
+        goto (states, symbols) next states, found (states, words) the bitset
+        of word ends reported on entering each state, scores per word end
+        """
+        tables = self._dense.get(alphabet)
+        if tables is not None:
+            return tables
+        import numpy as np
+
+        goto = np.array([[row.get(ch, 0) for ch in alphabet] for row in self.delta], dtype=np.intp)
+        ends = [s for s, w in enumerate(self.weight) if w]
+        column = {s: i for i, s in enumerate(ends)}
+        words = max(1, -(-len(ends) // 64))
+        found = np.zeros((len(self.delta), 64 * words), dtype=np.uint8)
+        for s in range(len(self.delta)):
+            t = s if self.weight[s] else self.out_link[s]
+            while t > 0:
+                found[s, column[t]] = 1
+                t = self.out_link[t]
+        # one row of uint64 words per state; only OR-ed together and
+        # unpacked again, so the byte order inside a word is irrelevant
+        found = np.packbits(found, axis=1).view(np.uint64)
+        scores = np.zeros(64 * words, dtype=np.int64)
+        scores[:len(ends)] = [self.weight[s] for s in ends]
+        tables = self._dense[alphabet] = (goto, found, scores)
+        return tables
+
+    def score_many(self, symbols, alphabet):
+        """
+        symbols: (N, L) matrix of indexes into `alphabet`, one text per row
+                 (e.g. textcodec.symbols with textcodec.ALPHABET)
+        returns: (N,) int64 array, score() of each row's text
+        Runs the automaton over every row at once, one column per step; a
+        word counts once per row however often it is found, as in score().
+        """
+        import numpy as np
+
+        goto, found, scores = self._dense_tables(alphabet)
+        symbols = np.asarray(symbols, dtype=np.intp)
+        rows, length = symbols.shape
+        flat = goto.ravel()
+        state = np.zeros(rows, dtype=np.intp)
+        seen = np.zeros((rows, found.shape[1]), dtype=np.uint64)
+        for j in range(length):
+            state = np.take(flat, state * len(alphabet) + symbols[:, j])
+            seen |= np.take(found, state, axis=0)
+        bits = np.unpackbits(seen.view(np.uint8), axis=1)
+        return bits @ scores
+
+
+@lru_cache(maxsize=COMPILED_CACHE_SIZE)
+def _compile(words):
+    return DictionaryAutomaton(words)
+
+def compile_dictionary(dict_words):
+    """returns: the cached DictionaryAutomaton for a word list"""
+    return _compile(tuple(dict_words))
+
+def score_text(text, dict_words):
+    """Same result as summing len(w) for each w in dict_words with w in text.upper()."""
+    return compile_dictionary(dict_words).score(text.upper())
@@ -0,0 +1,352 @@
+# filecipher.py - encrypt / decrypt files with the 3-LFSR FSM keystream
+#
+# Byte i of the file is xored with FSM output bits 8i .. 8i+7, most
+# significant bit first (the byte layout of the "binary" stream encoding),
+# so encrypting twice with the same registers gives the file back. The
+# registers are clocked as LFSRs from their init states, as in
+# pipeline.fsm_alternating_step over lfsr_stream.
+#
+# Speed comes from working on packed bytes throughout:
+#   - LFSR output is generated packed, 64-bit words at a time: with output
+#     stream a_t and feedback delays d (tap j feeds back a_{t-1-j}), squaring
+#     the connection polynomial LEVEL times gives a_t = XOR_d a_{t - 2^LEVEL d},
+#     whole words apart, so each word xor makes 64 bits
+#   - the FSM runs a byte (8 steps) at a time: the popcounts of the R1 bytes
+#     give how far R2 and R3 have been clocked before each byte, a 9-bit
+#     window of each is read there, and a 256 x 512 table gives the 8 bits
+#     each register holds over the byte
+#   - the file is memory-mapped and xored with the keystream as 64-bit
+#     words, one block at a time
+# With workers > 1 the file is cut into ranges. Each worker jumps R1 to its
+# first step (gf2poly.jump_state), and R2 / R3 to the number of times they
+# were clocked before it. Those counts come from a first parallel pass that
+# only counts the ones of R1 per range.
+#
+# CLI:  python -m securityrm.filecipher encrypt plain.bin cipher.bin --r1 001 0 2 --r2 1011 0 1 --r3 01001 0 1 2 4
+
+import argparse
+import mmap
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .lfsr_engine import pack_state, tap_mask, lfsr_clock
+from .gf2poly import jump_state
+
+DEFAULT_BLOCK_BYTES = 1 << 20
+STEP_BYTES = 1 << 15            # keystream bytes per vectorised step: its temporaries stay in cache
+LEVEL = 16                      # squarings, at least 6 so the delays are whole words
+# EXO 4 registers (FSM3LSFROnMachine.py), (init_state, taps)
+DEFAULT_REGISTERS = (([0, 0, 1], [0, 2]), ([1, 0, 1, 1], [0, 1]), ([0, 1, 0, 0, 1], [0, 1, 2, 4]))
+
+
+# ---------- LFSR output in packed words ----------
+
+class LFSRWords:
+    """
+    Output bits of one register from clock `start` on, packed MSB-first
+    (np.packbits order) and generated 64-bit words at a time.
+    lead: optional extra bit placed before the first output
+    window(count) gives the packed bytes holding the next `count` bits,
+    skip(count) moves past them.
+    """
+
+    def __init__(self, init_state, taps, start=0, lead=None):
+        n = len(init_state)
+        mask = tap_mask(taps, n)
+        state = pack_state(init_state)
+        if start:
+            state = jump_state(state, taps, n, start)
+        delays = [j + 1 for j in range(n) if mask >> j & 1]
+        self.word_delays = [(d << LEVEL) // 64 for d in delays]
+
+        # a_0 .. a_{n-1} are the cells read from the output end; the
+        # bootstrap fills bit by bit, level by level (level s holds from
+        # first + (2^s - 1) * max(d) on) until whole words can follow
+        head, _ = lfsr_clock(state, mask, n, n)
+        head = ([lead & 1] if lead is not None else []) + list(head)
+        first = len(head)
+        span = (1 << LEVEL) * max(delays, default=1)
+        bits = np.zeros((first + span + 64) // 64 * 64, dtype=np.uint8)
+        bits[:first] = head
+        if delays:
+            filled, s = first, 0
+            while filled < len(bits):
+                while s < LEVEL and filled >= first + ((2 << s) - 1) * delays[-1]:
+                    s += 1
+                count = min((1 << s) * delays[0], len(bits) - filled)
+                out = bits[filled:filled + count]
+                np.copyto(out, bits[filled - (delays[0] << s):filled - (delays[0] << s) + count])
+                for d in delays[1:]:
+                    out ^= bits[filled - (d << s):filled - (d << s) + count]
+                filled += count
+        self.buf = np.packbits(bits)
+        self.pos = 0                    # bit of buf holding the next output
+
+    def _extend(self, end):
+        """make buf hold bits up to `end` plus two bytes of padding"""
+        words = -(-(end + 16) // 64)
+        have = len(self.buf) // 8
+        if words <= have:
+            return
+        history = max(self.word_delays, default=0)
+        # run ahead so the history copied below is amortised over many calls
+        words = max(words, self.pos // 64 + 2 * history)
+        keep = min(self.pos // 64, have - history)
+        buf = np.empty(8 * (words - keep), dtype=np.uint8)
+        buf[:8 * (have - keep)] = self.buf[8 * keep:]
+        w = buf.view(np.uint64)
+        if not self.word_delays:
+            # no feedback: the register empties after its n head bits
+            w[have - keep:] = 0
+        else:
+            # the delays are whole words, so the byte order inside a word is irrelevant
+            step = min(self.word_delays)
+            for at in range(have - keep, len(w), step):
+                count = min(step, len(w) - at)
+                out = w[at:at + count]
+                d = self.word_delays[0]
+                np.copyto(out, w[at - d:at - d + count])
+                for d in self.word_delays[1:]:
+                    out ^= w[at - d:at - d + count]
+        self.buf = buf
+        self.pos -= 64 * keep
+
+    def window(self, count):
+        """returns: (packed bytes, bit offset of the next output in them)"""
+        self._extend(self.pos + count)
+        start = self.pos >> 3
+        return self.buf[start:], self.pos & 7
+
+    def skip(self, count):
+        self.pos += count
+
+
+# ---------- FSM keystream ----------
+
+def _held_table():
+    """
+    HELD[a << 9 | w]: the 8 bits held by a register clocked on the 1 bits of
+    control byte a (MSB first), where w holds the bit held before (bit 8)
+    and the next 8 register bits (bits 7 .. 0, in clock order)
+    """
+    a = np.repeat(np.arange(256, dtype=np.int32), 512)
+    w = np.tile(np.arange(512, dtype=np.int32), 256)
+    held = w >> 8 & 1
+    clocked = np.zeros_like(w)
+    out = np.zeros_like(w)
+    for j in range(8):
+        step = a >> (7 - j) & 1
+        clocked += step
+        held = np.where(step == 1, w >> (8 - clocked) & 1, held)
+        out |= held << (7 - j)
+    return out.astype(np.uint8)
+
+_HELD = _held_table()
+_POPCOUNT = np.array([bin(v).count("1") for v in range(256)], dtype=np.intp)
+
+def _held_bytes(control, source, shift, before):
+    """
+    control: control bytes (intp); source, shift: window() of the clocked
+    register, whose first bit is the one held before the block
+    before: register clocks before each control byte (intp)
+    """
+    # np.take with intp indexes: a gather several times faster than a[idx]
+    offsets = before + shift
+    start = offsets >> 3
+    last = int(start[-1]) + 2
+    pairs = source[:last].astype(np.intp) << 8
+    pairs[:-1] |= source[1:last]
+    windows = np.take(pairs, start)
+    windows >>= 7 - (offsets & 7)
+    windows &= 0x1FF
+    windows |= control << 9
+    return np.take(_HELD, windows)
+
+class FSMKeystream:
+    """
+    r1, r2, r3: (init_state, taps) of each register
+    start: first FSM step (a multiple of 8); r1_ones: ones of R1 before
+           `start` (the R2 clocks so far), required when start > 0
+    next_bytes(nbytes) continues the stream, 8 steps per byte.
+    """
+
+    def __init__(self, r1, r2, r3, b_minus1=0, c_minus1=0, start=0, r1_ones=None):
+        if start % 8:
+            raise ValueError("start must be a multiple of 8")
+        if r1_ones is None:
+            if start:
+                raise ValueError("r1_ones is required with a start step")
+            r1_ones = 0
+        r1_zeros = start - r1_ones
+        self.r1 = LFSRWords(*r1, start=start)
+        # R2 / R3 streams begin with the bit they hold: the last one clocked,
+        # or b_minus1 / c_minus1 before their first clock
+        self.r2 = LFSRWords(*r2, start=r1_ones - 1) if r1_ones else LFSRWords(*r2, lead=b_minus1)
+        self.r3 = LFSRWords(*r3, start=r1_zeros - 1) if r1_zeros else LFSRWords(*r3, lead=c_minus1)
+
+    def next_bytes(self, nbytes):
+        """returns: the next `nbytes` keystream bytes (uint8 array)"""
+        if nbytes <= STEP_BYTES:
+            return self._step(nbytes)
+        return np.concatenate([self._step(min(STEP_BYTES, nbytes - done))
+                               for done in range(0, nbytes, STEP_BYTES)])
+
+    def _step(self, nbytes):
+        if not nbytes:
+            return np.zeros(0, dtype=np.uint8)
+        source, _ = self.r1.window(8 * nbytes)
+        control = source[:nbytes].astype(np.intp)
+        ones = np.take(_POPCOUNT, control)
+        ones_before = np.cumsum(ones)
+        ones_before -= ones
+        zeros_before = np.arange(0, 8 * nbytes, 8, dtype=np.intp)
+        zeros_before -= ones_before
+        ones = int(ones_before[-1]) + int(ones[-1])
+        zeros = 8 * nbytes - ones
+
+        b = _held_bytes(control, *self.r2.window(ones + 9), ones_before)
+        c = _held_bytes(control ^ 0xFF, *self.r3.window(zeros + 9), zeros_before)
+        self.r1.skip(8 * nbytes)
+        self.r2.skip(ones)
+        self.r3.skip(zeros)
+        b ^= c
+        return b
+
+def keystream_bytes(r1, r2, r3, nbytes, b_minus1=0, c_minus1=0):
+    """returns: the first `nbytes` keystream bytes (uint8 array)"""
+    return FSMKeystream(r1, r2, r3, b_minus1, c_minus1).next_bytes(nbytes)
+
+
+# ---------- files ----------
+
+def _xor_block(src, dst, offset, keystream):
+    """dst[offset:] = src[offset:] ^ keystream, as 64-bit words where aligned"""
+    size = len(keystream)
+    words = size // 8
+    data = np.frombuffer(src, dtype=np.uint8, count=size, offset=offset)
+    out = np.frombuffer(dst, dtype=np.uint8, count=size, offset=offset)
+    if words:
+        np.bitwise_xor(data[:8 * words].view(np.uint64), keystream[:8 * words].view(np.uint64),
+                       out=out[:8 * words].view(np.uint64))
+    np.bitwise_xor(data[8 * words:], keystream[8 * words:], out=out[8 * words:])
+
+def _count_r1_ones(r1, start, nbytes, block_bytes):
+    """ones of R1 over FSM steps 8 * start .. 8 * (start + nbytes)"""
+    words = LFSRWords(*r1, start=8 * start)
+    ones = 0
+    for done in range(0, nbytes, block_bytes):
+        count = min(block_bytes, nbytes - done)
+        source, _ = words.window(8 * count)
+        ones += int(np.take(_POPCOUNT, source[:count].astype(np.intp)).sum())
+        words.skip(8 * count)
+    return ones
+
+def _crypt_range(src_path, dst_path, start, nbytes, r1_ones, registers, block_bytes, progress=None):
+    """encrypt bytes start .. start + nbytes of src into dst; returns nbytes"""
+    r1, r2, r3, b_minus1, c_minus1 = registers
+    stream = FSMKeystream(r1, r2, r3, b_minus1, c_minus1, start=8 * start, r1_ones=r1_ones)
+    with open(src_path, "rb") as src_file, open(dst_path, "r+b") as dst_file:
+        with mmap.mmap(src_file.fileno(), 0, access=mmap.ACCESS_READ) as src, \
+                mmap.mmap(dst_file.fileno(), 0) as dst:
+            for offset in range(start, start + nbytes, block_bytes):
+                count = min(block_bytes, start + nbytes - offset)
+                _xor_block(src, dst, offset, stream.next_bytes(count))
+                if progress is not None:
+                    progress(offset + count - start, nbytes)
+    return nbytes
+
+def crypt_file(src_path, dst_path, r1=DEFAULT_REGISTERS[0], r2=DEFAULT_REGISTERS[1], r3=DEFAULT_REGISTERS[2],
+               b_minus1=0, c_minus1=0, workers=1, block_bytes=DEFAULT_BLOCK_BYTES, progress=None):
+    """
+    Xor src with the FSM keystream into dst (encryption and decryption are
+    the same operation).
+    r1, r2, r3: (init_state, taps) of each register
+    workers: processes (os.cpu_count() when None); 1 runs in this process
+    progress: optional callback(done_bytes, total_bytes)
+    returns: {"bytes", "workers", "elapsed_s", "bytes_per_s"}
+    """
+    if os.path.exists(dst_path) and os.path.samefile(src_path, dst_path):
+        raise ValueError("output must be a different file than the input")
+    started = time.perf_counter()
+    size = os.path.getsize(src_path)
+    block_bytes = max(8, block_bytes // 8 * 8)
+    workers = workers or os.cpu_count() or 1
+    registers = (r1, r2, r3, b_minus1, c_minus1)
+    with open(dst_path, "wb") as dst_file:
+        dst_file.truncate(size)
+
+    done = 0
+    if size and (workers == 1 or size <= block_bytes):
+        workers = 1
+        done = _crypt_range(src_path, dst_path, 0, size, 0, registers, block_bytes, progress)
+    elif size:
+        # equal ranges of whole blocks, a few per worker
+        per_range = max(block_bytes, -(-size // (4 * workers)) // block_bytes * block_bytes)
+        starts = list(range(0, size, per_range))
+        lengths = [min(per_range, size - s) for s in starts]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            counts = list(pool.map(_count_r1_ones, [r1] * len(starts), starts, lengths,
+                                   [block_bytes] * len(starts)))
+            offsets = np.concatenate(([0], np.cumsum(counts[:-1], dtype=np.int64))).tolist()
+            futures = [pool.submit(_crypt_range, src_path, dst_path, s, n, ones, registers, block_bytes)
+                       for s, n, ones in zip(starts, lengths, offsets)]
+            for future in futures:
+                done += future.result()
+                if progress is not None:
+                    progress(done, size)
+    elapsed = time.perf_counter() - started
+    return {
+        "bytes": size,
+        "workers": workers,
+        "elapsed_s": elapsed,
+        "bytes_per_s": size / elapsed if elapsed else None,
+    }
+
+
+# ---------- CLI ----------
+
+def _register(values):
+    bits = [int(ch) for ch in values[0] if ch in "01"]
+    if not bits or len(bits) != len(values[0]):
+        raise argparse.ArgumentTypeError("register init state must be a 0/1 string")
+    try:
+        taps = [int(t) for t in values[1:]]
+    except ValueError:
+        raise argparse.ArgumentTypeError("taps must be integers")
+    return bits, taps
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Encrypt or decrypt a file with the 3-LFSR FSM keystream")
+    parser.add_argument("mode", choices=("encrypt", "decrypt"), help="the same xor either way")
+    parser.add_argument("input")
+    parser.add_argument("output")
+    for name, (state, taps) in zip(("r1", "r2", "r3"), DEFAULT_REGISTERS):
+        parser.add_argument("--" + name, nargs="+", metavar=("STATE", "TAP"),
+                            default=["".join(map(str, state))] + [str(t) for t in taps],
+                            help="init state as a 0/1 string, then the taps (default: EXO 4)")
+    parser.add_argument("--b-minus1", type=int, default=0)
+    parser.add_argument("--c-minus1", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1, help="processes (0: one per CPU)")
+    parser.add_argument("--block-bytes", type=int, default=DEFAULT_BLOCK_BYTES)
+    args = parser.parse_args(argv)
+    try:
+        r1, r2, r3 = (_register(v) for v in (args.r1, args.r2, args.r3))
+    except argparse.ArgumentTypeError as exc:
+        parser.error(str(exc))
+
+    def report(done, total):
+        print("\r%d / %d bytes (%.1f%%)" % (done, total, 100.0 * done / total), end="", file=sys.stderr)
+
+    result = crypt_file(args.input, args.output, r1, r2, r3, args.b_minus1, args.c_minus1,
+                        workers=args.workers or None, block_bytes=args.block_bytes, progress=report)
+    print(file=sys.stderr)
+    print("%sed %d bytes in %.2f s (%.1f MB/s, %d worker%s)" % (
+        args.mode, result["bytes"], result["elapsed_s"], (result["bytes_per_s"] or 0) / 1e6,
+        result["workers"], "" if result["workers"] == 1 else "s"))
+
+if __name__ == "__main__":
+    main()
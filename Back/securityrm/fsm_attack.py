@@ -0,0 +1,260 @@
+# fsm_attack.py - divide-and-conquer attack on the 3-LFSR alternating-step FSM
+#
+# Given N output bits z of the FSM of /run_fsm and the three tap sets, the
+# seeds are recovered with a search over R1 only (2^n1 candidates instead of
+# the joint 2^(n1+n2+n3)):
+#   - a guess of R1 fixes the control bits a_k. Each step changes exactly
+#     one of b (a_k = 1) or c (a_k = 0), and z_k = b_k ^ c_k, so that
+#     register's bit changes by e_k = z_k ^ z_{k-1}. The e_k of the steps
+#     that clock R2 are the differences a_j ^ a_{j-1} of R2's output, and
+#     likewise for R3;
+#   - differences of an LFSR stream obey the same feedback, so each guess is
+#     scored by how many parity checks d_j = xor of d_{j-d} hold on both
+#     difference streams. The right R1 scores 1.0, a wrong one about 0.5; a
+#     flipped output bit only spoils the few checks around it;
+#   - running xors of e rebuild the R2 / R3 outputs themselves, whose first
+#     n bits are the seeds.
+# Candidates are scored in ranges, a (candidates x N) matrix at a time with
+# R1 clocked by the bit-plane engine of lfsr_batch, across a process pool.
+#
+# The registers are modelled as free-running LFSRs, which is what /run_fsm
+# computes from /generate_lfsr outputs whenever the feedback is nonsingular
+# (the highest cell is a tap).
+#
+# CLI:  python -m securityrm.fsm_attack --fsm 0110... --lengths 5 7 9 --r1-taps 2 4 --r2-taps 5 6 --r3-taps 4 8
+
+import argparse
+import heapq
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+
+from .lfsr_batch import seeds_to_planes, clock_planes, planes_to_keystreams, tap_delays
+from .lfsr_engine import pack_state, unpack_state, tap_mask, lfsr_clock
+from .fsm_engine import AlternatingStepFSM
+
+DEFAULT_CHUNK_SIZE = 1 << 12
+
+
+# ---------- rebuilding R2 / R3 from an R1 guess ----------
+
+def _changes(fsm_bits, b_minus1, c_minus1):
+    """returns: e_k = z_k ^ z_{k-1} (z_{-1} = b_minus1 ^ c_minus1) as uint8"""
+    z = np.asarray(fsm_bits, dtype=np.uint8)
+    return z ^ np.concatenate(([(b_minus1 ^ c_minus1) & 1], z[:-1])).astype(np.uint8)
+
+def _held_bits(fsm_bits, control, b_minus1, c_minus1):
+    """
+    fsm_bits: (N,) output; control: (B, N) R1 bits of B guesses
+    returns: (b, c), the (B, N) R2 / R3 bits held after every step
+    """
+    e = _changes(fsm_bits, b_minus1, c_minus1)
+    b = np.bitwise_xor.accumulate(e & control, axis=1) ^ np.uint8(b_minus1 & 1)
+    c = np.bitwise_xor.accumulate(e & (control ^ 1), axis=1) ^ np.uint8(c_minus1 & 1)
+    return b, c
+
+def _streams(values, clocked):
+    """
+    values: (N,) per-step values or (B, N) per guess
+    returns: (B, N) register streams (the values at clocked steps, moved to
+    the front of each row) and the (B,) number of valid bits per row
+    """
+    order = np.argsort(clocked == 0, axis=1, kind="stable")
+    streams = values[order] if values.ndim == 1 else np.take_along_axis(values, order, axis=1)
+    return streams, clocked.sum(axis=1, dtype=np.int64)
+
+def _parity_checks(streams, counts, taps, length):
+    """
+    streams: difference streams (d_0 = a_0 ^ held bit before, d_j = a_j ^ a_{j-1})
+    returns: (agreeing checks, checks) per row for d_j = xor of d_{j-d}, j > length
+    """
+    first = length + 1
+    width = streams.shape[1]
+    if width <= first:
+        zeros = np.zeros(len(streams), dtype=np.int64)
+        return zeros, zeros
+    residual = streams[:, first:].copy()
+    for d in tap_delays(taps, length):
+        residual ^= streams[:, first - d:width - d]
+    valid = np.arange(first, width)[None, :] < counts[:, None]
+    agree = (valid & (residual == 0)).sum(axis=1, dtype=np.int64)
+    return agree, np.clip(counts - first, 0, None)
+
+def score_r1_range(fsm_bits, r1_taps, r1_length, r2_taps, r2_length, r3_taps, r3_length,
+                   b_minus1, c_minus1, start, stop, top_k):
+    """
+    Score R1 seeds start..stop-1.
+    returns: up to top_k (score, checks, seed) tuples, best first
+    """
+    seeds = np.arange(start, stop, dtype=np.uint64)
+    planes = clock_planes(seeds_to_planes(seeds, r1_length), r1_taps, len(fsm_bits))
+    control = planes_to_keystreams(planes, len(seeds), packed=False)
+    e = _changes(fsm_bits, b_minus1, c_minus1)
+    agree2, checks2 = _parity_checks(*_streams(e, control), r2_taps, r2_length)
+    agree3, checks3 = _parity_checks(*_streams(e, control ^ 1), r3_taps, r3_length)
+    agree, checks = agree2 + agree3, checks2 + checks3
+    scores = agree / np.maximum(checks, 1)
+    scored = ((float(scores[i]), int(checks[i]), -(start + i)) for i in range(len(seeds)))
+    return [(s, n, -neg_seed) for s, n, neg_seed in heapq.nlargest(top_k, scored)]
+
+
+# ---------- seeds of a candidate ----------
+
+def recover_registers(fsm_bits, r1_seed, r1_taps, r1_length, r2_taps, r2_length,
+                      r3_taps, r3_length, b_minus1=0, c_minus1=0):
+    """
+    returns: dict with the three init_states implied by an R1 seed (None for
+    a register clocked fewer than n times) and "verified", true when those
+    seeds reproduce fsm_bits exactly
+    """
+    steps = len(fsm_bits)
+    control, _ = lfsr_clock(r1_seed, tap_mask(r1_taps, r1_length), r1_length, steps)
+    control = np.frombuffer(control, dtype=np.uint8)[None, :]
+    b, c = _held_bits(fsm_bits, control, b_minus1, c_minus1)
+    result = {"r1_init_state": unpack_state(r1_seed, r1_length)}
+    registers = []
+    for name, held, clocked, taps, length in (("r2", b, control, r2_taps, r2_length),
+                                              ("r3", c, control ^ 1, r3_taps, r3_length)):
+        stream, count = _streams(held, clocked)
+        # cell i of the start state is output bit n-1-i
+        state = stream[0, :length][::-1].tolist() if count[0] >= length else None
+        result[name + "_init_state"] = state
+        registers.append((state, taps, length, int(count[0])))
+
+    verified = all(state is not None for state, _, _, _ in registers)
+    if verified:
+        outputs = [np.frombuffer(lfsr_clock(pack_state(state), tap_mask(taps, length), length,
+                                            max(count, 1))[0], dtype=np.uint8)
+                   for state, taps, length, count in registers]
+        r1_out = control[0] if steps else np.zeros(1, dtype=np.uint8)
+        fsm = AlternatingStepFSM(r1_out, outputs[0], outputs[1], b_minus1, c_minus1)
+        verified = bool(np.array_equal(fsm.bits(0, steps), np.asarray(fsm_bits, dtype=np.uint8)))
+    result["verified"] = verified
+    return result
+
+
+# ---------- search ----------
+
+def correlation_attack(fsm_bits, r1_taps, r1_length, r2_taps, r2_length, r3_taps, r3_length,
+                       b_minus1=0, c_minus1=0, top_k=5, stop_on_match=True, workers=None,
+                       chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """
+    Recover the seeds of the 3-LFSR FSM from its output.
+    stop_on_match: stop as soon as a candidate reproduces fsm_bits exactly
+    workers: process count (os.cpu_count() when None, 1 runs in-process)
+    progress: optional callback progress(seeds_done, seeds_total)
+    returns: dict with "results" (top_k R1 candidates, best first, with
+             score, parity checks and the implied seeds), "searched",
+             "total", "stopped_early" and "timing"
+    """
+    if not 1 <= r1_length <= 64:
+        raise ValueError("R1 length must be between 1 and 64 bits")
+    started = time.perf_counter()
+    total = (1 << r1_length) - 1
+    ranges = ((lo, min(lo + chunk_size, total + 1)) for lo in range(1, total + 1, chunk_size))
+    workers = workers or os.cpu_count() or 1
+    registers = (r1_taps, r1_length, r2_taps, r2_length, r3_taps, r3_length)
+    args = (fsm_bits,) + registers + (b_minus1, c_minus1)
+
+    best = []
+    searched = 0
+    stopped = False
+    verified = {}
+
+    def merge(found, size):
+        nonlocal best, searched, stopped
+        best = heapq.nlargest(top_k, best + found)
+        searched += size
+        if progress is not None:
+            progress(searched, total)
+        if stop_on_match:
+            for score, _, seed in found:
+                if score == 1.0 and seed not in verified:
+                    verified[seed] = recover_registers(fsm_bits, seed, *registers, b_minus1, c_minus1)
+                    stopped = stopped or verified[seed]["verified"]
+
+    if workers == 1 or total <= chunk_size:
+        for lo, hi in ranges:
+            merge(score_r1_range(*args, lo, hi, top_k), hi - lo)
+            if stopped:
+                break
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # bounded number of ranges in flight, as in bruteforce_seeds
+            pending = {}
+            while not stopped:
+                for lo, hi in ranges:
+                    pending[pool.submit(score_r1_range, *args, lo, hi, top_k)] = hi - lo
+                    if len(pending) >= 2 * workers:
+                        break
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    merge(future.result(), pending.pop(future))
+            for future in pending:
+                future.cancel()
+
+    results = []
+    for score, checks, seed in best:
+        registers_found = verified.get(seed) or recover_registers(fsm_bits, seed, *registers,
+                                                                   b_minus1, c_minus1)
+        results.append(dict({"r1_seed": seed, "score": score, "checks": checks}, **registers_found))
+    elapsed = time.perf_counter() - started
+    return {
+        "results": results,
+        "searched": searched,
+        "total": total,
+        "stopped_early": stopped and searched < total,
+        "timing": {
+            "elapsed_s": elapsed,
+            "candidates_per_s": searched / elapsed if elapsed else None,
+            "bits_used": len(fsm_bits),
+            "search_space_log2": r1_length,
+            "joint_space_log2": r1_length + r2_length + r3_length,
+        },
+    }
+
+
+# ---------- CLI ----------
+
+def _parse_bits(text):
+    bits = [int(ch) for ch in text if ch in "01"]
+    if not bits:
+        raise argparse.ArgumentTypeError("expected a string of 0/1")
+    return bits
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seed recovery for the 3-LFSR alternating-step FSM")
+    parser.add_argument("--fsm", type=_parse_bits, required=True, help="FSM output as a 0/1 string")
+    parser.add_argument("--lengths", type=int, nargs=3, required=True, metavar=("N1", "N2", "N3"))
+    parser.add_argument("--r1-taps", type=int, nargs="+", required=True)
+    parser.add_argument("--r2-taps", type=int, nargs="+", required=True)
+    parser.add_argument("--r3-taps", type=int, nargs="+", required=True)
+    parser.add_argument("--b-minus1", type=int, default=0)
+    parser.add_argument("--c-minus1", type=int, default=0)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    def report(done, total):
+        print("\r%d / %d R1 seeds (%.1f%%)" % (done, total, 100.0 * done / total), end="", file=sys.stderr)
+
+    n1, n2, n3 = args.lengths
+    result = correlation_attack(args.fsm, args.r1_taps, n1, args.r2_taps, n2, args.r3_taps, n3,
+                                args.b_minus1, args.c_minus1, top_k=args.top_k,
+                                workers=args.workers, progress=report)
+    print(file=sys.stderr)
+    for r in result["results"]:
+        print("R1 %s R2 %s R3 %s  score=%.3f checks=%d%s" % (
+            r["r1_init_state"], r["r2_init_state"], r["r3_init_state"], r["score"], r["checks"],
+            "  (verified)" if r["verified"] else ""))
+    timing = result["timing"]
+    print("%d of %d R1 seeds in %.2f s (%.0f seeds/s)" % (
+        result["searched"], result["total"], timing["elapsed_s"], timing["candidates_per_s"] or 0))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+# fsm_engine.py - closed-form evaluator for the 3-LFSR alternating-step FSM
+#
+# In the FSM of /run_fsm, R1 is clocked every step; a 1 advances R2 and a 0
+# advances R3, and the output is (last R2 bit) xor (last R3 bit). After
+# k + 1 steps R2 has therefore advanced
+#   cnt1 = ((k + 1) // len1) * ones(R1) + prefix[(k + 1) % len1]
+# times and R3 (k + 1) - cnt1 times, where prefix is the cumulative count of
+# ones in R1's period. That gives any output bit in O(1), whole ranges as
+# NumPy gathers, and the exact period of the output without clocking it.
+#
+# The 2-LFSR FSM of /run_fsm_2lfsr has the same structure: its R2 pointer
+# moves +1 / -1 per R1 bit, so it is a cumulative sum over R1 as well.
+
+from math import gcd
+
+import numpy as np
+
+GATHER_CHUNK = 1 << 20
+PERIOD_CHECK_CHUNK = 1 << 20
+DEFAULT_MAX_PERIOD_CHECK = 1 << 26
+
+
+def _lcm(a, b):
+    return a * b // gcd(a, b)
+
+def _prime_factors(n):
+    factors = []
+    p = 2
+    while p * p <= n:
+        if n % p == 0:
+            factors.append(p)
+            while n % p == 0:
+                n //= p
+        p += 1
+    if n > 1:
+        factors.append(n)
+    return factors
+
+
+class AlternatingStepFSM:
+    """
+    r1, r2, r3: one period of each register's output (lists of bits)
+    b_minus1, c_minus1: R2/R3 bits used before those registers first advance
+    Bit k of the stream is the bit /run_fsm outputs at step k.
+    """
+
+    def __init__(self, r1, r2, r3, b_minus1=0, c_minus1=0):
+        if not (len(r1) and len(r2) and len(r3)):
+            raise ValueError("r1, r2 and r3 must all be non-empty")
+        self.r1 = np.asarray(r1, dtype=np.uint8)
+        self.r2 = np.asarray(r2, dtype=np.uint8)
+        self.r3 = np.asarray(r3, dtype=np.uint8)
+        self.b_minus1 = int(b_minus1) & 1
+        self.c_minus1 = int(c_minus1) & 1
+        self.len1, self.len2, self.len3 = len(r1), len(r2), len(r3)
+        # prefix[j] = number of ones in r1[:j]
+        self.prefix = np.concatenate(([0], np.cumsum(self.r1 == 1, dtype=np.int64)))
+        self.ones = int(self.prefix[-1])
+
+    # ---------- pointer positions ----------
+
+    def advances(self, steps):
+        """returns: (R2 advances, R3 advances) after `steps` steps (int or int array)"""
+        if isinstance(steps, np.ndarray):
+            cnt1 = (steps // self.len1) * self.ones + self.prefix[steps % self.len1]
+        else:
+            cnt1 = (steps // self.len1) * self.ones + int(self.prefix[steps % self.len1])
+        return cnt1, steps - cnt1
+
+    def state_after(self, steps):
+        """
+        returns: the FSM registers after `steps` steps, with the same
+        r1_index / r2_index / r3_index meaning as the /run_fsm stats
+        """
+        cnt1, cnt0 = self.advances(steps)
+        idx2 = (cnt1 - 1) % self.len2 if cnt1 else -1
+        idx3 = (cnt0 - 1) % self.len3 if cnt0 else -1
+        return {
+            "r1_index": steps % self.len1,
+            "r2_index": idx2,
+            "r3_index": idx3,
+            "b_prev": int(self.r2[idx2]) if cnt1 else self.b_minus1,
+            "c_prev": int(self.r3[idx3]) if cnt0 else self.c_minus1,
+        }
+
+    # ---------- output ----------
+
+    def bit(self, k):
+        """FSM output bit at step k, O(1)"""
+        state = self.state_after(k + 1)
+        return state["b_prev"] ^ state["c_prev"]
+
+    def bits(self, start, stop):
+        """FSM output bits for steps start..stop-1 as a uint8 array"""
+        out = np.empty(max(stop - start, 0), dtype=np.uint8)
+        if stop <= start:
+            return out
+        periods = max(1, GATHER_CHUNK // self.len1)
+        first = start // self.len1
+        last = (stop - 1) // self.len1
+        for p in range(first, last + 1, periods):
+            m = min(periods, last + 1 - p)
+            block = self._period_block(p, m)
+            lo = max(start, p * self.len1)
+            hi = min(stop, (p + m) * self.len1)
+            out[lo - start:hi - start] = block[lo - p * self.len1:hi - p * self.len1]
+        return out
+
+    def _period_block(self, p, m):
+        """
+        Output of R1 periods p .. p+m-1 (m * len1 bits). Inside the block the
+        k-th R2 read is row j, column i with k = j * ones + prefix[i + 1], so
+        the reads are a gather from R2 rotated to the block's start.
+        """
+        ones, zeros = self.ones, self.len1 - self.ones
+        rows = np.arange(m, dtype=np.int64)[:, None]
+        cols = np.arange(1, self.len1 + 1, dtype=np.int64)[None, :]
+        reads2 = rows * ones + self.prefix[1:][None, :]
+        reads3 = rows * zeros + (cols - self.prefix[1:][None, :])
+        b = self._held_values(self.r2, p * ones, m * ones, self.b_minus1)[reads2]
+        c = self._held_values(self.r3, p * zeros, m * zeros, self.c_minus1)[reads3]
+        return (b ^ c).ravel()
+
+    @staticmethod
+    def _held_values(reg, done, count, initial):
+        """[last bit read before the block] + the next `count` bits of the periodic reg"""
+        n = len(reg)
+        held = np.empty(count + 1, dtype=np.uint8)
+        held[0] = reg[(done - 1) % n] if done else initial
+        if count:
+            held[1:] = np.resize(np.roll(reg, -(done % n)), count)
+        return held
+
+    # ---------- period ----------
+
+    def state_period(self):
+        """period of (R1, R2, R3 pointers) once both R2 and R3 have advanced"""
+        zeros = self.len1 - self.ones
+        return self.len1 * _lcm(self.len2 // gcd(self.len2, self.ones),
+                                self.len3 // gcd(self.len3, zeros))
+
+    def warmup(self):
+        """first step from which the output only depends on the pointer state"""
+        ones = self.r1 == 1
+        first = [int(np.argmax(m)) for m in (ones, ~ones) if m.any()]
+        return max(first)
+
+    def _is_period(self, d, start, span):
+        for lo in range(start, start + span, PERIOD_CHECK_CHUNK):
+            hi = min(lo + PERIOD_CHECK_CHUNK, start + span)
+            if not np.array_equal(self.bits(lo, hi), self.bits(lo + d, hi + d)):
+                return False
+        return True
+
+    def output_period(self, max_check=DEFAULT_MAX_PERIOD_CHECK):
+        """
+        Measured period of the output stream.
+        returns: (period, tail_length); (None, None) when the state period is
+        larger than max_check bits and the check would be too expensive
+        """
+        ps = self.state_period()
+        if ps > max_check:
+            return None, None
+        w = self.warmup()
+
+        # the output repeats with the state period from step w on; shrink it
+        # to the smallest divisor that is still a period
+        period = ps
+        for q in _prime_factors(ps):
+            while period % q == 0 and self._is_period(period // q, w, ps):
+                period //= q
+
+        tail = w
+        while tail > 0 and self.bit(tail - 1) == self.bit(tail - 1 + period):
+            tail -= 1
+        return period, tail
+
+
+# ---------- 2-LFSR FSM (generate_fsm_2lfsr) ----------
+
+def fsm_2lfsr_bits(r1_outputs, r2_outputs, steps=None):
+    """
+    Vectorised generate_fsm_2lfsr: same output, as a uint8 array.
+    Before step k the R2 pointer sits at D_k = sum of (+1 if a_j == 1 else -1)
+    over j < k; a 1 reads r2[D_k], a 0 reads r2[D_k - 1].
+    """
+    if not len(r1_outputs) or not len(r2_outputs):
+        return np.zeros(0, dtype=np.uint8)
+    r1 = np.asarray(r1_outputs, dtype=np.int64)
+    r2 = np.asarray(r2_outputs, dtype=np.uint8)
+    len1, len2 = len(r1), len(r2)
+    if steps is None:
+        steps = _lcm(len1, len2)
+    steps = int(steps)
+
+    moves = np.where(r1 == 1, 1, -1)
+    # prefix[j] = pointer offset after the first j steps of an R1 period;
+    # a 0 reads one cell behind the pointer it then leaves
+    prefix = np.concatenate(([0], np.cumsum(moves)))
+    drift = int(prefix[-1])
+    reads = prefix[:-1] - (r1 != 1)
+
+    out = np.empty(steps, dtype=np.uint8)
+    total = -(-steps // len1)   # R1 periods covered by the output
+    periods = max(1, min(GATHER_CHUNK // len1, total))
+    a_bits = np.tile(r1 & 1, periods).astype(np.uint8)
+    for p in range(0, total, periods):
+        m = min(periods, total - p)
+        ptr = np.arange(m, dtype=np.int64)[:, None] * drift + reads[None, :]
+        lo = int(ptr.min())
+        # window of R2 covering every cell read in this block, rotated so
+        # that window[0] is cell p * drift + lo
+        base = p * drift + lo
+        window = np.resize(np.roll(r2, -(base % len2)), int(ptr.max()) - lo + 1)
+        block = window[(ptr - lo).ravel()] ^ a_bits[:m * len1]
+        start = p * len1
+        out[start:start + min(m * len1, steps - start)] = block[:steps - start]
+    return out
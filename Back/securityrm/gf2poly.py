@@ -0,0 +1,515 @@
+# gf2poly.py - polynomials over GF(2) and LFSR periods computed algebraically
+#
+# A polynomial is a Python int: bit i is the coefficient of x^i
+# (so 0b10011 is x^4 + x + 1). Addition is xor.
+#
+# For the registers used in this project (state[0] receives the feedback,
+# state[-1] is the output cell, feedback = xor of state[t] for t in taps)
+# the output stream a_0, a_1, ... satisfies
+#   a_{k+n} = sum of a_{k+n-1-t} for t in taps
+# which gives the connection polynomial C(x) = 1 + sum of x^(t+1).
+
+import math
+import random
+from functools import lru_cache
+
+
+# ---------- basic arithmetic ----------
+
+def degree(f):
+    return f.bit_length() - 1
+
+def poly_mul(a, b):
+    r = 0
+    while b:
+        if b & 1:
+            r ^= a
+        a <<= 1
+        b >>= 1
+    return r
+
+def poly_divmod(a, b):
+    if b == 0:
+        raise ZeroDivisionError("polynomial division by zero")
+    q = 0
+    db = degree(b)
+    while a and degree(a) >= db:
+        shift = degree(a) - db
+        q ^= 1 << shift
+        a ^= b << shift
+    return q, a
+
+def poly_mod(a, b):
+    return poly_divmod(a, b)[1]
+
+def poly_gcd(a, b):
+    while b:
+        a, b = b, poly_mod(a, b)
+    return a
+
+def poly_mulmod(a, b, m):
+    dm = degree(m)
+    a = poly_mod(a, m)
+    r = 0
+    while b:
+        if b & 1:
+            r ^= a
+        b >>= 1
+        a <<= 1
+        if a >> dm & 1:
+            a ^= m
+    return r
+
+def poly_powmod(a, e, m):
+    r = poly_mod(1, m)
+    a = poly_mod(a, m)
+    while e:
+        if e & 1:
+            r = poly_mulmod(r, a, m)
+        a = poly_mulmod(a, a, m)
+        e >>= 1
+    return r
+
+def poly_derivative(f):
+    # in characteristic 2 only the odd powers survive: d/dx x^(2k+1) = x^(2k)
+    even = int("01" * (f.bit_length() // 2 + 1), 2)
+    return (f >> 1) & even
+
+def poly_sqrt(f):
+    """f must be a square (only even powers); returns g with g*g == f."""
+    g = 0
+    i = 0
+    while f:
+        if f & 1:
+            g |= 1 << i
+        f >>= 2
+        i += 1
+    return g
+
+def poly_to_string(f):
+    if f == 0:
+        return "0"
+    terms = []
+    for i in range(degree(f), -1, -1):
+        if f >> i & 1:
+            terms.append("1" if i == 0 else "x" if i == 1 else "x^%d" % i)
+    return " + ".join(terms)
+
+def poly_exponents(f):
+    return [i for i in range(f.bit_length()) if f >> i & 1]
+
+
+# ---------- factorization ----------
+
+def squarefree_factorization(f):
+    """
+    returns: list of (g, e) with f == product of g^e and every g squarefree
+    """
+    result = []
+    e = 1
+    while degree(f) > 0:
+        d = poly_derivative(f)
+        if d == 0:
+            # f(x) = g(x)^2
+            f = poly_sqrt(f)
+            e *= 2
+            continue
+        c = poly_gcd(f, d)
+        w = poly_divmod(f, c)[0]
+        i = 1
+        while w != 1:
+            y = poly_gcd(w, c)
+            z = poly_divmod(w, y)[0]
+            if z != 1:
+                result.append((z, i * e))
+            i += 1
+            w = y
+            c = poly_divmod(c, y)[0]
+        if c == 1:
+            break
+        f = poly_sqrt(c)
+        e *= 2
+    return result
+
+def distinct_degree_factorization(f):
+    """
+    f: squarefree polynomial
+    returns: list of (g, d) where g is the product of all degree-d factors of f
+    """
+    result = []
+    h = 2  # x
+    d = 0
+    while degree(f) >= 2 * (d + 1):
+        d += 1
+        h = poly_mulmod(h, h, f)
+        g = poly_gcd(f, h ^ 2)
+        if g != 1:
+            result.append((g, d))
+            f = poly_divmod(f, g)[0]
+            h = poly_mod(h, f)
+    if degree(f) > 0:
+        result.append((f, degree(f)))
+    return result
+
+def equal_degree_factorization(f, d, rng=None):
+    """
+    f: squarefree product of irreducible factors of degree d
+    returns: list of those factors (Cantor-Zassenhaus with the trace map)
+    """
+    if degree(f) == d:
+        return [f]
+    rng = rng or random.Random(degree(f))
+    while True:
+        a = rng.getrandbits(degree(f)) | 2
+        t = a
+        s = a
+        for _ in range(d - 1):
+            s = poly_mulmod(s, s, f)
+            t ^= s
+        g = poly_gcd(f, t)
+        if 0 < degree(g) < degree(f):
+            return (equal_degree_factorization(g, d, rng)
+                    + equal_degree_factorization(poly_divmod(f, g)[0], d, rng))
+
+def factor(f):
+    """
+    returns: sorted list of (irreducible factor, multiplicity)
+    """
+    if f == 0:
+        raise ValueError("cannot factor the zero polynomial")
+    counts = {}
+    for g, e in squarefree_factorization(f):
+        for h, d in distinct_degree_factorization(g):
+            for p in equal_degree_factorization(h, d):
+                counts[p] = counts.get(p, 0) + e
+    return sorted(counts.items())
+
+def is_irreducible(f):
+    """Rabin's test."""
+    n = degree(f)
+    if n < 1:
+        return False
+    if poly_powmod(2, 1 << n, f) != poly_mod(2, f):
+        return False
+    for q in _prime_factors(n):
+        h = poly_powmod(2, 1 << (n // q), f)
+        if poly_gcd(f, h ^ 2) != 1:
+            return False
+    return True
+
+
+# ---------- multiplicative order ----------
+
+def _is_probable_prime(n):
+    if n < 2:
+        return False
+    small = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+    for p in small:
+        if n % p == 0:
+            return n == p
+    d = n - 1
+    r = 0
+    while d % 2 == 0:
+        d //= 2
+        r += 1
+    for a in small:
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(r - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+def _pollard_brent(n):
+    if n % 2 == 0:
+        return 2
+    rng = random.Random(n)
+    while True:
+        y, c, m = rng.randrange(1, n), rng.randrange(1, n), 128
+        g = r = q = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+            r *= 2
+        if g == n:
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if g != n:
+            return g
+
+@lru_cache(maxsize=256)
+def _prime_factors(n):
+    """returns: sorted tuple of the distinct prime factors of n"""
+    factors = set()
+    stack = [n]
+    while stack:
+        m = stack.pop()
+        if m == 1:
+            continue
+        if _is_probable_prime(m):
+            factors.add(m)
+            continue
+        for p in (2, 3, 5, 7, 11, 13):
+            if m % p == 0:
+                d = p
+                break
+        else:
+            d = _pollard_brent(m)
+        stack.extend((d, m // d))
+    return tuple(sorted(factors))
+
+def _irreducible_order(p):
+    """order of x modulo an irreducible p with p(0) == 1"""
+    m = degree(p)
+    order = (1 << m) - 1
+    for q in _prime_factors(order) if order > 1 else ():
+        while order % q == 0 and poly_powmod(2, order // q, p) == 1:
+            order //= q
+    return order
+
+def poly_order(f):
+    """
+    Multiplicative order of f: the least e > 0 with f dividing x^e + 1.
+    Requires f(0) == 1.
+    """
+    if not f & 1:
+        raise ValueError("order is only defined when the constant term is 1")
+    if f == 1:
+        return 1
+    order = 1
+    max_mult = 1
+    for p, e in factor(f):
+        o = _irreducible_order(p)
+        order = order * o // math.gcd(order, o)
+        max_mult = max(max_mult, e)
+    # x^(e*2^t) + 1 = (x^e + 1)^(2^t) covers repeated factors
+    return order << (max_mult - 1).bit_length()
+
+def is_primitive(f):
+    n = degree(f)
+    return n >= 1 and f & 1 == 1 and is_irreducible(f) and poly_order(f) == (1 << n) - 1
+
+
+# ---------- LFSR helpers ----------
+
+def connection_polynomial(taps, length):
+    """
+    taps: feedback cell indices (same convention as generate_lfsr_sequence)
+    length: register length
+    returns: C(x) = 1 + sum of x^(t+1) over taps (duplicate taps cancel)
+    """
+    c = 1
+    for t in taps:
+        if not -length <= t < length:
+            raise IndexError("tap index %r out of range for a %d-bit register" % (t, length))
+        c ^= 1 << (t % length + 1)
+    return c
+
+def characteristic_polynomial(taps, length):
+    """
+    returns: P(x) = x^n + sum of x^(n-1-t) over taps, the reciprocal of the
+    connection polynomial padded to degree n (P(0) == 0 for singular taps)
+    """
+    p = 1 << length
+    for t in taps:
+        if not -length <= t < length:
+            raise IndexError("tap index %r out of range for a %d-bit register" % (t, length))
+        p ^= 1 << (length - 1 - t % length)
+    return p
+
+def jump_state(state, taps, length, k):
+    """
+    state: packed register state (bit i is cell i, see lfsr_engine.pack_state)
+    returns: packed state after k clocks, in O(n^2 log k)
+
+    With a_j the output stream, cell i after k clocks holds a_{k+n-1-i} and
+    a_m = L(x^m mod P) where L maps x^j to a_j for j < n.
+    """
+    if k < 0:
+        raise ValueError("k must be >= 0")
+    p = characteristic_polynomial(taps, length)
+    seq = 0  # bit j = a_j
+    for i in range(length):
+        if state >> i & 1:
+            seq |= 1 << (length - 1 - i)
+
+    g = poly_powmod(2, k, p)
+    out = 0
+    for j in range(length):
+        if (g & seq).bit_count() & 1:
+            out |= 1 << (length - 1 - j)
+        g <<= 1
+        if g >> length & 1:
+            g ^= p
+    return out
+
+def polynomial_info(taps, length):
+    """
+    returns: dict describing the connection polynomial of a tap set
+    """
+    c = connection_polynomial(taps, length)
+    return {
+        "connection_polynomial": poly_to_string(c),
+        "exponents": poly_exponents(c),
+        "degree": degree(c),
+        "singular": degree(c) < length,
+        "irreducible": is_irreducible(c),
+        "primitive": is_primitive(c),
+        "order": poly_order(c),
+        "factors": [{"factor": poly_to_string(p), "multiplicity": e} for p, e in factor(c)],
+    }
+
+def lfsr_exact_period(init_state, taps):
+    """
+    Period and tail length of the state sequence of a register, from
+    polynomial algebra only (no clocking of the full period).
+    returns: period (int), tail_length (int)
+
+    The output stream from the first periodic position on has generating
+    function N(x)/C(x); its period is the order of C / gcd(C, N). With
+    singular feedback (deg C = d < n) the first n - d outputs are free and
+    form the tail unless they already agree with the cycle run backwards.
+    """
+    n = len(init_state)
+    c = connection_polynomial(taps, n)
+    d = degree(c)
+    free = n - d
+
+    # a_0 .. a_{n-1} are the initial cells read from the output end
+    a = [init_state[n - 1 - k] & 1 for k in range(n)]
+    b = a[free:]  # first d terms of the purely periodic part
+
+    head = 0
+    for k, bit in enumerate(b):
+        if bit:
+            head |= 1 << k
+    num = poly_mod(poly_mul(c, head), 1 << d) if d else 0
+    period = poly_order(poly_divmod(c, poly_gcd(c, num))[0])
+
+    tail = 0
+    if free:
+        # run the recurrence backwards from b_0 to get b_{-1}, b_{-2}, ...
+        window = list(b)
+        taps_from_top = [i for i in range(1, d) if c >> i & 1]
+        for j in range(free - 1, -1, -1):
+            prev = 0
+            if d:
+                # b_{k+d} = sum(c_i * b_{k+d-i}) with c_d = 1, solved for b_k
+                prev = window[d - 1]
+                for i in taps_from_top:
+                    prev ^= window[d - i - 1]
+                window = ([prev] + window)[:d]
+            if a[j] != prev:
+                tail = j + 1
+                break
+    return period, tail
+
+
+# ---------- Berlekamp-Massey ----------
+
+def berlekamp_massey(bits):
+    """
+    Shortest LFSR generating `bits` (list of 0/1), bit-packed O(N^2).
+    returns: linear complexity L, connection polynomial C (int, deg <= L),
+             profile (list, profile[i] = linear complexity of bits[:i+1])
+    """
+    c = 1       # current connection polynomial
+    b = 1       # polynomial before the last length change
+    L = 0
+    m = -1      # position of the last length change
+    window = 0  # bit j = bits[i-j]
+    profile = []
+    for i, bit in enumerate(bits):
+        window = (window << 1) | (bit & 1)
+        # only bits reached by c, or by b << (i - m) at a later length
+        # change, are ever read again: bits[i - deg c] and bits[m - deg b]
+        # onwards. L + 1 bits are not enough after a long low-complexity
+        # prefix, when L jumps to i + 1 - L.
+        keep = max(c.bit_length(), b.bit_length() + i - m) + 1
+        if window.bit_length() > 2 * keep + 64:
+            window &= (1 << keep) - 1
+        # discrepancy: bits[i] + sum of c_j * bits[i-j]
+        if (c & window).bit_count() & 1:
+            t = c
+            c ^= b << (i - m)
+            if 2 * L <= i:
+                L = i + 1 - L
+                m = i
+                b = t
+        profile.append(L)
+    return L, c, profile
+
+def lfsr_from_sequence(bits):
+    """
+    Berlekamp-Massey in the register convention of generate_lfsr_sequence.
+    returns: dict with linear_complexity, taps, init_state (so that the
+    register reproduces `bits`), connection_polynomial and the profile
+    """
+    L, c, profile = berlekamp_massey(bits)
+    return {
+        "linear_complexity": L,
+        "taps": [j - 1 for j in range(1, L + 1) if c >> j & 1],
+        "init_state": [bits[L - 1 - i] & 1 for i in range(L)],
+        "connection_polynomial": poly_to_string(c),
+        "profile": profile,
+    }
+
+
+# ---------- linear systems ----------
+
+def solve_gf2(rows, nvars):
+    """
+    Gaussian elimination over GF(2) with bit-packed rows.
+    rows: list of (coefficients, rhs) where bit j of `coefficients` is the
+          coefficient of unknown j and rhs is 0/1
+    returns: (solution, nullspace) with `solution` one particular solution
+             (int, bit j = unknown j) and `nullspace` a list of basis vectors,
+             or None when the system is inconsistent
+    """
+    pivots = {}  # pivot bit -> (row, rhs), fully reduced
+    for coeffs, rhs in rows:
+        coeffs &= (1 << nvars) - 1
+        rhs &= 1
+        for bit, (prow, prhs) in pivots.items():
+            if coeffs >> bit & 1:
+                coeffs ^= prow
+                rhs ^= prhs
+        if coeffs == 0:
+            if rhs:
+                return None
+            continue
+        bit = coeffs.bit_length() - 1
+        for other, (prow, prhs) in list(pivots.items()):
+            if prow >> bit & 1:
+                pivots[other] = (prow ^ coeffs, prhs ^ rhs)
+        pivots[bit] = (coeffs, rhs)
+
+    solution = 0
+    for bit, (_, rhs) in pivots.items():
+        if rhs:
+            solution |= 1 << bit
+    nullspace = []
+    for free in range(nvars):
+        if free in pivots:
+            continue
+        v = 1 << free
+        for bit, (prow, _) in pivots.items():
+            if prow >> free & 1:
+                v |= 1 << bit
+        nullspace.append(v)
+    return solution, nullspace
@@ -0,0 +1,128 @@
+# known_plaintext.py - LFSR key recovery from known plaintext (cribs)
+#
+# A crib (a word believed to be in the plaintext) placed at letter position p
+# gives the key bits 5p .. 5p + 5*len(crib) - 1 directly (cipher xor plain).
+# Those bits are linear in the register's start state, so:
+#   - with known taps, the start state is solved by Gaussian elimination
+#     (key bit t is L(x^t mod P), see gf2poly.jump_state);
+#   - without taps, Berlekamp-Massey on the recovered key bits gives the
+#     shortest register first, then the same elimination gives its state.
+# Every crib is slid across every letter position and each consistent key is
+# decoded and scored like the guessed keys of /ms_decryption.
+
+from .gf2poly import (
+    characteristic_polynomial, poly_powmod, solve_gf2, berlekamp_massey
+)
+from .lfsr_engine import tap_mask, unpack_state, lfsr_clock
+from .word_decipher import (
+    text_to_bits_simple, xor_simple, bits_to_text_simple, score_text_with_dictionary
+)
+
+DEFAULT_MAX_SOLUTIONS = 16
+MIN_CRIB_LETTERS = 3
+
+
+def crib_key_bits(cipher_bits, crib, position):
+    """returns: the key bits implied by `crib` at letter `position`, or None if it does not fit"""
+    start = 5 * position
+    plain = text_to_bits_simple(crib)
+    if start < 0 or start + len(plain) > len(cipher_bits):
+        return None
+    return xor_simple(cipher_bits[start:start + len(plain)], plain)
+
+def solve_start_states(key_bits, offset, taps, length, max_solutions=DEFAULT_MAX_SOLUTIONS):
+    """
+    key_bits: known output bits of the register from clock `offset` on
+    returns: up to max_solutions packed nonzero start states (bit i = cell i)
+             whose output matches key_bits at that offset
+    """
+    p = characteristic_polynomial(taps, length)
+    r = poly_powmod(2, offset, p)
+    rows = []
+    for bit in key_bits:
+        rows.append((r, bit))
+        r <<= 1
+        if r >> length & 1:
+            r ^= p
+    solved = solve_gf2(rows, length)
+    if solved is None:
+        return []
+
+    solution, nullspace = solved
+    candidates = [solution]
+    for v in nullspace:
+        if len(candidates) >= max_solutions + 1:
+            break
+        candidates += [c ^ v for c in candidates]
+
+    states = []
+    for seq in candidates:
+        # unknown j is the output bit a_j, which is cell n-1-j of the start state
+        state = 0
+        for j in range(length):
+            if seq >> j & 1:
+                state |= 1 << (length - 1 - j)
+        if state:
+            states.append(state)
+    return states[:max_solutions]
+
+def recover_keys_known_plaintext(cipher_bits, dictionary, cribs=None, length=None, taps=None,
+                                 positions=None, max_solutions=DEFAULT_MAX_SOLUTIONS):
+    """
+    cribs: words to try (default: dictionary words of at least 3 letters)
+    length, taps: register length and taps when known; without taps the
+                  register is synthesised per placement (length then bounds it)
+    positions: letter positions to try (default: all)
+    returns: dict with "candidates" (every distinct consistent key, keys
+             confirmed by more crib placements first, then by score) and
+             "placements_tried"
+    """
+    if taps is not None and length is None:
+        raise ValueError("length is required when taps are given")
+    if cribs is None:
+        cribs = [w for w in dict.fromkeys(dictionary)
+                 if len(w) >= MIN_CRIB_LETTERS and w.isascii() and w.isalpha() and w.isupper()]
+    letters = -(-len(cipher_bits) // 5)
+    if positions is None:
+        positions = range(letters)
+
+    found = {}
+    tried = 0
+    for crib in cribs:
+        for pos in positions:
+            key_bits = crib_key_bits(cipher_bits, crib, pos)
+            if key_bits is None:
+                continue
+            tried += 1
+
+            if taps is not None:
+                reg_taps, reg_length = list(taps), length
+            else:
+                L, c, _ = berlekamp_massey(key_bits)
+                # the synthesised register is only unique with 2L known bits
+                if L == 0 or 2 * L > len(key_bits) or (length is not None and L > length):
+                    continue
+                reg_taps = [j - 1 for j in range(1, L + 1) if c >> j & 1]
+                reg_length = L
+
+            mask = tap_mask(reg_taps, reg_length)
+            for state in solve_start_states(key_bits, 5 * pos, reg_taps, reg_length, max_solutions):
+                keystream, _ = lfsr_clock(state, mask, reg_length, len(cipher_bits))
+                key = tuple(keystream)
+                if key in found:
+                    found[key]["placements"] += 1
+                    continue
+                text = bits_to_text_simple(xor_simple(cipher_bits, keystream))
+                found[key] = {
+                    "key": list(keystream),
+                    "init_state": unpack_state(state, reg_length),
+                    "taps": reg_taps,
+                    "crib": crib,
+                    "position": pos,
+                    "placements": 1,
+                    "decoded_text": text,
+                    "score": score_text_with_dictionary(text, dictionary),
+                }
+
+    candidates = sorted(found.values(), key=lambda r: (-r["placements"], -r["score"]))
+    return {"candidates": candidates, "placements_tried": tried}
@@ -0,0 +1,113 @@
+# lfsr_batch.py - clock many LFSRs with the same taps at once (NumPy bit-planes)
+#
+# N registers are stored transposed: plane[i] is a row of uint64 words whose
+# bit b of word w is cell i of register 64*w + b. One clock of all N
+# registers is then a handful of word-wide xors instead of N Python loops.
+#
+# The output stream a_t of a register (see gf2poly) starts with the cells read
+# from the output end, a_t = cell[n-1-t] for t < n, and continues with
+# a_t = xor of a_{t-1-tap}, so the batch generator fills one plane per clock.
+
+import numpy as np
+
+WORD_BITS = 64
+
+
+def _words(count):
+    return (count + WORD_BITS - 1) // WORD_BITS
+
+def _pack_rows(bits):
+    """bits: (rows, N) array of 0/1 -> (rows, W) uint64, bit b of word w = column 64*w + b"""
+    bits = np.asarray(bits, dtype=np.uint8)
+    rows, n = bits.shape
+    padded = np.zeros((rows, _words(n) * WORD_BITS), dtype=np.uint8)
+    padded[:, :n] = bits & 1
+    return np.packbits(padded, axis=1, bitorder="little").view("<u8")
+
+def _unpack_rows(planes, count):
+    """inverse of _pack_rows: (rows, W) uint64 -> (rows, count) uint8"""
+    planes = np.ascontiguousarray(planes, dtype="<u8")
+    return np.unpackbits(planes.view(np.uint8), axis=1, bitorder="little")[:, :count]
+
+
+# ---------- building bit-planes ----------
+
+def states_to_planes(init_states):
+    """
+    init_states: (N, n) array of bits, one register per row (cell 0 first)
+    returns: (n, W) uint64 planes
+    """
+    states = np.asarray(init_states, dtype=np.uint8)
+    if states.ndim != 2:
+        raise ValueError("init_states must be a 2-D (N_seeds x n) array")
+    return _pack_rows(states.T)
+
+def seeds_to_planes(seeds, length):
+    """
+    seeds: 1-D array of packed states (bit i is cell i, as lfsr_engine.pack_state)
+    returns: (length, W) uint64 planes
+    """
+    seeds = np.asarray(seeds, dtype=np.uint64)
+    cells = (seeds[None, :] >> np.arange(length, dtype=np.uint64)[:, None]) & np.uint64(1)
+    return _pack_rows(cells.astype(np.uint8))
+
+
+# ---------- clocking ----------
+
+def tap_delays(taps, length):
+    """
+    returns: the delays d with a_t = xor of a_{t-d}, one per tap (t + 1);
+    duplicate taps cancel, like xoring the same cell twice. Taps are checked
+    like lfsr_engine.tap_mask (negative indices count from the end).
+    """
+    delays = []
+    for t in taps:
+        if not -length <= t < length:
+            raise IndexError("tap index %r out of range for a %d-bit register" % (t, length))
+        d = t % length + 1
+        if d in delays:
+            delays.remove(d)
+        else:
+            delays.append(d)
+    return delays
+
+def clock_planes(planes, taps, steps):
+    """
+    planes: (n, W) uint64 state planes
+    taps: feedback cell indices (same convention as generate_lfsr_sequence)
+    steps: number of output bits per register
+    returns: (steps, W) uint64 output planes, row t = output bit t of every register
+    """
+    n, width = planes.shape
+    delays = tap_delays(taps, n)
+    seq = np.zeros((max(steps, n), width), dtype=np.uint64)
+    seq[:n] = planes[::-1]
+    for t in range(n, steps):
+        row = seq[t]
+        for d in delays:
+            np.bitwise_xor(row, seq[t - d], out=row)
+    return seq[:steps]
+
+def planes_to_keystreams(out_planes, count, packed=True):
+    """
+    out_planes: (L, W) output planes from clock_planes
+    count: number of registers N
+    returns: (N, L) uint8 bits, or with packed=True the (N, ceil(L/8)) uint8
+    matrix of np.packbits (MSB first) of each keystream
+    """
+    bits = _unpack_rows(out_planes, count).T
+    if packed:
+        return np.packbits(bits, axis=1)
+    return np.ascontiguousarray(bits)
+
+def generate_lfsr_batch(init_states, taps, steps, packed=True):
+    """
+    init_states: (N, n) array of bits, one register per row
+    taps: feedback cell indices shared by every register
+    steps: keystream length L
+    returns: (N, L) keystream matrix (packed to (N, ceil(L/8)) by default);
+    row r equals the first L outputs of generate_lfsr_sequence(init_states[r], taps)
+    """
+    states = np.asarray(init_states, dtype=np.uint8)
+    planes = states_to_planes(states)
+    return planes_to_keystreams(clock_planes(planes, taps, steps), states.shape[0], packed=packed)
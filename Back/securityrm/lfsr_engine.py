@@ -0,0 +1,268 @@
+# lfsr_engine.py - bit-packed integer LFSR core
+#
+# The register is held as a single Python int instead of a list of bits.
+# Bit i of the int is cell i of the list-based state used everywhere else
+# (state[0] receives the feedback, state[-1] is the output cell), so
+#   [feedback] + state[:-1]   becomes   ((s << 1) & full) | feedback
+# and the feedback is the parity of (s & tap_mask).
+
+from collections.abc import Sequence
+from math import ceil
+
+_FROM_ASCII = bytes.maketrans(b"01", b"\x00\x01")
+
+
+# ---------- state packing ----------
+
+def pack_state(bits):
+    """
+    bits: list of bits (0/1), bits[0] is cell 0
+    returns: int with bit i set when bits[i] == 1
+    """
+    value = 0
+    for i, b in enumerate(bits):
+        if b & 1:
+            value |= 1 << i
+    return value
+
+def unpack_state(value, length):
+    """
+    value: packed state (int)
+    length: number of cells
+    returns: list of bits, inverse of pack_state
+    """
+    return [(value >> i) & 1 for i in range(length)]
+
+def tap_mask(taps, length):
+    """
+    taps: list of cell indices used for feedback xor (0-based, negative
+          indices count from the end like list indexing)
+    length: number of cells
+    returns: int mask with one bit per tap (duplicate taps cancel out,
+             exactly like xoring the same cell twice)
+    """
+    mask = 0
+    for t in taps:
+        if not -length <= t < length:
+            raise IndexError("tap index %r out of range for a %d-bit register" % (t, length))
+        mask ^= 1 << (t % length)
+    return mask
+
+def parity(x):
+    return x.bit_count() & 1
+
+
+# ---------- clocking ----------
+
+def lfsr_clock(state, mask, length, count):
+    """
+    Clock a packed register `count` times.
+    returns: outputs (bytearray, one 0/1 byte per clock), final state (int)
+    """
+    hi = length - 1
+    full = (1 << length) - 1
+    out = bytearray(count)
+    s = state
+    for i in range(count):
+        out[i] = (s >> hi) & 1
+        s = ((s << 1) & full) | ((s & mask).bit_count() & 1)
+    return out, s
+
+def lfsr_outputs(state, mask, length, count):
+    """
+    The outputs of lfsr_clock(state, mask, length, count), a word at a time.
+    returns: bytearray, one 0/1 byte per clock
+
+    The output stream satisfies a_t = xor(a_{t-d}) over the tap delays
+    d = tap + 1 once t >= length, and squaring the connection polynomial
+    gives a_t = xor(a_{t-d*2^s}) from t >= length + (2^s - 1) * max(d) on.
+    At level s one xor of shifted big ints produces min(d) * 2^s new bits,
+    so the chunks double in size as the stream grows.
+    """
+    hi = length - 1
+    head = min(count, length)
+    a = 0
+    for t in range(head):
+        a |= ((state >> (hi - t)) & 1) << t
+    delays = [j + 1 for j in range(length) if mask >> j & 1]
+
+    filled = head
+    if delays:
+        d0, dmax = delays[0], delays[-1]
+        level = 0
+        while filled < count:
+            while filled >= length + ((2 << level) - 1) * dmax:
+                level += 1
+            size = min(d0 << level, count - filled)
+            chunk = 0
+            for d in delays:
+                chunk ^= a >> (filled - (d << level))
+            a |= (chunk & ((1 << size) - 1)) << filled
+            filled += size
+    # without taps only zeros are shifted in
+    if not count:
+        return bytearray()
+    return bytearray(format(a, "0%db" % count)[::-1].encode("ascii").translate(_FROM_ASCII))
+
+def lfsr_cycle(state, mask, length, max_steps=None):
+    """
+    Period of a nonsingular register (output cell length-1 tapped), found in
+    its output stream: state t equals `state` exactly when outputs[t:t+length]
+    equals outputs[:length], so each doubling of the stream is one find.
+    returns: period (int or None), outputs (bytearray)
+    period is None when it is not below max_steps (run_lfsr stops first);
+    outputs covers states 0 .. period (or max_steps - 1) plus length - 1 bits.
+    """
+    cap = (1 << length) - 1 if max_steps is None else ceil(max_steps) - 1
+    count = max(0, min(cap, 1024))
+    while True:
+        outputs = lfsr_outputs(state, mask, length, count + length)
+        t = outputs.find(outputs[:length], 1)
+        if t != -1:
+            return t, outputs
+        if count >= cap:
+            return None, outputs
+        count = min(2 * count, cap)
+
+def lfsr_states(state, mask, length, count):
+    """
+    returns: the `count` packed states starting with `state` (one per clock)
+    """
+    full = (1 << length) - 1
+    states = []
+    s = state
+    for _ in range(count):
+        states.append(s)
+        s = ((s << 1) & full) | ((s & mask).bit_count() & 1)
+    return states
+
+def run_lfsr(state, mask, length, max_steps=None):
+    """
+    Clock a packed register until the first repeated state (or max_steps).
+    returns: outputs (bytearray), period (int or None), states (list of ints)
+    Same contract as generate_lfsr_sequence: `states` holds every distinct
+    state visited, `outputs` one bit per state, and period is None when
+    max_steps is reached first.
+    """
+    hi = length - 1
+    full = (1 << length) - 1
+    seen = {}
+    states = []
+    outputs = bytearray()
+    s = state
+    step = 0
+
+    while True:
+        first = seen.setdefault(s, step)
+        if first != step:
+            return outputs, step - first, states
+
+        states.append(s)
+        outputs.append((s >> hi) & 1)
+        s = ((s << 1) & full) | ((s & mask).bit_count() & 1)
+
+        step += 1
+        if max_steps is not None and step >= max_steps:
+            return outputs, None, states
+
+
+class StateTable(Sequence):
+    """
+    The first `count` register states of a run, read off its output stream
+    (at least count + length - 1 bits): state t holds a_{t+length-1-i} in
+    cell i, so row t is outputs[t:t+length] reversed. Rows are unpacked to
+    bit lists only when indexed or iterated.
+    """
+
+    def __init__(self, outputs, length, count):
+        if len(outputs) < count + length - 1:
+            raise ValueError("%d states of a %d-bit register need %d outputs, got %d"
+                             % (count, length, count + length - 1, len(outputs)))
+        self._outputs = outputs
+        self.length = length
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._rows(*index.indices(self._count))
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("state index out of range")
+        return list(self._outputs[index:index + self.length])[::-1]
+
+    def __iter__(self):
+        return iter(self._rows(0, self._count, 1))
+
+    def _rows(self, start, stop, step):
+        # slices of one reversed copy instead of one reversal per row
+        end = stop + self.length - 1 if step > 0 else start + self.length
+        first = start if step > 0 else stop + 1
+        rev = list(self._outputs[first:end])[::-1]
+        top = len(rev) + first
+        n = self.length
+        return [rev[top - t - n:top - t] for t in range(start, stop, step)]
+
+
+# ---------- constant-memory period detection ----------
+
+def lfsr_period(state, mask, length, max_steps=None):
+    """
+    Find the cycle reached from `state` without storing visited states.
+    returns: period (int or None), tail_length (int or None)
+    tail_length is the number of states before the cycle is entered; it is
+    only non-zero for singular feedback (output cell length-1 not tapped).
+    Both are None unless tail_length + period < max_steps, i.e. exactly when
+    run_lfsr (generate_lfsr_sequence) stops at max_steps without a period.
+    """
+    hi = length - 1
+    full = (1 << length) - 1
+
+    def step(s):
+        return ((s << 1) & full) | ((s & mask).bit_count() & 1)
+
+    if mask >> hi & 1:
+        # nonsingular feedback: the state map is a permutation, so every
+        # state lies on a pure cycle and we only wait to see `state` again
+        limit = max_steps if max_steps is not None else 1 << length
+        s = step(state)
+        period = 1
+        while s != state and period < limit:
+            s = ((s << 1) & full) | ((s & mask).bit_count() & 1)
+            period += 1
+        if period >= limit:
+            return None, None
+        return period, 0
+
+    # Brent's algorithm: find the cycle length first. It meets the cycle
+    # within 3 * (tail + period) clocks, so a cycle that fits in max_steps
+    # is never given up on too early...
+    power = period = 1
+    tortoise, hare = state, step(state)
+    clocks = 1
+    while tortoise != hare:
+        if max_steps is not None and clocks >= 3 * max_steps:
+            return None, None
+        if power == period:
+            tortoise = hare
+            power *= 2
+            period = 0
+        hare = step(hare)
+        period += 1
+        clocks += 1
+
+    # ...then the tail, with the hare kept `period` clocks ahead
+    tortoise = hare = state
+    for _ in range(period):
+        hare = step(hare)
+    tail = 0
+    while tortoise != hare:
+        tortoise = step(tortoise)
+        hare = step(hare)
+        tail += 1
+    if max_steps is not None and tail + period >= max_steps:
+        return None, None
+    return period, tail
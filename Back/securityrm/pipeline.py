@@ -0,0 +1,187 @@
+# pipeline.py - lazy LFSR / FSM / XOR pipelines over packed words
+#
+# A BitStream is an iterator of packed words (Python ints of WORD_BITS bits,
+# bit i of word k is bit k * WORD_BITS + i of the stream) and its length in
+# bits, None for an endless stream. Nothing is computed until the stream is
+# iterated, so a pipeline such as
+#
+#   key = fsm_alternating_step(lfsr_stream(s1, t1), lfsr_stream(s2, t2), lfsr_stream(s3, t3))
+#   plain = xor_stream(cipher_bits, key).tolist()
+#
+# runs over data of any length holding one word per stage, and only
+# materialises on bits() / tolist(). Like any iterator a stream is consumed
+# by iterating it. Plain bit sequences (lists, bytearrays) are accepted
+# wherever a stream is; cycle() repeats one endlessly.
+
+import sys
+from array import array
+
+from .lfsr_engine import pack_state, tap_mask, lfsr_clock
+from .gf2poly import jump_state
+
+WORD_BITS = 64
+_WORD_MASK = (1 << WORD_BITS) - 1
+_TO_ASCII = bytes.maketrans(b"\x00\x01", b"01")
+_FROM_ASCII = bytes.maketrans(b"01", b"\x00\x01")
+
+
+# ---------- packing ----------
+
+def _pack(bits):
+    """returns: int with bit i = bits[i]"""
+    if not len(bits):
+        return 0
+    return int(bytes(bits)[::-1].translate(_TO_ASCII), 2)
+
+def _unpack(word, count):
+    """returns: bytes of the low `count` bits of word, bit 0 first"""
+    return format(word, "0%db" % count)[::-1].encode("ascii").translate(_FROM_ASCII)
+
+def _split_words(value, count):
+    """returns: array of the WORD_BITS-bit words of a `count`-bit int, low word first"""
+    words = array("Q", value.to_bytes(8 * -(-count // WORD_BITS), "little"))
+    if sys.byteorder == "big":
+        words.byteswap()
+    return words
+
+def _join_words(words):
+    """returns: int whose WORD_BITS-bit words are `words`, low word first"""
+    words = array("Q", words)
+    if sys.byteorder == "big":
+        words.byteswap()
+    return int.from_bytes(words.tobytes(), "little")
+
+
+# ---------- streams ----------
+
+class BitStream:
+    """
+    words: iterable of packed words, all full except possibly the last
+    length: bits in the stream, None when endless
+    Bits past `length` in the last word are masked off on iteration.
+    """
+
+    def __init__(self, words, length=None):
+        self._words = iter(words)
+        self.length = length
+
+    def __iter__(self):
+        if self.length is None:
+            yield from self._words
+            return
+        remaining = self.length
+        while remaining > 0:
+            word = next(self._words, None)
+            if word is None:
+                return
+            if remaining < WORD_BITS:
+                word &= (1 << remaining) - 1
+            remaining -= WORD_BITS
+            yield word
+
+    def take(self, count):
+        """returns: a stream of the first `count` bits"""
+        count = int(count) if self.length is None else min(int(count), self.length)
+        return BitStream(iter(self), count)
+
+    def bits(self):
+        """returns: the stream as a bytearray of 0/1 bytes"""
+        if self.length is None:
+            raise ValueError("cannot materialise an endless stream, take() a prefix first")
+        # one conversion of the whole stream instead of one per word
+        return bytearray(_unpack(_join_words(self), self.length)) if self.length else bytearray()
+
+    def tolist(self):
+        return list(self.bits())
+
+def as_stream(value):
+    """returns: `value` if it is a BitStream, else a finite stream of its bits"""
+    if isinstance(value, BitStream):
+        return value
+    return BitStream(_split_words(_pack(value), len(value)), len(value))
+
+def cycle(bits):
+    """returns: endless stream repeating the bit sequence `bits`"""
+    period = len(bits)
+    if not period:
+        raise ValueError("cannot cycle an empty sequence")
+    # one int holding enough repeats that any word starting inside the
+    # first period can be read with a shift and a mask
+    pattern, covered = _pack(bits), period
+    while covered < period + WORD_BITS:
+        pattern |= pattern << covered
+        covered *= 2
+
+    def words():
+        pos = 0
+        while True:
+            yield (pattern >> pos) & _WORD_MASK
+            pos = (pos + WORD_BITS) % period
+    return BitStream(words())
+
+def _iter_bits(stream):
+    """the bits of a stream one at a time"""
+    remaining = stream.length
+    for word in stream:
+        count = WORD_BITS if remaining is None else min(WORD_BITS, remaining)
+        yield from _unpack(word, count)
+        if remaining is not None:
+            remaining -= count
+
+
+# ---------- generators ----------
+
+def lfsr_stream(init_state, taps, offset=0):
+    """
+    returns: endless stream of the outputs of generate_lfsr_sequence's
+    register, starting `offset` clocks in (reached with gf2poly.jump_state)
+    """
+    length = len(init_state)
+    mask = tap_mask(taps, length)
+    state = pack_state(init_state)
+    if offset:
+        state = jump_state(state, taps, length, offset)
+
+    def words():
+        s = state
+        while True:
+            out, s = lfsr_clock(s, mask, length, WORD_BITS)
+            yield _pack(out)
+    return BitStream(words())
+
+def fsm_alternating_step(r1, r2, r3, b_minus1=0, c_minus1=0):
+    """
+    The 3-LFSR alternating-step FSM of /run_fsm over streams: R1 decides
+    which of R2 (a = 1) and R3 (a = 0) is clocked, the output is b ^ c.
+    Plain sequences are cycled, like the register periods /run_fsm takes.
+    returns: stream as long as r1 (endless for an LFSR or a cycled sequence)
+    """
+    r1, r2, r3 = (r if isinstance(r, BitStream) else cycle(r) for r in (r1, r2, r3))
+
+    def words():
+        control, b_bits, c_bits = _iter_bits(r1), _iter_bits(r2), _iter_bits(r3)
+        b, c = int(b_minus1) & 1, int(c_minus1) & 1
+        word = filled = 0
+        for a in control:
+            if a == 1:
+                b = next(b_bits, None)
+                if b is None:
+                    raise ValueError("r2 ran out of bits")
+            else:
+                c = next(c_bits, None)
+                if c is None:
+                    raise ValueError("r3 ran out of bits")
+            word |= (b ^ c) << filled
+            filled += 1
+            if filled == WORD_BITS:
+                yield word
+                word = filled = 0
+        if filled:
+            yield word
+    return BitStream(words(), r1.length)
+
+def xor_stream(a, b):
+    """returns: stream of a ^ b, as long as the shorter of the two"""
+    a, b = as_stream(a), as_stream(b)
+    lengths = [n for n in (a.length, b.length) if n is not None]
+    return BitStream((x ^ y for x, y in zip(a, b)), min(lengths) if lengths else None)
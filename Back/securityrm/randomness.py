@@ -0,0 +1,272 @@
+# randomness.py - streaming statistical tests for keystreams (NIST SP 800-22 style)
+#
+# RandomnessBattery is fed the stream chunk by chunk (any iterable of 0/1
+# bytes or uint8 arrays) and keeps only counters and a few carried bits, so
+# a stream of any length is tested in constant memory:
+#   monobit, runs, block frequency, serial, approximate entropy,
+#   autocorrelation (per delay) and linear complexity (Berlekamp-Massey per
+#   block, NIST's block test).
+# Overlapping-pattern tests wrap around the end of the sequence like the
+# NIST reference, using the first bits kept from the start of the stream.
+
+import math
+
+import numpy as np
+
+from .gf2poly import berlekamp_massey
+
+DEFAULT_ALPHA = 0.01
+DEFAULT_OPTIONS = {
+    "block_size": 128,          # block frequency M
+    "serial_m": 4,
+    "apen_m": 3,
+    "delays": [1, 2, 8, 16],    # autocorrelation shifts
+    "lc_block_size": 500,       # linear complexity M
+}
+# NIST linear complexity class probabilities for T <= -2.5, ..., T > 2.5
+_LC_PI = [0.010417, 0.03125, 0.125, 0.5, 0.25, 0.0625, 0.020833]
+
+
+# ---------- special functions ----------
+
+def igamc(a, x):
+    """regularized upper incomplete gamma Q(a, x)"""
+    if x <= 0:
+        return 1.0
+    if x < a + 1:
+        # series for P(a, x)
+        term = total = 1.0 / a
+        n = a
+        while abs(term) > abs(total) * 1e-15:
+            n += 1
+            term *= x / n
+            total += term
+        return max(0.0, 1.0 - total * math.exp(-x + a * math.log(x) - math.lgamma(a)))
+    # continued fraction for Q(a, x) (modified Lentz)
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 10000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return math.exp(-x + a * math.log(x) - math.lgamma(a)) * h
+
+def _result(p_value, alpha, **stats):
+    return dict(stats, p_value=p_value, passed=p_value >= alpha)
+
+
+# ---------- battery ----------
+
+class RandomnessBattery:
+    """
+    options: overrides of DEFAULT_OPTIONS
+    update(chunk) for each chunk, then results()
+    """
+
+    def __init__(self, options=None, alpha=DEFAULT_ALPHA):
+        self.options = dict(DEFAULT_OPTIONS, **(options or {}))
+        self.alpha = alpha
+        self.n = 0
+        self.ones = 0
+        self.transitions = 0
+        self.last = None
+        # block frequency
+        self.block_chi = 0.0
+        self.blocks = 0
+        self.block_fill = 0
+        self.block_ones = 0
+        # overlapping patterns of every length the serial / ApEn tests need
+        m_serial, m_apen = self.options["serial_m"], self.options["apen_m"]
+        self.pattern_lengths = sorted({k for k in (m_serial, m_serial - 1, m_serial - 2, m_apen, m_apen + 1)
+                                       if k >= 1})
+        self.keep = max(max(self.pattern_lengths, default=1) - 1, max(self.options["delays"], default=0))
+        self.patterns = {k: np.zeros(1 << k, dtype=np.int64) for k in self.pattern_lengths}
+        self.head = np.zeros(0, dtype=np.uint8)
+        self.tail = np.zeros(0, dtype=np.uint8)
+        # autocorrelation: differing pairs (s_i, s_{i+d}) per delay
+        self.differ = {d: 0 for d in self.options["delays"]}
+        # linear complexity
+        self.lc_counts = [0] * 7
+        self.lc_pending = np.zeros(0, dtype=np.uint8)
+
+    def update(self, chunk):
+        bits = np.frombuffer(chunk, dtype=np.uint8) if isinstance(chunk, (bytes, bytearray)) \
+            else np.asarray(chunk, dtype=np.uint8)
+        if not len(bits):
+            return
+        self.ones += int(np.count_nonzero(bits))
+        self.transitions += int(np.count_nonzero(bits[1:] != bits[:-1]))
+        if self.last is not None:
+            self.transitions += int(bits[0] != self.last)
+        self.last = bits[-1]
+        self._block_frequency(bits)
+
+        ext = np.concatenate((self.tail, bits))
+        lead = len(self.tail)
+        for k in self.pattern_lengths:
+            # windows ending inside this chunk that start at or after bit 0
+            first_end = max(lead, k - 1)
+            self.patterns[k] += _pattern_counts(ext, k, first_end)
+        for d in self.differ:
+            start = max(lead, d)
+            if start < len(ext):
+                self.differ[d] += int(np.count_nonzero(ext[start:] != ext[start - d:len(ext) - d]))
+
+        self._linear_complexity(bits)
+        if len(self.head) < self.keep:
+            self.head = np.concatenate((self.head, bits[:self.keep - len(self.head)]))
+        self.tail = ext[-self.keep:] if self.keep else ext[:0]
+        self.n += len(bits)
+
+    def _block_frequency(self, bits):
+        m = self.options["block_size"]
+        i = 0
+        if self.block_fill:
+            take = min(m - self.block_fill, len(bits))
+            self.block_ones += int(np.count_nonzero(bits[:take]))
+            self.block_fill += take
+            i = take
+            if self.block_fill == m:
+                self._close_block(self.block_ones)
+        whole = (len(bits) - i) // m
+        if whole:
+            counts = bits[i:i + whole * m].reshape(whole, m).sum(axis=1, dtype=np.int64)
+            self.block_chi += float((((counts / m) - 0.5) ** 2).sum())
+            self.blocks += whole
+            i += whole * m
+        if i < len(bits):
+            self.block_fill = len(bits) - i
+            self.block_ones = int(np.count_nonzero(bits[i:]))
+
+    def _close_block(self, ones):
+        m = self.options["block_size"]
+        self.block_chi += (ones / m - 0.5) ** 2
+        self.blocks += 1
+        self.block_fill = 0
+        self.block_ones = 0
+
+    def _linear_complexity(self, bits):
+        m = self.options["lc_block_size"]
+        pending = np.concatenate((self.lc_pending, bits))
+        whole = len(pending) // m
+        mu = m / 2 + (9 + (-1) ** (m + 1)) / 36 - (m / 3 + 2 / 9) / 2 ** m
+        for j in range(whole):
+            L, _, _ = berlekamp_massey(pending[j * m:(j + 1) * m].tolist())
+            t = (-1) ** m * (L - mu) + 2 / 9
+            self.lc_counts[min(6, max(0, math.ceil(t + 2.5)))] += 1
+        self.lc_pending = pending[whole * m:]
+
+    # ---------- results ----------
+
+    def _wrapped_patterns(self, k):
+        """pattern counts including the k-1 windows that wrap past the end"""
+        counts = self.patterns[k].copy()
+        if k > 1 and self.n >= k:
+            ext = np.concatenate((self.tail[-(k - 1):], self.head[:k - 1]))
+            counts += _pattern_counts(ext, k, k - 1)
+        return counts
+
+    def _psi2(self, k):
+        if k <= 0:
+            return 0.0
+        counts = self._wrapped_patterns(k)
+        return float((1 << k) / self.n * (counts.astype(np.float64) ** 2).sum() - self.n)
+
+    def _phi(self, k):
+        if k <= 0:
+            return 0.0
+        counts = self._wrapped_patterns(k).astype(np.float64)
+        probs = counts[counts > 0] / self.n
+        return float((probs * np.log(probs)).sum())
+
+    def results(self):
+        """returns: {"length": n, "alpha": a, "tests": {name: {...p_value, passed} or {"skipped": reason}}}"""
+        n, alpha, opts = self.n, self.alpha, self.options
+        tests = {}
+        if n < 2:
+            return {"length": n, "alpha": alpha, "tests": tests}
+
+        s_obs = abs(2 * self.ones - n) / math.sqrt(n)
+        tests["monobit"] = _result(math.erfc(s_obs / math.sqrt(2)), alpha, statistic=s_obs, ones=self.ones)
+
+        pi = self.ones / n
+        if abs(pi - 0.5) >= 2 / math.sqrt(n):
+            tests["runs"] = {"skipped": "monobit prerequisite not met"}
+        else:
+            runs = self.transitions + 1
+            p = math.erfc(abs(runs - 2 * n * pi * (1 - pi)) / (2 * math.sqrt(2 * n) * pi * (1 - pi)))
+            tests["runs"] = _result(p, alpha, runs=runs)
+
+        if self.blocks:
+            chi = 4 * opts["block_size"] * self.block_chi
+            tests["block_frequency"] = _result(igamc(self.blocks / 2, chi / 2), alpha,
+                                               statistic=chi, blocks=self.blocks)
+        else:
+            tests["block_frequency"] = {"skipped": "fewer than block_size bits"}
+
+        m = opts["serial_m"]
+        if n >= 1 << (m + 2):
+            psi = [self._psi2(m), self._psi2(m - 1), self._psi2(m - 2)]
+            d1, d2 = psi[0] - psi[1], psi[0] - 2 * psi[1] + psi[2]
+            tests["serial"] = {
+                "m": m,
+                "p_value": [igamc(2 ** (m - 2), d1 / 2), igamc(2 ** (m - 3), d2 / 2)],
+            }
+            tests["serial"]["passed"] = min(tests["serial"]["p_value"]) >= alpha
+        else:
+            tests["serial"] = {"skipped": "sequence too short for m=%d" % m}
+
+        m = opts["apen_m"]
+        if n >= 1 << (m + 5):
+            apen = self._phi(m) - self._phi(m + 1)
+            chi = 2 * n * (math.log(2) - apen)
+            tests["approximate_entropy"] = _result(igamc(2 ** (m - 1), chi / 2), alpha, m=m, apen=apen)
+        else:
+            tests["approximate_entropy"] = {"skipped": "sequence too short for m=%d" % m}
+
+        auto = {}
+        for d, differ in self.differ.items():
+            if n - d < 1:
+                continue
+            x = 2 * (differ - (n - d) / 2) / math.sqrt(n - d)
+            auto[str(d)] = _result(math.erfc(abs(x) / math.sqrt(2)), alpha, statistic=x)
+        tests["autocorrelation"] = auto
+
+        blocks = sum(self.lc_counts)
+        if blocks:
+            chi = sum((v - blocks * p) ** 2 / (blocks * p) for v, p in zip(self.lc_counts, _LC_PI))
+            tests["linear_complexity"] = _result(igamc(3, chi / 2), alpha, statistic=chi, blocks=blocks,
+                                                 counts=list(self.lc_counts))
+        else:
+            tests["linear_complexity"] = {"skipped": "fewer than lc_block_size bits"}
+        return {"length": n, "alpha": alpha, "tests": tests}
+
+
+def _pattern_counts(bits, k, first_end):
+    """counts of the k-bit windows of `bits` ending at index first_end .. len-1"""
+    count = len(bits) - first_end
+    if count <= 0:
+        return np.zeros(1 << k, dtype=np.int64)
+    start = first_end - (k - 1)
+    values = np.zeros(count, dtype=np.int64)
+    for i in range(k):
+        values = (values << 1) | bits[start + i:start + i + count]
+    return np.bincount(values, minlength=1 << k)
+
+def analyse_chunks(chunks, options=None, alpha=DEFAULT_ALPHA):
+    """Run the battery over an iterable of bit chunks; returns RandomnessBattery.results()."""
+    battery = RandomnessBattery(options, alpha)
+    for chunk in chunks:
+        battery.update(chunk)
+    return battery.results()
@@ -0,0 +1,216 @@
+# reference.py - list-based LFSR and FSM rules
+#
+# The list API the Flask app and the RunOnMachine scripts were written
+# against: a register is a list of bits (state[0] receives the feedback,
+# state[-1] is the output cell) and an FSM combines the output lists of its
+# registers. The faster engines (lfsr_engine, fsm_engine, streaming) must
+# reproduce these rules bit for bit; conformance.py pins them by name.
+#
+# FSM rules in use:
+#   alternating_step       3 LFSRs, R1 clocks R2 (a = 1) or R3 (a = 0),
+#                          output b ^ c  (/run_fsm, FSM3LSFROnMachine.py)
+#   forward_backward       2 LFSRs, R1 moves the R2 pointer forward (a = 1)
+#                          or back (a = 0), output bit ^ a  (/run_fsm_2lfsr)
+#   gated                  2 LFSRs clocked together, the R2 bit is emitted
+#                          only when a = 1  (FSM2LSFROnMachine.py)
+
+from math import ceil, gcd
+
+from .lfsr_engine import pack_state, unpack_state, tap_mask, lfsr_outputs, lfsr_cycle, lfsr_period, StateTable
+from .gf2poly import jump_state, lfsr_exact_period
+
+# safety cap of the RunOnMachine scripts, see script_lfsr_sequence
+SCRIPT_MAX_STEPS = 1 << 20
+
+
+# ---------- LFSR ----------
+
+def xor_bits_from_indices(state, indices):
+    v = 0
+    for i in indices:
+        v ^= state[i]
+    return v
+
+def shift_register(state, taps):
+    """
+    state: list of bits (0/1)
+    taps: list of indices used for feedback xor (0-based)
+    returns: new_state, output_bit
+    """
+    out = state[-1]
+    feedback = xor_bits_from_indices(state, taps)
+    new_state = [feedback] + state[:-1]
+    return new_state, out
+
+def generate_lfsr_sequence(init_state, taps, max_steps=None, period_only=False):
+    """
+    returns: outputs (list), period (int), states (sequence of states)
+    Clocks until the first repeated state, or max_steps states with
+    period None. states is a StateTable: rows are unpacked on access.
+    period_only: skip outputs/states (returned empty) and find the period in
+                 constant memory, see find_lfsr_period
+    """
+    if period_only:
+        period, _ = find_lfsr_period(init_state, taps, max_steps=max_steps)
+        return [], period, []
+
+    outputs, period, _, states = lfsr_state_table(init_state, taps, max_steps=max_steps)
+    return list(outputs), period, states
+
+def lfsr_state_table(init_state, taps, max_steps=None):
+    """
+    generate_lfsr_sequence without unpacking anything.
+    returns: outputs (bytearray), period (int or None),
+             tail_length (int or None), states (StateTable)
+    No visited state is stored: nonsingular registers find their period in
+    the output stream (lfsr_engine.lfsr_cycle), singular ones from the
+    connection polynomial (gf2poly.lfsr_exact_period), and the state table
+    is the output stream read length bits at a time.
+    """
+    length = len(init_state)
+    if not length:
+        raise ValueError("empty register")
+    state, mask = pack_state(init_state), tap_mask(taps, length)
+    if mask >> (length - 1) & 1:
+        period, stream = lfsr_cycle(state, mask, length, max_steps=max_steps)
+        tail_length = 0 if period is not None else None
+    else:
+        period, tail_length = lfsr_exact_period(init_state, taps)
+        if max_steps is not None and tail_length + period >= max_steps:
+            period, tail_length = None, None
+        stream = None
+
+    # stop at max_steps without a period (at least the initial state)
+    total = tail_length + period if period is not None else max(ceil(max_steps), 1)
+    if stream is None or len(stream) < total + length - 1:
+        stream = lfsr_outputs(state, mask, length, total + length - 1)
+    return stream[:total], period, tail_length, StateTable(stream, length, total)
+
+def script_lfsr_sequence(init_state, taps, max_steps=SCRIPT_MAX_STEPS):
+    """
+    generate_lfsr_sequence as the RunOnMachine scripts had it:
+    states are tuples, and a run cut at max_steps reports
+    period = len(outputs) instead of None.
+    """
+    outputs, period, states = generate_lfsr_sequence(init_state, taps, max_steps=max_steps)
+    if period is None:
+        period = len(outputs)
+    return outputs, period, [tuple(s) for s in states]
+
+def find_lfsr_period(init_state, taps, max_steps=None):
+    """
+    returns: period (int or None), tail_length (int or None)
+    O(1) memory (Brent's cycle detection); tail_length > 0 only when the
+    feedback is singular and the start state is not on a cycle.
+    """
+    length = len(init_state)
+    return lfsr_period(pack_state(init_state), tap_mask(taps, length),
+                       length, max_steps=max_steps)
+
+def lfsr_state_at(init_state, taps, k):
+    """
+    returns: the register state (list of bits) after k clocks, without
+    clocking the k - 1 states in between (see gf2poly.jump_state)
+    """
+    length = len(init_state)
+    return unpack_state(jump_state(pack_state(init_state), taps, length, k), length)
+
+
+# ---------- FSM rules ----------
+
+def alternating_step_fsm(r1, r2, r3, b_minus1=0, c_minus1=0, steps=None):
+    """
+    r1, r2, r3: output lists of the three registers
+    steps: defaults to len(r1) * len(r2) * len(r3)
+    returns: fsm (list), and the r1 / r2 / r3 indices after the last step
+    """
+    if steps is None:
+        steps = len(r1) * len(r2) * len(r3)
+    b_prev = int(b_minus1) & 1
+    c_prev = int(c_minus1) & 1
+
+    idx1 = 0
+    idx2 = -1
+    idx3 = -1
+    fsm = []
+
+    for _ in range(int(steps)):
+        a = r1[idx1]
+
+        if a == 1:
+            idx2 += 1
+            if idx2 >= len(r2):
+                idx2 = 0
+            b_prev = r2[idx2]
+        else:
+            idx3 += 1
+            if idx3 >= len(r3):
+                idx3 = 0
+            c_prev = r3[idx3]
+
+        fsm.append(b_prev ^ c_prev)
+        idx1 += 1
+        if idx1 >= len(r1):
+            idx1 = 0
+
+    return fsm, idx1, idx2, idx3
+
+def generate_fsm_2lfsr(r1_outputs, r2_outputs, steps=None):
+    """
+    r1_outputs: list of bits (output stream from R1)
+    r2_outputs: list of bits (output stream from R2)
+    steps: optional int, number of steps to run. If None, will run for length lcm(len(r1), len(r2)).
+    Returns: fsm_output list
+    r1 is the control: when the r1 bit is 1 the r2 pointer is read then moved
+    forward, else it is moved backward then read; the output is bit ^ a.
+    """
+    if not r1_outputs or not r2_outputs:
+        return []
+
+    len1 = len(r1_outputs)
+    len2 = len(r2_outputs)
+
+    if steps is None:
+        # run for full period
+        steps = len1 * len2 // gcd(len1, len2)
+
+    idx1 = 0
+    idx2 = 0
+    fsm = []
+    for _ in range(steps):
+        a = r1_outputs[idx1 % len1]
+        if a == 1:
+            # advance r2 pointer forward
+            bit = r2_outputs[idx2 % len2]
+            idx2 += 1
+        else:
+            # advance r2 pointer backward
+            idx2 -= 1
+            bit = r2_outputs[idx2 % len2]
+        fsm_bit = bit ^ (a & 1)
+        fsm.append(fsm_bit)
+        idx1 += 1
+
+    return fsm
+
+def generate_fsm_2lfsr_gated(r1_seq, r2_seq, steps=None):
+    """
+    FSM rule of FSM2LSFROnMachine.py:
+      - Both LFSRs are clocked in parallel.
+      - If R1 output bit = 1 -> FSM outputs R2 bit.
+      - If R1 output bit = 0 -> FSM outputs nothing (bit is ignored).
+    steps: clocks, defaults to len(r1_seq) * len(r2_seq)
+    """
+    if steps is None:
+        steps = len(r1_seq) * len(r2_seq)
+
+    len1 = len(r1_seq)
+    len2 = len(r2_seq)
+    return [r2_seq[j % len2] for j in range(int(steps)) if r1_seq[j % len1] == 1]
+
+
+FSM_RULES = {
+    "alternating_step": alternating_step_fsm,
+    "forward_backward": generate_fsm_2lfsr,
+    "gated": generate_fsm_2lfsr_gated,
+}
@@ -0,0 +1,120 @@
+# streaming.py - chunked keystream generation for the streaming endpoints
+#
+# Each generator yields the stream in fixed-size chunks (bytearray, one 0/1
+# byte per bit) and keeps only the register / FSM pointers between chunks,
+# so arbitrarily long streams are produced in constant memory. The encoders
+# turn those chunks into the bytes sent over a chunked HTTP response.
+
+import json
+from math import gcd
+
+import numpy as np
+
+from .lfsr_engine import pack_state, tap_mask, lfsr_clock
+
+DEFAULT_CHUNK_BITS = 1 << 16
+ENCODINGS = {
+    "binary": "application/octet-stream",
+    "hex": "text/plain",
+    "ndjson": "application/x-ndjson",
+}
+
+
+# ---------- bit generators ----------
+
+def lfsr_chunks(init_state, taps, total, chunk_bits=DEFAULT_CHUNK_BITS):
+    """Output bits of generate_lfsr_sequence's register, `total` of them."""
+    length = len(init_state)
+    state = pack_state(init_state)
+    mask = tap_mask(taps, length)
+    done = 0
+    while done < total:
+        count = min(chunk_bits, total - done)
+        chunk, state = lfsr_clock(state, mask, length, count)
+        done += count
+        yield chunk
+
+def fsm_chunks(r1, r2, r3, b_minus1=0, c_minus1=0, steps=None, chunk_bits=DEFAULT_CHUNK_BITS):
+    """Same stream as the 3-LFSR alternating-step FSM of /run_fsm."""
+    if steps is None:
+        steps = len(r1) * len(r2) * len(r3) if (r1 and r2 and r3) else max(len(r1), len(r2), len(r3))
+    steps = int(steps)
+    len1, len2, len3 = len(r1), len(r2), len(r3)
+    b_prev = b_minus1 & 1
+    c_prev = c_minus1 & 1
+    idx1, idx2, idx3 = 0, -1, -1
+
+    done = 0
+    while done < steps:
+        count = min(chunk_bits, steps - done)
+        chunk = bytearray(count)
+        for i in range(count):
+            if r1[idx1] == 1:
+                idx2 += 1
+                if idx2 >= len2:
+                    idx2 = 0
+                b_prev = r2[idx2]
+            else:
+                idx3 += 1
+                if idx3 >= len3:
+                    idx3 = 0
+                c_prev = r3[idx3]
+            chunk[i] = b_prev ^ c_prev
+            idx1 += 1
+            if idx1 >= len1:
+                idx1 = 0
+        done += count
+        yield chunk
+
+def fsm_2lfsr_chunks(r1, r2, steps=None, chunk_bits=DEFAULT_CHUNK_BITS):
+    """Same stream as generate_fsm_2lfsr (/run_fsm_2lfsr)."""
+    if not r1 or not r2:
+        return
+    len1, len2 = len(r1), len(r2)
+    if steps is None:
+        steps = len1 * len2 // gcd(len1, len2)
+
+    idx1 = 0
+    idx2 = 0
+    done = 0
+    while done < steps:
+        count = min(chunk_bits, steps - done)
+        chunk = bytearray(count)
+        for i in range(count):
+            a = r1[idx1 % len1]
+            if a == 1:
+                bit = r2[idx2 % len2]
+                idx2 += 1
+            else:
+                idx2 -= 1
+                bit = r2[idx2 % len2]
+            chunk[i] = bit ^ (a & 1)
+            idx1 += 1
+        done += count
+        yield chunk
+
+
+# ---------- wire encodings ----------
+
+def encode_chunks(chunks, encoding="binary"):
+    """
+    chunks: iterable of bit chunks from the generators above
+    encoding: "binary" (packed bytes, most significant bit first, last byte
+              zero-padded), "hex" (the same bytes as hex text) or "ndjson"
+              (one {"offset": o, "bits": [...]} object per line)
+    """
+    if encoding not in ENCODINGS:
+        raise ValueError("unknown encoding %r (expected one of %s)" % (encoding, ", ".join(ENCODINGS)))
+    offset = 0
+    for chunk in chunks:
+        if encoding == "ndjson":
+            yield json.dumps({"offset": offset, "bits": list(chunk)}).encode() + b"\n"
+        else:
+            packed = np.packbits(np.frombuffer(chunk, dtype=np.uint8)).tobytes()
+            yield packed if encoding == "binary" else packed.hex().encode()
+        offset += len(chunk)
+
+def chunk_size(requested):
+    """chunk length in bits, rounded up to whole bytes so packed chunks concatenate"""
+    bits = int(requested or DEFAULT_CHUNK_BITS)
+    return max(8, (bits + 7) // 8 * 8)
@@ -0,0 +1,99 @@
+# textcodec.py - vectorised 5-bit letter codec
+#
+# The alphabet of the word decipher (word_decipher.bits_to_text_simple):
+# each letter is 5 bits, most significant first, 0..25 -> A..Z and 26..31
+# -> '?', a short last group padded with zeros. Here a whole matrix of
+# candidates (one bit row per candidate) is decoded in one call: the rows
+# are packed, every 5 bytes (40 bits) are read as one integer and cut into
+# 8 symbols with shifts, and the symbols go through a 32-entry table.
+# encode_texts is the inverse, for building test ciphertexts and cribs.
+
+import numpy as np
+
+SYMBOL_BITS = 5
+# character of each 5-bit value, as text and as ASCII bytes
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ??????"
+LETTERS = np.frombuffer(ALPHABET.encode("ascii"), dtype=np.uint8)
+# ASCII byte -> 5-bit value, -1 for bytes that are not letters
+_CODES = np.full(256, -1, dtype=np.int16)
+_CODES[np.frombuffer(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ", dtype=np.uint8)] = np.arange(26)
+_CODES[np.frombuffer(b"abcdefghijklmnopqrstuvwxyz", dtype=np.uint8)] = np.arange(26)
+_SHIFTS = np.arange(35, -1, -SYMBOL_BITS, dtype=np.uint64)      # 8 symbols of a 40-bit group
+_BIT_SHIFTS = np.arange(SYMBOL_BITS - 1, -1, -1, dtype=np.uint8)
+
+
+# ---------- decoding ----------
+
+def symbols(bits, length=None):
+    """
+    bits: (N, L) matrix of 0/1 bits, or with `length` given, the rows
+          packed MSB-first (np.packbits order), (N, ceil(length / 8)) bytes
+    returns: (N, ceil(L / 5)) uint8 matrix of 5-bit values
+    """
+    bits = np.asarray(bits, dtype=np.uint8)
+    if bits.ndim != 2:
+        raise ValueError("expected one row of bits per candidate")
+    if length is None:
+        length = bits.shape[1]
+        packed = np.packbits(bits, axis=1)
+    else:
+        nbytes = -(-length // 8)
+        if bits.shape[1] < nbytes:
+            raise ValueError("packed rows hold fewer than %d bits" % length)
+        packed = bits[:, :nbytes]
+        if length % 8:
+            # bits past `length` would leak into the padded last symbol
+            packed = packed.copy()
+            packed[:, -1] &= (0xFF << (8 - length % 8)) & 0xFF
+    rows = packed.shape[0]
+    count = -(-length // SYMBOL_BITS)
+    groups = -(-packed.shape[1] // SYMBOL_BITS)
+
+    data = np.zeros((rows, groups * SYMBOL_BITS), dtype=np.uint64)
+    data[:, :packed.shape[1]] = packed
+    data = data.reshape(rows, groups, SYMBOL_BITS)
+    value = data[:, :, 0]
+    for k in range(1, SYMBOL_BITS):
+        value = value << np.uint64(8) | data[:, :, k]
+    out = (value[:, :, None] >> _SHIFTS) & np.uint64(31)
+    return out.reshape(rows, 8 * groups)[:, :count].astype(np.uint8)
+
+def decode_letters(bits, length=None):
+    """returns: (N, ceil(L / 5)) matrix of ASCII letters, see symbols()"""
+    return np.take(LETTERS, symbols(bits, length))
+
+def decode_rows(bits, length=None):
+    """returns: list of N strings, bits_to_text_simple of each row"""
+    letters = decode_letters(bits, length)
+    rows, width = letters.shape
+    if not width:
+        return [""] * rows
+    text = letters.tobytes().decode("ascii")
+    return [text[i:i + width] for i in range(0, rows * width, width)]
+
+
+# ---------- encoding ----------
+
+def encode_texts(texts, packed=False):
+    """
+    texts: strings of letters (either case), all of the same length
+    packed: return the rows packed MSB-first instead of one byte per bit
+    returns: (N, 5 * len) matrix of 0/1 bits, or (N, ceil(5 * len / 8)) bytes
+    """
+    texts = list(texts)
+    width = len(texts[0]) if texts else 0
+    if any(len(t) != width for t in texts):
+        raise ValueError("texts must all have the same length")
+    joined = "".join(texts)
+    # one byte per character: anything outside ASCII becomes '?', not a letter
+    codes = _CODES[np.frombuffer(joined.encode("ascii", "replace"), dtype=np.uint8)]
+    bad = np.flatnonzero(codes < 0)
+    if len(bad):
+        raise ValueError("only letters A..Z can be encoded, got %r" % joined[bad[0]])
+    bits = (codes.astype(np.uint8).reshape(len(texts), width, 1) >> _BIT_SHIFTS) & 1
+    bits = bits.reshape(len(texts), SYMBOL_BITS * width)
+    return np.packbits(bits, axis=1) if packed else bits
+
+def encode_text(text, packed=False):
+    """returns: the bits of one text, see encode_texts"""
+    return encode_texts([text], packed)[0]
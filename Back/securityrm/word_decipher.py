@@ -0,0 +1,125 @@
+# word_decipher.py - helpers for message decryption (LFSR word decipher)
+# Originally inlined in app.py from RunOnMachine/LFSRwordDeCipher.py; kept in
+# its own module so worker processes can import it without the Flask app.
+
+from .dict_scorer import compile_dictionary
+from .pipeline import cycle, xor_stream
+
+def repeat_to_length_simple(seq, target_len):
+    # seq repeated to target_len bits, read word by word from one packed copy
+    return cycle(seq).take(target_len).tolist()
+
+def xor_simple(a, b):
+    # bitwise xor up to the shorter of a and b, 64 bits per operation
+    return xor_stream(a, b).tolist()
+
+# 5-bit group as a "0"/"1" string -> letter: 0..25 to A..Z, other values to '?'
+_LETTER_OF = {format(v, "05b"): chr(ord('A') + v) if v < 26 else '?' for v in range(32)}
+_TO_ASCII = bytes.maketrans(b"\x00\x01", b"01")
+
+def bits5_to_letter(bits5):
+    v = 0
+    for b in bits5:
+        v = v << 1 | b
+    # map 0..25 to A..Z, other values to '?'
+    return chr(ord('A') + v) if 0 <= v < 26 else '?'
+
+def letter_to_bits5(letter):
+    # inverse of bits5_to_letter for A..Z (5 bits, most significant first)
+    v = ord(letter) - ord('A')
+    if not 0 <= v < 26:
+        raise ValueError("only letters A..Z can be encoded, got %r" % letter)
+    return [(v >> (4 - i)) & 1 for i in range(5)]
+
+def text_to_bits_simple(text):
+    out = []
+    for ch in text.upper():
+        out.extend(letter_to_bits5(ch))
+    return out
+
+def bits_to_text_simple(bitstream):
+    # one "0"/"1" string for the whole stream, zero-padded to whole letters,
+    # then a table lookup per 5-character slice (textcodec.decode_rows does
+    # the same for a whole matrix of candidates with NumPy)
+    digits = bytes(bitstream).translate(_TO_ASCII).decode("ascii")
+    digits += "0" * (-len(digits) % 5)
+    return "".join([_LETTER_OF[digits[i:i + 5]] for i in range(0, len(digits), 5)])
+
+def script_bits_to_text(bitstream):
+    """
+    bits_to_text_simple as LFSRwordDeCipher.py had it: a short last group is
+    read as a smaller number (int("101", 2)) instead of being zero-padded.
+    """
+    text = bits_to_text_simple(bitstream)
+    short = len(bitstream) % 5
+    if short:
+        text = text[:-1] + bits5_to_letter(bitstream[-short:])
+    return text
+
+# default dictionary (kept small — same approach as original file)
+DEFAULT_DICTIONARY = [
+ # Articles
+    "LE","LA","LES","UN","UNE","DES","DU","DE","AU","AUX",
+
+    # Pronouns
+    "JE","TU","IL","ELLE","NOUS","VOUS","ILS","ELLES","ON","CE","CELA","CELUI",
+    "QUI","QUE","QUOI","DONT","OU",
+
+    # Common verbs (present/basic forms only)
+    "ETRE","AVOIR","FAIRE","DIRE","POUVOIR","ALLER","VOULOIR","VOIR","SAVOIR",
+    "DEVOIR","PRENDRE","PARLER","METTRE","DONNER","TROUVER","COMPRENDRE",
+    "VENIR","PASSER","POURSUIVRE","LIRE","ECRIRE","SORTIR",
+
+    # Everyday words
+    "BONJOUR","SALUT","MERCI","OUI","NON","EXCUSE","PARDON","BIEN","MAL",
+    "MAISON","FILLE","GARCON","HOMME","FEMME","AMIS","AMIE","TRAVAIL",
+    "TEMPS","JOUR","NUIT","MATIN","SOIR","HEURE","MINUTE",
+
+    # Prepositions
+    "SUR","SOUS","AVEC","SANS","DANS","ENTRE","PENDANT","APRES","AVANT","POUR",
+    "PAR","VERS","CHEZ","CONTRE","PRES","DEPUIS","SELON",
+
+    # Conjunctions
+    "ET","MAIS","OU","DONC","CAR","COMME","SI","LORSQUE","PARCE","QUE",
+
+    # Numbers
+    "UN","DEUX","TROIS","QUATRE","CINQ","SIX","SEPT","HUIT","NEUF","DIX",
+
+    # School / exercise context words
+    "FIN","EXERCICE","EXERCICES","QUESTION","REPONSE","DEVOIR","PROFESSEUR",
+    "ETUDIANT","COURS","LECON","SUJET",
+
+    # Tech / general nouns
+    "SYSTEME","CODE","MESSAGE","CLE","DONNEE","BIT","SEQUENCE","LOGIQUE",
+    "ALGORITHME","ANALYSE","RESULTAT","ERREUR","VALEUR",
+
+    # Useful long words (great for scoring)
+    "IMPORTANT","DIFFICILE","INTERESSANT","POSSIBLE","COMPLETE",
+    "EVIDEMMENT","ACTUELLEMENT","RAPIDEMENT",
+
+    # Additional common vocab
+    "ANNEE","MOIS","SEMAINE","MAIN","TETE","OEIL","PAYS","VILLE","MONDE",
+    "VRAI","FAUX","PETIT","GRAND","NOUVEAU","VIEUX","BEAU","BON","MEILLEUR",
+    "TOUJOURS","JAMAIS","PEUT","PEUTETRE","DEJA","MAINTENANT","ICI","LA",
+    "LAHAUT","LAISSER","DEMANDER","REPONDRE"
+]
+
+def score_text_with_dictionary(text, dict_words):
+    # sum of len(w) for every w in dict_words found in the text; one
+    # Aho-Corasick pass over the text (automaton cached per dictionary)
+    return compile_dictionary(dict_words).score(text.upper())
+
+# default ciphertext of the exercise (copied from the original LFSRwordDeCipher)
+DEFAULT_CIPHER_BITS = [
+    1,1,0,1,1,0,1,1,0,0,1,0,1,1,1,1,1,1,0,1,0,0,0,0,0,1,0,0,0,1,1,1,0,1,0,1,0,0,1,1,
+    1,1,1,1,0,0,1,1,1,1,0,0,1,1,0,1,0,0,1,0,1,1,1,0,0,0,0,0,0,0
+]
+
+# default keys of the exercise (the 5 keys of the original LFSRwordDeCipher)
+DEFAULT_KEYS = [
+    [1,0,1,0,1,1,1,1,0,0,0,1,0,0,1],
+    [0,1,0,1,1,1,1,0,0,0,1,0,0,1,1],
+    [1,0,1,1,1,1,0,0,0,1,0,0,1,1,0],
+    [0,1,1,1,1,0,0,0,1,0,0,1,1,0,1],
+    [1,1,1,1,0,0,0,1,0,0,1,1,0,1,0]
+]
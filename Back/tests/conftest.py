@@ -0,0 +1,5 @@
+# tests import the app-side modules and the securityrm package from Back/
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
@@ -0,0 +1,81 @@
+# Batch scoring (dict_scorer.score_many, batch_decipher, /ms_decryption_batch)
+# against the one-text / one-key paths it replaces.
+
+import numpy as np
+import pytest
+
+import app as backend
+from securityrm.batch_decipher import decipher_batch, expand_keys
+from securityrm.dict_scorer import compile_dictionary
+from securityrm.textcodec import ALPHABET, symbols
+from securityrm.word_decipher import (
+    DEFAULT_CIPHER_BITS, DEFAULT_DICTIONARY, DEFAULT_KEYS, bits_to_text_simple, score_text_with_dictionary
+)
+
+
+def _random_bits(rng, count):
+    return rng.integers(0, 2, count, dtype=np.uint8).tolist()
+
+def test_score_many_matches_score():
+    rng = np.random.default_rng(0)
+    automaton = compile_dictionary(DEFAULT_DICTIONARY)
+    texts = ["FINDELEXERCICE", "LELALESUNE", "ZZZZ", "", "DEDEDEDE"]
+    codes = np.array([[ALPHABET.index(c) for c in t.ljust(14, "?")] for t in texts])
+    expected = [automaton.score(t.ljust(14, "?")) for t in texts]
+    assert automaton.score_many(codes, ALPHABET).tolist() == expected
+    rows = rng.integers(0, 2, (200, 70), dtype=np.uint8)
+    texts = [bits_to_text_simple(r.tolist()) for r in rows]
+    assert automaton.score_many(symbols(rows), ALPHABET).tolist() == [automaton.score(t) for t in texts]
+
+def test_expand_keys():
+    keys = [[1, 0, 1], [0, 1, 1, 1, 0]]
+    rows = np.unpackbits(expand_keys(keys, 11), axis=1)[:, :11]
+    assert rows.tolist() == [[1, 0, 1] * 3 + [1, 0], [0, 1, 1, 1, 0] * 2 + [0]]
+    with pytest.raises(ValueError):
+        expand_keys([[]], 4)
+
+def _per_pair(ciphertexts, keys, dictionary):
+    out = []
+    for c in ciphertexts:
+        row = []
+        for key in keys:
+            text = bits_to_text_simple([b ^ key[i % len(key)] for i, b in enumerate(c)])
+            row.append((score_text_with_dictionary(text, dictionary), text))
+        out.append(row)
+    return out
+
+def test_decipher_batch_matches_per_pair():
+    rng = np.random.default_rng(1)
+    ciphertexts = [DEFAULT_CIPHER_BITS] + [_random_bits(rng, n) for n in (0, 3, 33, 70, 70, 101)]
+    keys = list(DEFAULT_KEYS) + [_random_bits(rng, n) for n in (1, 7, 15)]
+    pairs = _per_pair(ciphertexts, keys, DEFAULT_DICTIONARY)
+    batch = decipher_batch(ciphertexts, keys, top_k=3, batch_rows=16)
+    assert batch["scores"].tolist() == [[s for s, _ in row] for row in pairs]
+    for row, top in zip(pairs, batch["top"]):
+        order = sorted(range(len(keys)), key=lambda k: -row[k][0])[:3]
+        assert top == [(row[k][0], k, row[k][1]) for k in order]
+
+def test_decipher_batch_without_keys():
+    batch = decipher_batch([DEFAULT_CIPHER_BITS], [])
+    assert batch["scores"].shape == (1, 0) and batch["top"] == [[]]
+
+def test_endpoint_matches_ms_decryption():
+    client = backend.app.test_client()
+    rng = np.random.default_rng(2)
+    ciphertexts = [DEFAULT_CIPHER_BITS, _random_bits(rng, 68), _random_bits(rng, 45)]
+    keys = list(DEFAULT_KEYS)
+    batch = client.post("/ms_decryption_batch", json={"ciphertexts": ciphertexts, "keys": keys,
+                                                      "top_k": len(keys), "include_scores": True}).get_json()
+    for c, result, scores in zip(ciphertexts, batch["results"], batch["scores"]):
+        single = client.post("/ms_decryption", json={"cipher_bits": c, "keys": keys}).get_json()
+        assert scores == [entry["score"] for entry in single["per_key"]]
+        by_index = {entry["key_index"]: entry for entry in single["per_key"]}
+        for entry in result["top"]:
+            expected = by_index[entry["key_index"]]
+            assert entry == {k: expected[k] for k in ("key_index", "key", "decoded_text", "score")}
+        best = result["top"][0]
+        assert (best["key_index"], best["score"]) == (single["best"]["key_index"], single["best"]["score"])
+
+def test_endpoint_rejects_empty_keys():
+    client = backend.app.test_client()
+    assert client.post("/ms_decryption_batch", json={"keys": [[1, 0], []]}).status_code == 400
@@ -0,0 +1,102 @@
+# Wire formats of bitwire.py: packing, base64 fields, octet-stream frames,
+# and the 400 the app answers for malformed input.
+
+import base64
+import random
+
+import pytest
+
+import app as backend
+from securityrm.bitwire import (
+    MAGIC, pack_bits, unpack_bits, encode_packed, decode_packed, decode_fields,
+    write_frames, read_frames, OCTET_STREAM
+)
+
+
+def _bits(count, seed=0):
+    rng = random.Random(seed)
+    return [rng.randint(0, 1) for _ in range(count)]
+
+@pytest.mark.parametrize("bit_order", ["msb", "lsb"])
+@pytest.mark.parametrize("count", [0, 1, 7, 8, 9, 63, 100])
+def test_pack_round_trip(bit_order, count):
+    bits = _bits(count)
+    data = pack_bits(bits, bit_order)
+    assert len(data) == (count + 7) // 8
+    assert list(unpack_bits(data, count, bit_order)) == bits
+
+def test_pack_orders():
+    assert pack_bits([1, 0, 0, 0, 0, 0, 1, 1, 1], "msb") == b"\x83\x80"
+    assert pack_bits([1, 0, 0, 0, 0, 0, 1, 1, 1], "lsb") == b"\xc1\x01"
+
+def test_base64_round_trip():
+    bits = _bits(29)
+    assert list(decode_packed(encode_packed(bits))) == bits
+    field = {"base64": base64.b64encode(pack_bits(bits, "lsb")).decode("ascii"), "length": 29,
+             "bit_order": "lsb"}
+    assert decode_fields({"a": field, "b": [field, [1, 0]], "c": 3}) == \
+        {"a": bytearray(bits), "b": [bytearray(bits), [1, 0]], "c": 3}
+
+@pytest.mark.parametrize("field", [
+    {"base64": "!!"},
+    {"base64": "AA=", "length": 8},
+    {"base64": "AA==", "length": None},
+    {"base64": "AA==", "length": "8"},
+    {"base64": "AA==", "length": -1},
+    {"base64": "AA==", "length": 9},
+    {"base64": "AA==", "bit_order": "middle"},
+])
+def test_bad_base64_fields(field):
+    with pytest.raises(ValueError):
+        decode_packed(field)
+
+def test_frames_round_trip():
+    sequences = [_bits(13, 1), [], _bits(64, 2), _bits(3, 3)]
+    for bit_order in ("msb", "lsb"):
+        body = write_frames(sequences, bit_order)
+        assert body.startswith(MAGIC)
+        assert [list(s) for s in read_frames(body)] == sequences
+
+def test_bad_magic():
+    with pytest.raises(ValueError):
+        read_frames(b"BIT2" + write_frames([[1, 0, 1]])[len(MAGIC):])
+
+@pytest.mark.parametrize("cut", [1, 5, 9])
+def test_truncated_frames(cut):
+    body = write_frames([_bits(20)])
+    with pytest.raises(ValueError):
+        read_frames(body[:-cut])
+
+
+# ---------- through the app ----------
+
+@pytest.fixture
+def client():
+    return backend.app.test_client()
+
+def test_invalid_base64_is_a_400(client):
+    resp = client.post("/generate_lfsr", json={"init_state": {"base64": "!!"}, "taps": [0, 3], "cache": False})
+    assert resp.status_code == 400
+    assert "base64" in resp.get_json()["error"]
+
+def test_null_length_is_a_400(client):
+    resp = client.post("/generate_lfsr", json={"init_state": {"base64": "kA==", "length": None}, "taps": [0, 3],
+                                              "cache": False})
+    assert resp.status_code == 400
+
+def test_bad_octet_stream_is_a_400(client):
+    resp = client.post("/generate_lfsr?taps=[0,3]", data=b"nope", content_type=OCTET_STREAM)
+    assert resp.status_code == 400
+
+def test_wire_formats_agree(client):
+    state = [1, 0, 0, 1]
+    plain = client.post("/generate_lfsr", json={"init_state": state, "taps": [0, 3], "cache": False}).get_json()
+    packed = client.post("/generate_lfsr", json={"init_state": encode_packed(state), "taps": [0, 3],
+                                                 "bit_format": "base64", "cache": False}).get_json()
+    assert list(decode_packed(packed["outputs"])) == plain["outputs"]
+    assert [list(decode_packed(s)) for s in packed["states"]] == plain["states"]
+    resp = client.post("/generate_lfsr?taps=[0,3]&cache=false", data=write_frames([state]),
+                       content_type=OCTET_STREAM, headers={"Accept": OCTET_STREAM})
+    frames = read_frames(resp.get_data())
+    assert list(frames[0]) == plain["outputs"]
+    assert [list(s) for s in frames[1:]] == plain["states"]
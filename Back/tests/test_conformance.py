@@ -0,0 +1,17 @@
+# Every pinned case of conformance.py, once per engine that implements its rule.
+
+import pytest
+
+from securityrm import conformance
+
+PAIRS = [("%s/%s" % (case["rule"], case["name"]), engine)
+         for case in conformance.CASES for engine in conformance.ENGINES[case["rule"]]]
+
+
+@pytest.fixture(scope="module")
+def report():
+    return {(entry["case"], entry["engine"]): entry["mismatches"] for entry in conformance.check()}
+
+@pytest.mark.parametrize("case, engine", PAIRS)
+def test_engine_conforms(report, case, engine):
+    assert report[(case, engine)] == {}
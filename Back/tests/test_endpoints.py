@@ -0,0 +1,89 @@
+# Flask endpoints against the engines they wrap, through the test client.
+
+import pytest
+
+import app as backend
+from securityrm.fsm_engine import AlternatingStepFSM
+from securityrm.lfsr_engine import pack_state, unpack_state, tap_mask, lfsr_clock, lfsr_states
+from securityrm.reference import generate_lfsr_sequence
+
+
+@pytest.fixture
+def client():
+    return backend.app.test_client()
+
+def _post(client, path, payload):
+    resp = client.post(path, json=dict(payload, cache=False))
+    assert resp.status_code == 200, resp.get_data(as_text=True)
+    return resp.get_json()
+
+
+# ---------- /generate_lfsr state window ----------
+
+REGISTERS = [
+    ([0, 1, 0, 0, 1], [0, 1, 2, 4]),
+    ([1, 0, 1, 1, 0, 1], [0, 2]),                 # singular: 2-step tail
+    ([1, 0, 0, 1, 0, 1, 1, 0, 0, 0, 1], [8, 10]),
+]
+
+@pytest.mark.parametrize("state, taps", REGISTERS)
+@pytest.mark.parametrize("window", [
+    {"offset": 0}, {"offset": 3, "limit": 5}, {"limit": 0}, {"offset": 1, "limit": 10 ** 6},
+    {"offset": 10 ** 6}, {"offset": -4, "limit": 2},
+])
+def test_state_window_is_a_slice_of_the_table(client, state, taps, window):
+    full = _post(client, "/generate_lfsr", {"init_state": state, "taps": taps})
+    got = _post(client, "/generate_lfsr", dict(window, init_state=state, taps=taps))
+    total = len(full["states"])
+    offset = min(max(window.get("offset", 0), 0), total)
+    limit = window.get("limit", total)
+    assert got["states_total"] == total and got["states_offset"] == offset
+    assert got["states"] == full["states"][offset:offset + limit]
+    for key in ("outputs", "period", "tail_length", "theoretical_period", "polynomial"):
+        assert got[key] == full[key]
+
+@pytest.mark.parametrize("max_steps", [1, 5, 9, 10, 100])
+def test_state_window_with_max_steps(client, max_steps):
+    state, taps = REGISTERS[1]                    # 9 states before the first repeat
+    full = _post(client, "/generate_lfsr", {"init_state": state, "taps": taps, "max_steps": max_steps})
+    got = _post(client, "/generate_lfsr", {"init_state": state, "taps": taps, "max_steps": max_steps,
+                                          "offset": 2, "limit": 3})
+    assert (got["period"], got["tail_length"], got["outputs"]) == \
+        (full["period"], full["tail_length"], full["outputs"])
+    assert got["states"] == full["states"][2:5]
+
+def test_without_states(client):
+    state, taps = REGISTERS[2]
+    full = _post(client, "/generate_lfsr", {"init_state": state, "taps": taps})
+    got = _post(client, "/generate_lfsr", {"init_state": state, "taps": taps, "include_states": False})
+    assert "states" not in got and got["outputs"] == full["outputs"] and got["states_total"] == len(full["states"])
+
+
+# ---------- /lfsr_seek ----------
+
+@pytest.mark.parametrize("k", [0, 1, 30, 31, 1000, 10 ** 12])
+def test_lfsr_seek(client, k):
+    state, taps = [0, 1, 0, 0, 1], [0, 1, 2, 4]
+    near = k % 31                                 # the register has period 31
+    mask = tap_mask(taps, 5)
+    expected_state = lfsr_states(pack_state(state), mask, 5, near + 1)[-1]
+    got = _post(client, "/lfsr_seek", {"init_state": state, "taps": taps, "k": k, "count": 12})
+    assert got["state"] == unpack_state(expected_state, 5)
+    assert got["outputs"] == list(lfsr_clock(expected_state, mask, 5, 12)[0])
+
+
+# ---------- /run_fsm ----------
+
+EXO4 = {"r1": generate_lfsr_sequence([0, 0, 1], [0, 2])[0],
+        "r2": generate_lfsr_sequence([1, 0, 1, 1], [0, 1])[0],
+        "r3": generate_lfsr_sequence([0, 1, 0, 0, 1], [0, 1, 2, 4])[0]}
+
+def test_run_fsm_stats_match_the_baseline_shape(client):
+    stats = _post(client, "/run_fsm", dict(EXO4, steps=500))["stats"]
+    assert stats["real_period"] == 500
+    assert "tail_length" not in stats and "practical_period" not in stats
+
+def test_run_fsm_measure_period(client):
+    stats = _post(client, "/run_fsm", dict(EXO4, steps=500, measure_period=True))["stats"]
+    period, tail = AlternatingStepFSM(EXO4["r1"], EXO4["r2"], EXO4["r3"]).output_period()
+    assert (stats["real_period"], stats["tail_length"]) == (period, tail)
@@ -0,0 +1,75 @@
+# The vectorised FSMs of fsm_engine.py against the list loops of
+# reference.py: random registers, singular and tapless feedback, periods.
+
+import random
+
+import numpy as np
+import pytest
+
+from securityrm.fsm_engine import AlternatingStepFSM, fsm_2lfsr_bits
+from securityrm.reference import generate_lfsr_sequence, alternating_step_fsm, generate_fsm_2lfsr
+
+
+def _register(rng, length, kind):
+    state = [rng.randint(0, 1) for _ in range(length)]
+    if kind == "tapless":
+        taps = []
+    elif kind == "singular":
+        # no tap on the last cell: the register has a tail before its cycle
+        taps = sorted(rng.sample(range(length - 1), rng.randint(1, length - 1))) if length > 1 else []
+    else:
+        taps = sorted(set([length - 1] + rng.sample(range(length), rng.randint(0, length - 1))))
+    return generate_lfsr_sequence(state, taps)[0]
+
+def _registers(seed, count, max_length=9):
+    rng = random.Random(seed)
+    kinds = ["random"] * 3 + ["singular", "tapless"]
+    return [_register(rng, rng.randint(1, max_length), rng.choice(kinds)) for _ in range(count)], rng
+
+def _measured_period(bits, start):
+    """smallest p with bits[i] == bits[i + p] for every i >= start in the sample"""
+    bits = np.asarray(bits, dtype=np.uint8)
+    for p in range(1, len(bits) - start):
+        if np.array_equal(bits[start:len(bits) - p], bits[start + p:]):
+            return p
+    return None
+
+@pytest.mark.parametrize("seed", range(40))
+def test_alternating_step_matches_reference(seed):
+    (r1, r2, r3), rng = _registers(seed, 3)
+    b_minus1, c_minus1 = rng.randint(0, 1), rng.randint(0, 1)
+    steps = rng.choice([None, 1, rng.randint(1, 5000)])
+    expected, idx1, idx2, idx3 = alternating_step_fsm(r1, r2, r3, b_minus1, c_minus1, steps)
+    steps = len(expected)
+
+    fsm = AlternatingStepFSM(r1, r2, r3, b_minus1, c_minus1)
+    assert fsm.bits(0, steps).tolist() == expected
+    end = fsm.state_after(steps)
+    assert (end["r1_index"], end["r2_index"], end["r3_index"]) == (idx1, idx2, idx3)
+    for k in rng.sample(range(steps), min(steps, 20)):
+        assert fsm.bit(k) == expected[k]
+        lo = rng.randint(0, k)
+        assert fsm.bits(lo, k + 1).tolist() == expected[lo:k + 1]
+
+@pytest.mark.parametrize("seed", range(20))
+def test_alternating_step_period(seed):
+    (r1, r2, r3), rng = _registers(100 + seed, 3, max_length=4)
+    fsm = AlternatingStepFSM(r1, r2, r3, rng.randint(0, 1), rng.randint(0, 1))
+    period, tail = fsm.output_period()
+    sample = 2 * fsm.state_period() + fsm.warmup() + 2 * len(r1)
+    bits, _, _, _ = alternating_step_fsm(r1, r2, r3, fsm.b_minus1, fsm.c_minus1, sample)
+
+    assert period == _measured_period(bits, fsm.warmup())
+    assert bits[tail:sample - period] == bits[tail + period:]
+    assert tail == 0 or bits[tail - 1] != bits[tail - 1 + period]
+
+@pytest.mark.parametrize("seed", range(40))
+def test_fsm_2lfsr_matches_reference(seed):
+    (r1, r2), rng = _registers(200 + seed, 2, max_length=12)
+    steps = rng.choice([None, 0, 1, rng.randint(1, 20000)])
+    assert fsm_2lfsr_bits(r1, r2, steps=steps).tolist() == generate_fsm_2lfsr(r1, r2, steps=steps)
+
+def test_empty_registers():
+    assert fsm_2lfsr_bits([], [1, 0]).tolist() == generate_fsm_2lfsr([], [1, 0]) == []
+    with pytest.raises(ValueError):
+        AlternatingStepFSM([], [1], [0])
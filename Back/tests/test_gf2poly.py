@@ -0,0 +1,129 @@
+# Berlekamp-Massey against a plain list implementation, and the recovered
+# register against the sequence it was recovered from; factoring, orders and
+# algebraic periods and jump-ahead against brute force and the clocked register.
+
+import random
+
+import pytest
+
+from securityrm.gf2poly import (
+    berlekamp_massey, lfsr_from_sequence, factor, is_irreducible, poly_mul, poly_mod, poly_order,
+    lfsr_exact_period, jump_state
+)
+from securityrm.lfsr_engine import pack_state, tap_mask, lfsr_clock, lfsr_states, run_lfsr
+
+
+def _berlekamp_massey_lists(bits):
+    n = len(bits)
+    c, b = [1] + [0] * n, [1] + [0] * n
+    L, m, profile = 0, -1, []
+    for i in range(n):
+        d = bits[i]
+        for j in range(1, L + 1):
+            d ^= c[j] & bits[i - j]
+        if d:
+            t = c[:]
+            for j in range(n + 1 - (i - m)):
+                c[j + i - m] ^= b[j]
+            if 2 * L <= i:
+                L, m, b = i + 1 - L, i, t
+        profile.append(L)
+    return L, sum(v << j for j, v in enumerate(c)), profile
+
+def _reproduces(bits):
+    found = lfsr_from_sequence(bits)
+    L = found["linear_complexity"]
+    if L == 0:
+        return not any(bits)
+    out, _ = lfsr_clock(pack_state(found["init_state"]), tap_mask(found["taps"], L), L, len(bits))
+    return list(out) == list(bits)
+
+def _cases():
+    rng = random.Random(8)
+    # long low-complexity prefix, then a jump of the linear complexity
+    yield [1] * 150 + [0] * 3 + [1, 0, 1, 1] * 30
+    for _ in range(10):
+        yield [1] * 100 + [0] + [rng.randint(0, 1) for _ in range(rng.randint(1, 300))]
+    for _ in range(10):
+        yield [rng.randint(0, 1) for _ in range(rng.randint(1, 400))]
+    yield []
+    yield [0] * 50
+
+@pytest.mark.parametrize("bits", list(_cases()))
+def test_berlekamp_massey(bits):
+    assert berlekamp_massey(bits) == _berlekamp_massey_lists(bits)
+    assert _reproduces(bits)
+
+
+# ---------- factoring and orders ----------
+
+def _divides(f, g):
+    return poly_mod(g, f) == 0
+
+def _brute_irreducible(f):
+    n = f.bit_length() - 1
+    return n >= 1 and not any(_divides(g, f) for g in range(2, 1 << (n // 2 + 1)) if g.bit_length() > 1)
+
+def _brute_order(f):
+    """least e > 0 with x^e == 1 mod f, one multiplication by x at a time"""
+    e, r = 1, poly_mod(2, f)
+    while r != poly_mod(1, f):
+        e, r = e + 1, poly_mod(r << 1, f)
+    return e
+
+def test_factor_and_irreducible():
+    # every polynomial of degree 1..8
+    for f in range(2, 1 << 9):
+        product = 1
+        for p, e in factor(f):
+            assert _brute_irreducible(p), (f, p)
+            for _ in range(e):
+                product = poly_mul(product, p)
+        assert product == f
+        assert is_irreducible(f) == _brute_irreducible(f), f
+
+def test_poly_order():
+    # every polynomial of degree 0..9 with constant term 1
+    for f in range(1, 1 << 10, 2):
+        assert poly_order(f) == _brute_order(f), f
+
+def test_large_order():
+    # x^127 + x + 1 is primitive, its order is the Mersenne prime 2^127 - 1
+    assert poly_order((1 << 127) | 3) == (1 << 127) - 1
+
+
+# ---------- algebraic periods ----------
+
+def _registers():
+    rng = random.Random(4)
+    for length in range(1, 10):
+        for _ in range(12):
+            taps = rng.sample(range(length), rng.randint(0, length))
+            yield [rng.randint(0, 1) for _ in range(length)], taps
+
+@pytest.mark.parametrize("state, taps", list(_registers()))
+def test_exact_period_matches_run_lfsr(state, taps):
+    length = len(state)
+    _, period, states = run_lfsr(pack_state(state), tap_mask(taps, length), length)
+    assert lfsr_exact_period(state, taps) == (period, len(states) - period)
+
+
+# ---------- jump-ahead ----------
+
+@pytest.mark.parametrize("state, taps", list(_registers()))
+def test_jump_state_matches_single_clocks(state, taps):
+    length = len(state)
+    start = pack_state(state)
+    clocked = lfsr_states(start, tap_mask(taps, length), length, 80)
+    for k, expected in enumerate(clocked):
+        assert jump_state(start, taps, length, k) == expected
+
+def test_jump_state_far_ahead():
+    # 2^40 + 5 clocks of a primitive register are 5 clocks after 2^40 mod (2^17 - 1)
+    taps, length = [13, 16], 17
+    start = pack_state([1] + [0] * 16)
+    k = (1 << 40) + 5
+    near = k % ((1 << length) - 1)
+    assert jump_state(start, taps, length, k) == lfsr_states(start, tap_mask(taps, length), length, near + 1)[-1]
+    with pytest.raises(ValueError):
+        jump_state(start, taps, length, -1)
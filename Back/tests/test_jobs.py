@@ -0,0 +1,136 @@
+# The job queue of jobs.py: submit, poll, result, server-sent events,
+# cancellation of queued and running jobs, and the 409 for endpoints that
+# cannot be interrupted once running.
+
+import json
+import time
+from concurrent.futures import Future
+
+import pytest
+
+import app as backend
+from jobs import JobQueue, JobCancelled, JobNotCancellable
+
+EXO4 = {"r1": [1, 0, 0, 1, 0, 1, 1], "r2": [1, 1, 0], "r3": [1, 0, 0, 1, 0, 1, 1, 0, 0, 1, 1, 1, 1, 1, 0]}
+# a few seconds of the list-based FSM: long enough to be caught running
+SLOW_FSM = dict(EXO4, steps=2000000, engine="python", cache=False)
+# a seed search that reports progress (and would take far longer uncancelled)
+SLOW_SEARCH = {"length": 22, "taps": [0, 1], "workers": 1}
+
+
+@pytest.fixture(scope="module")
+def client():
+    yield backend.app.test_client()
+    backend.JOBS.shutdown()
+
+@pytest.fixture
+def queue():
+    q = JobQueue(backend.app, workers=1, interruptible=backend.INTERRUPTIBLE_ENDPOINTS)
+    yield q
+    q.shutdown()
+
+def _wait(get, job_id, statuses, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = get(job_id)
+        if job["status"] in statuses:
+            return job
+        time.sleep(0.02)
+    raise AssertionError("job %s never reached %s" % (job_id, statuses))
+
+def _status(client):
+    return lambda job_id: client.get("/jobs/" + job_id).get_json()
+
+
+# ---------- over HTTP ----------
+
+def test_submit_poll_result(client):
+    payload = dict(EXO4, steps=300, cache=False)
+    resp = client.post("/jobs", json={"endpoint": "/run_fsm", "payload": payload})
+    assert resp.status_code == 202
+    job = resp.get_json()
+    assert resp.headers["Location"] == "/jobs/" + job["job_id"]
+    assert _wait(_status(client), job["job_id"], ("done", "failed", "cancelled"))["status"] == "done"
+    result = client.get("/jobs/%s/result" % job["job_id"])
+    assert result.status_code == 200
+    assert result.get_json() == client.post("/run_fsm", json=payload).get_json()
+
+def test_unknown_endpoint_and_job(client):
+    assert client.post("/jobs", json={"endpoint": "/cache_stats"}).status_code == 400
+    assert client.get("/jobs/nope").status_code == 404
+    assert client.delete("/jobs/nope").status_code == 404
+
+def test_result_before_done_is_409(client):
+    job = client.post("/jobs", json={"endpoint": "/run_fsm", "payload": SLOW_FSM}).get_json()
+    assert client.get("/jobs/%s/result" % job["job_id"]).status_code == 409
+    _wait(_status(client), job["job_id"], ("done",))
+
+def test_events_stream_until_finished(client):
+    job = client.post("/jobs", json={"endpoint": "/run_fsm", "payload": dict(EXO4, steps=300)}).get_json()
+    resp = client.get("/jobs/%s/events" % job["job_id"])
+    assert resp.mimetype == "text/event-stream"
+    events = [block for block in resp.get_data(as_text=True).split("\n\n") if block]
+    last = events[-1].split("\n")
+    assert last[0] == "event: done"
+    assert json.loads(last[1][len("data: "):])["status"] == "done"
+
+def test_running_non_interruptible_job_is_409(client):
+    job = client.post("/jobs", json={"endpoint": "/run_fsm", "payload": SLOW_FSM}).get_json()
+    _wait(_status(client), job["job_id"], ("running",))
+    resp = client.delete("/jobs/" + job["job_id"])
+    assert resp.status_code == 409
+    assert _wait(_status(client), job["job_id"], ("done", "failed", "cancelled"))["status"] == "done"
+
+def test_running_interruptible_job_is_cancelled(client):
+    job = client.post("/jobs", json={"endpoint": "/ms_bruteforce", "payload": SLOW_SEARCH}).get_json()
+    _wait(_status(client), job["job_id"], ("running",))
+    assert client.delete("/jobs/" + job["job_id"]).get_json()["status"] == "cancelling"
+    assert _wait(_status(client), job["job_id"], ("done", "failed", "cancelled"), timeout=30)["status"] == "cancelled"
+
+
+# ---------- queue ----------
+
+def test_cancel_queued_job(queue):
+    first = queue.submit("/run_fsm", SLOW_FSM)
+    # the pool already holds the next job (its future runs), the third waits
+    second = queue.submit("/run_fsm", dict(EXO4, steps=300, cache=False))
+    third = queue.submit("/run_fsm", dict(EXO4, steps=301, cache=False))
+    assert queue.cancel(second["job_id"])["status"] in ("queued", "cancelling", "cancelled")
+    assert queue.cancel(third["job_id"])["status"] in ("queued", "cancelling", "cancelled")
+    for job in (second, third):
+        assert _wait(queue.get, job["job_id"], ("done", "failed", "cancelled"))["status"] == "cancelled"
+        assert queue.result(job["job_id"]) is None
+    assert _wait(queue.get, first["job_id"], ("done", "failed", "cancelled"))["status"] == "done"
+
+def test_running_non_interruptible_job_raises(queue):
+    job = queue.submit("/run_fsm", SLOW_FSM)
+    _wait(queue.get, job["job_id"], ("running",))
+    with pytest.raises(JobNotCancellable):
+        queue.cancel(job["job_id"])
+    _wait(queue.get, job["job_id"], ("done",))
+
+def _pending_job(queue, endpoint):
+    """a job whose future is already running while the store still says "queued" """
+    future = Future()
+    future.set_running_or_notify_cancel()
+    job_id = "race-" + endpoint
+    queue._jobs[job_id] = {"job_id": job_id, "endpoint": endpoint, "status": "queued", "finished": None,
+                           "progress": None, "error": None, "version": 0, "_result": None, "_future": future}
+    future.add_done_callback(lambda f: queue._finished(job_id, f))
+    return job_id, future
+
+def test_cancel_racing_a_finished_job_keeps_the_result(queue):
+    queue._cancelled = {}
+    job_id, future = _pending_job(queue, "/run_fsm")
+    # DELETE lands before the broker has seen "started"
+    assert queue.cancel(job_id)["status"] == "cancelling"
+    future.set_result((200, "application/json", b"{}"))
+    assert queue.get(job_id)["status"] == "done"
+    assert queue.result(job_id) == (200, "application/json", b"{}")
+
+def test_cancel_racing_a_stopped_job(queue):
+    queue._cancelled = {}
+    job_id, future = _pending_job(queue, "/ms_bruteforce")
+    assert queue.cancel(job_id)["status"] == "cancelling"
+    future.set_exception(JobCancelled(job_id))
+    assert queue.get(job_id)["status"] == "cancelled"
@@ -0,0 +1,22 @@
+# The bit-plane batch generator of lfsr_batch.py against the packed-int clock,
+# and its tap checks against lfsr_engine.tap_mask.
+
+import pytest
+
+from securityrm.lfsr_batch import generate_lfsr_batch, tap_delays
+from securityrm.lfsr_engine import pack_state, tap_mask, lfsr_clock
+
+
+@pytest.mark.parametrize("taps", [[0, 2], [-1, 0], [1, 1, 4], [-5, 3]])
+def test_batch_matches_clock(taps):
+    states = [[1, 0, 0, 1, 1], [0, 1, 1, 0, 1], [0, 0, 0, 0, 1]]
+    out = generate_lfsr_batch(states, taps, 40, packed=False)
+    for row, state in zip(out, states):
+        assert row.tolist() == list(lfsr_clock(pack_state(state), tap_mask(taps, 5), 5, 40)[0])
+
+@pytest.mark.parametrize("taps", [[5], [-6], [0, 7]])
+def test_out_of_range_taps_raise_like_tap_mask(taps):
+    with pytest.raises(IndexError):
+        tap_mask(taps, 5)
+    with pytest.raises(IndexError):
+        tap_delays(taps, 5)
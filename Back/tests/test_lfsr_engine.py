@@ -0,0 +1,58 @@
+# Constant-memory period detection and the word-at-a-time outputs of
+# lfsr_engine.py against run_lfsr (the stored-states loop) and lfsr_clock,
+# with and without max_steps.
+
+import random
+
+import pytest
+
+from securityrm.lfsr_engine import (
+    pack_state, unpack_state, tap_mask, run_lfsr, lfsr_period, lfsr_clock, lfsr_outputs
+)
+from securityrm.reference import generate_lfsr_sequence
+
+
+def _expected(state, mask, length, max_steps):
+    _, period, states = run_lfsr(state, mask, length, max_steps=max_steps)
+    return (period, len(states) - period) if period is not None else (None, None)
+
+@pytest.mark.parametrize("seed", range(40))
+def test_period_matches_run_lfsr(seed):
+    rng = random.Random(seed)
+    length = rng.randint(1, 7)
+    taps = rng.sample(range(length), rng.randint(0, length))
+    state = pack_state([rng.randint(0, 1) for _ in range(length)])
+    mask = tap_mask(taps, length)
+    for max_steps in [None] + list(range((1 << length) + 3)):
+        assert lfsr_period(state, mask, length, max_steps) == _expected(state, mask, length, max_steps)
+
+def test_max_steps_one_finds_no_period():
+    # a fixed point has period 1, but one clock is not enough to see it repeat
+    assert lfsr_period(0, 1, 1, max_steps=1) == (None, None)
+    assert lfsr_period(0, 1, 1, max_steps=2) == (1, 0)
+
+@pytest.mark.parametrize("seed", range(20))
+def test_outputs_match_clock(seed):
+    rng = random.Random(seed)
+    length = rng.randint(1, 20)
+    taps = rng.sample(range(length), rng.randint(0, length))
+    state = pack_state([rng.randint(0, 1) for _ in range(length)])
+    mask = tap_mask(taps, length)
+    for count in [0, 1, length - 1, length, length + 1, rng.randint(0, 3000)]:
+        assert lfsr_outputs(state, mask, length, count) == lfsr_clock(state, mask, length, count)[0]
+
+@pytest.mark.parametrize("seed", range(20))
+def test_sequence_matches_run_lfsr(seed):
+    rng = random.Random(seed)
+    length = rng.randint(1, 9)
+    taps = [rng.randint(-length, length - 1) for _ in range(rng.randint(0, 4))]
+    init_state = [rng.randint(0, 1) for _ in range(length)]
+    for max_steps in [None, 0, 1, 5, 2.5, 1 << length]:
+        outputs, period, states = run_lfsr(pack_state(init_state), tap_mask(taps, length), length,
+                                           max_steps=max_steps)
+        rows = [unpack_state(s, length) for s in states]
+        got_outputs, got_period, table = generate_lfsr_sequence(init_state, taps, max_steps=max_steps)
+        assert (got_outputs, got_period, list(table)) == (list(outputs), period, rows)
+        assert len(table) == len(rows)
+        for index in [slice(None), slice(None, None, -1), slice(1, None, 3), slice(-4, -1), 0, -1]:
+            assert table[index] == rows[index]
@@ -0,0 +1,19 @@
+# The streaming randomness battery: chunking must not change the results,
+# and option lists may be empty.
+
+import numpy as np
+
+from securityrm.randomness import analyse_chunks
+
+
+def _bits(count, seed=1):
+    return np.random.default_rng(seed).integers(0, 2, count, dtype=np.uint8)
+
+def test_chunking_does_not_change_results():
+    bits = _bits(20000)
+    whole = analyse_chunks([bits])
+    assert analyse_chunks(bits[i:i + 777] for i in range(0, len(bits), 777)) == whole
+
+def test_empty_delays():
+    result = analyse_chunks([_bits(5000)], {"delays": []})
+    assert result["tests"]["autocorrelation"] == {}
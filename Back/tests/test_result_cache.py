@@ -0,0 +1,105 @@
+# The byte-bounded LRU of result_cache.py, its sqlite spill, and the cached
+# endpoints (hit vs miss, "cache": false).
+
+import pytest
+
+import app as backend
+from result_cache import ResultCache, canonical_key
+
+
+def test_canonical_key_ignores_dict_order():
+    assert canonical_key("ns", {"a": 1, "b": [1, 2]}) == canonical_key("ns", {"b": [1, 2], "a": 1})
+    assert canonical_key("ns", {"a": 1}) != canonical_key("other", {"a": 1})
+
+def test_lru_evicts_at_max_bytes():
+    cache = ResultCache(max_bytes=100)
+    for key in "abc":
+        cache.put(key, b"x" * 40)
+    stats = cache.stats()
+    assert (stats["entries"], stats["bytes"], stats["evictions"]) == (2, 80, 1)
+    assert cache.get("a") is None
+    assert cache.get("b") == b"x" * 40
+
+def test_lru_keeps_recently_used():
+    cache = ResultCache(max_bytes=100)
+    cache.put("a", b"1" * 40)
+    cache.put("b", b"2" * 40)
+    cache.get("a")
+    cache.put("c", b"3" * 40)
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1" * 40
+    assert (cache.hits, cache.misses) == (2, 1)
+
+def test_oversized_value_is_not_kept_in_memory():
+    cache = ResultCache(max_bytes=10)
+    cache.put("big", b"x" * 11)
+    assert cache.get("big") is None
+    assert cache.stats()["bytes"] == 0
+
+def test_hit_after_spill(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = ResultCache(max_bytes=100, path=path)
+    cache.put("a", b"1" * 60)
+    cache.put("b", b"2" * 60)           # evicts "a" to sqlite
+    assert cache.get("a") == b"1" * 60
+    assert cache.disk_hits == 1
+    # a new process reloads what was spilled
+    reopened = ResultCache(max_bytes=100, path=path)
+    assert reopened.get("a") == b"1" * 60
+    assert reopened.stats()["disk_hits"] == 1
+
+def test_disk_level_is_bounded(tmp_path):
+    cache = ResultCache(max_bytes=10, path=str(tmp_path / "cache.sqlite"), max_disk_bytes=100)
+    for i in range(5):
+        cache.put(str(i), bytes([i]) * 40)
+    assert cache.get("0") is None
+    assert cache.get("4") == bytes([4]) * 40
+
+def test_get_or_compute_computes_once():
+    cache = ResultCache()
+    calls = []
+    compute = lambda: calls.append(1) or b"value"
+    assert cache.get_or_compute("k", compute) == cache.get_or_compute("k", compute) == b"value"
+    assert len(calls) == 1
+
+
+# ---------- endpoints ----------
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(backend, "RESULT_CACHE", ResultCache(max_bytes=1 << 20))
+    return backend.app.test_client()
+
+REQUESTS = [
+    ("/generate_lfsr", {"init_state": [1, 0, 0, 1, 1], "taps": [0, 2]}),
+    ("/run_fsm", {"r1": [1, 0, 0, 1, 0, 1, 1], "r2": [1, 1, 0], "r3": [1, 0, 1, 1, 0], "steps": 200}),
+    ("/run_fsm_2lfsr", {"r1": [1, 0, 0, 1, 0, 1, 1], "r2": [1, 1, 0, 1, 0]}),
+]
+
+@pytest.mark.parametrize("path, payload", REQUESTS)
+def test_hit_matches_miss(client, path, payload):
+    miss = client.post(path, json=payload)
+    hit = client.post(path, json=payload)
+    assert (miss.headers["X-Cache"], hit.headers["X-Cache"]) == ("MISS", "HIT")
+    assert hit.get_json() == miss.get_json()
+    assert client.post(path, json=dict(payload, cache=False)).get_json() == miss.get_json()
+
+def test_cache_false_bypasses_the_cache(client):
+    path, payload = REQUESTS[0]
+    resp = client.post(path, json=dict(payload, cache=False))
+    assert "X-Cache" not in resp.headers
+    assert backend.RESULT_CACHE.stats()["entries"] == 0
+
+def test_engine_does_not_split_the_cache(client):
+    path, payload = REQUESTS[1]
+    client.post(path, json=dict(payload, engine="python"))
+    assert client.post(path, json=dict(payload, engine="numpy")).headers["X-Cache"] == "HIT"
+
+def test_endpoint_results_are_evicted_at_the_byte_budget(client, monkeypatch):
+    path, payload = REQUESTS[0]
+    size = len(client.post(path, json=payload).get_data())
+    monkeypatch.setattr(backend, "RESULT_CACHE", ResultCache(max_bytes=size))
+    client.post(path, json=payload)
+    client.post(path, json=dict(payload, taps=[0, 1]))
+    assert backend.RESULT_CACHE.stats()["evictions"] >= 1
+    assert client.post(path, json=payload).headers["X-Cache"] == "MISS"
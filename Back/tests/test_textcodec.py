@@ -0,0 +1,54 @@
+# The vectorised 5-bit codec of textcodec.py against the list-based helpers
+# of word_decipher.py.
+
+import random
+
+import numpy as np
+import pytest
+
+from securityrm.textcodec import symbols, decode_rows, encode_texts, encode_text
+from securityrm.word_decipher import bits_to_text_simple, text_to_bits_simple
+
+
+def _rows(count, length, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 2, (count, length), dtype=np.uint8)
+
+@pytest.mark.parametrize("length", [0, 1, 4, 5, 7, 8, 39, 40, 41, 70, 123])
+def test_decode_rows_unpacked(length):
+    rows = _rows(6, length, length)
+    assert decode_rows(rows) == [bits_to_text_simple(row.tolist()) for row in rows]
+
+@pytest.mark.parametrize("length", [1, 4, 5, 7, 8, 39, 40, 41, 70, 123])
+def test_decode_rows_packed(length):
+    rows = _rows(6, length, length)
+    expected = [bits_to_text_simple(row.tolist()) for row in rows]
+    assert decode_rows(np.packbits(rows, axis=1), length) == expected
+
+def test_packed_bits_past_length_are_ignored():
+    rows = _rows(4, 13)
+    packed = np.packbits(rows, axis=1)
+    packed[:, -1] |= 0x07                     # junk after bit 13
+    assert decode_rows(packed, 13) == decode_rows(rows)
+
+def test_packed_rows_too_short():
+    with pytest.raises(ValueError):
+        symbols(np.zeros((1, 1), dtype=np.uint8), 9)
+
+def test_symbols_values():
+    bits = [[0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1]]  # 1, 31, then "1" padded to 10000
+    assert symbols(bits).tolist() == [[1, 31, 16]]
+
+def test_encode_round_trip():
+    rng = random.Random(3)
+    texts = ["".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(9)) for _ in range(5)]
+    bits = encode_texts(texts)
+    assert [row.tolist() for row in bits] == [text_to_bits_simple(t) for t in texts]
+    assert decode_rows(bits) == texts
+    assert decode_rows(encode_texts(texts, packed=True), 45) == texts
+    assert encode_text("abc").tolist() == text_to_bits_simple("ABC")
+
+@pytest.mark.parametrize("texts", [["AB", "ABC"], ["A1"], ["É"]])
+def test_encode_rejects(texts):
+    with pytest.raises(ValueError):
+        encode_texts(texts)
@@ -1,82 +1,18 @@
-import math
-
-# ---------- Python LFSR logic ----------
-
-def xor_bits_from_indices(state, indices):
-    v = 0
-    for i in indices:
-        v ^= state[i]
-    return v
-
-
-def generate_lfsr_sequence(init_state, taps, max_steps=1 << 20):
-    """Return (outputs_list, period, states_list) until first repeated state."""
-    state = list(init_state)
-    seen = {}
-    outputs = []
-    states = []
-    step = 0
-
-    while True:
-        key = tuple(state)
-
-        # if we already saw this state → period found
-        if key in seen:
-            period = step - seen[key]
-            return outputs, period, states
-
-        # remember this state
-        seen[key] = step
-        states.append(tuple(state))
-
-        # output = rightmost bit
-        outputs.append(state[-1])
-
-        # LFSR feedback + shift
-        newbit = xor_bits_from_indices(state, taps)
-        state = [newbit] + state[:-1]
-        step += 1
-
-        # safety (should not happen with small LFSRs)
-        if step >= max_steps:
-            return outputs, len(outputs), states
-
-
-# ---------- FSM (2 LFSRs: R1, R2) ----------
-
-def generate_fsm_2lfsr(r1_seq, r2_seq, steps=None):
-    """
-    FSM rule:
-      - Both LFSRs are clocked in parallel.
-      - If R1 output bit = 1 → FSM outputs R2 bit.
-      - If R1 output bit = 0 → FSM outputs nothing (bit is ignored).
-    """
-    if steps is None:
-        steps = len(r1_seq) * len(r2_seq)
-
-    idx1 = 0  # pointer in r1_seq
-    idx2 = 0  # pointer in r2_seq
-
-    fsm = []
-
-    for _ in range(int(steps)):
-        a = r1_seq[idx1]
-        b = r2_seq[idx2]
-
-        if a == 1:
-            fsm.append(b)   # only output when R1 = 1
-
-        # advance R1 pointer with wrap
-        idx1 += 1
-        if idx1 >= len(r1_seq):
-            idx1 = 0
-
-        # advance R2 pointer with wrap
-        idx2 += 1
-        if idx2 >= len(r2_seq):
-            idx2 = 0
-
-    return fsm
+import os
+import sys
+
+# the engines live in the securityrm package of ../Back
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Back"))
+
+# LFSRs: generate_lfsr_sequence as this script always had it (1 << 20 step cap)
+# FSM (2 LFSRs: R1, R2), securityrm "gated" rule:
+#   - Both LFSRs are clocked in parallel.
+#   - If R1 output bit = 1 -> FSM outputs R2 bit.
+#   - If R1 output bit = 0 -> FSM outputs nothing (bit is ignored).
+from securityrm.reference import (
+    script_lfsr_sequence as generate_lfsr_sequence,
+    generate_fsm_2lfsr_gated as generate_fsm_2lfsr,
+)
 
 
 # ============================================================
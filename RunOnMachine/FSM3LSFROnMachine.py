@@ -1,41 +1,13 @@
-import math
+import os
+import sys
 
+# the engines live in the securityrm package of ../Back
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Back"))
 
-# ---------- Python LFSR & FSM logic ----------
+from securityrm.reference import script_lfsr_sequence as generate_lfsr_sequence, alternating_step_fsm
 
-def xor_bits_from_indices(state, indices):
-    v = 0
-    for i in indices:
-        v ^= state[i]
-    return v
-
-
-def generate_lfsr_sequence(init_state, taps, max_steps=1 << 20):
-    """Return (outputs_list, period, states_list) until first repeated state."""
-    state = list(init_state)
-    seen = {}
-    outputs = []
-    states = []
-    step = 0
-
-    while True:
-        key = tuple(state)
-
-        if key in seen:  # a previous state repeated → period found
-            period = step - seen[key]
-            return outputs, period, states
-
-        seen[key] = step
-        states.append(tuple(state))
-        outputs.append(state[-1])  # output is RIGHTMOST bit
-
-        newbit = xor_bits_from_indices(state, taps)
-        state = [newbit] + state[:-1]
-        step += 1
-
-        if step >= max_steps:
-            return outputs, len(outputs), states
 
+# ---------- FSM (securityrm "alternating_step" rule) ----------
 
 def generate_fsm(r1_seq, r2_seq, r3_seq, b_minus1=0, c_minus1=0, steps=None):
     """Generate FSM alternating-step sequence."""
@@ -43,37 +15,7 @@ def generate_fsm(r1_seq, r2_seq, r3_seq, b_minus1=0, c_minus1=0, steps=None):
     if steps is None:
         steps = len(r1_seq) * len(r2_seq) * len(r3_seq)
 
-    b_prev = int(b_minus1) & 1
-    c_prev = int(c_minus1) & 1
-
-    idx1 = 0
-    idx2 = -1
-    idx3 = -1
-
-    fsm = []
-
-    for j in range(int(steps)):
-
-        # R1 controls FSM
-        a = r1_seq[idx1]
-
-        if a == 1:
-            idx2 += 1
-            if idx2 >= len(r2_seq):
-                idx2 = 0
-            b_prev = r2_seq[idx2]
-        else:
-            idx3 += 1
-            if idx3 >= len(r3_seq):
-                idx3 = 0
-            c_prev = r3_seq[idx3]
-
-        fsm_bit = b_prev ^ c_prev
-        fsm.append(fsm_bit)
-
-        idx1 += 1
-        if idx1 >= len(r1_seq):
-            idx1 = 0  # wrap around
+    fsm, _, _, _ = alternating_step_fsm(r1_seq, r2_seq, r3_seq, b_minus1, c_minus1, steps)
 
     stats = {
         "steps": int(steps),